@@ -27,12 +27,14 @@ from blueprints.checklist import checklist_bp
 from utils.helpers import inject_now
 from utils.db_helpers import ensure_schema_updates
 from utils.currency import format_currency, get_currency_info
+from utils.json_provider import FastJSONProvider
 
 
 def create_app(config_object='config.Config'):
     """Application factory pattern"""
     app = Flask(__name__)
     app.config.from_object(config_object)
+    app.json = FastJSONProvider(app)
     
     # Register health check endpoint FIRST - before any blocking operations
     # This must respond immediately without any database or other dependencies
@@ -138,6 +140,17 @@ def create_app(config_object='config.Config'):
             else:
                 click.echo('✓ No old temperature logs to clean up')
     
+    @app.cli.command('regenerate-book-covers')
+    def regenerate_book_covers():
+        """Re-render the covers of all PDF books from their first page"""
+        import click
+        from blueprints.knowledge import regenerate_covers
+        
+        with app.app_context():
+            book_ids = [book_id for (book_id,) in db.session.query(Book.id).filter(Book.pdf_path.isnot(None))]
+            regenerated_count = regenerate_covers(book_ids)
+            click.echo(f'✓ Regenerated {regenerated_count} of {len(book_ids)} book cover(s)')
+    
     # Template filter for currency formatting
     @app.template_filter('currency')
     def currency_filter(amount, decimals=2):
@@ -2,35 +2,221 @@
 Checklist Blueprint
 Handles Bar Checklist and Kitchen Checklist pages
 """
-from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, send_file, current_app
+from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, send_file, current_app, abort
 from flask_login import login_required, current_user
 from functools import wraps
+from operator import attrgetter
+from werkzeug.exceptions import HTTPException
 from datetime import datetime, date, timedelta
-from sqlalchemy import and_, or_
+from calendar import month_name
+from sqlalchemy import and_, or_, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 import json
+import os
 import io
+import re
+import threading
+import time
+from tempfile import SpooledTemporaryFile
 
 from models import ColdStorageUnit, TemperatureLog, TemperatureEntry, WashingUnit, BarGlassWasherChecklist, KitchenDishWasherChecklist, KitchenGlassWasherChecklist, BarClosingChecklistUnit, BarClosingChecklistPoint, BarClosingChecklistEntry, BarClosingChecklistItem, ChoppingBoardChecklistUnit, ChoppingBoardChecklistPoint, ChoppingBoardChecklistEntry, ChoppingBoardChecklistItem, KitchenChoppingBoardChecklistUnit, KitchenChoppingBoardChecklistPoint, KitchenChoppingBoardChecklistEntry, KitchenChoppingBoardChecklistItem, IceScoopSanitationUnit, IceScoopSanitationEntry, KitchenIceScoopSanitationUnit, KitchenIceScoopSanitationEntry, BarOpeningChecklistUnit, BarOpeningChecklistPoint, BarOpeningChecklistEntry, BarOpeningChecklistItem, BarShiftClosingChecklistUnit, BarShiftClosingChecklistPoint, BarShiftClosingChecklistEntry, BarShiftClosingChecklistItem
 from extensions import db
-from utils.helpers import get_organization_filter, get_user_display_name
+from utils.helpers import get_organization_filter, get_organization_cache_key, get_user_display_name
+from utils.pdf_jobs import submit_pdf_job, get_pdf_job
+from utils.db_helpers import ensure_schema_updates, has_unique_index, upsert, upsert_many, insert_or_ignore
+from utils.validation import validate_json_fields, REQUIRED
+from utils.cache import get_cached, set_cached, invalidate_cached
+from utils import pdf_generator
 
 checklist_bp = Blueprint('checklist', __name__, url_prefix='/checklist')
 
+# Constant template data, registered once instead of being passed to every render_template call
+checklist_bp.add_app_template_global(pdf_generator.TEMPERATURE_LOG_TIMES, name='TEMPERATURE_LOG_TIMES')
+
 
 def role_required(roles):
     """Decorator to check if user has required role"""
+    # Built once at decoration time; membership is a hash lookup per request
+    allowed_roles = frozenset(roles)
     def decorator(f):
         @wraps(f)
         @login_required
         def decorated_function(*args, **kwargs):
-            if current_user.user_role not in roles:
-                from flask import abort
+            if current_user.normalized_role not in allowed_roles:
                 abort(403)
             return f(*args, **kwargs)
         return decorated_function
     return decorator
 
 
+def _conditional_json(payload):
+    """JSON response with an ETag; answers 304 Not Modified when If-None-Match matches"""
+    response = jsonify(payload)
+    response.add_etag()
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+
+def _last_modified_json(payload, last_modified):
+    """JSON response carrying Last-Modified for If-Modified-Since revalidation.
+    HTTP dates have one-second resolution, so the header is held back while last_modified
+    is still within the current second (a later write in that second would go unnoticed)."""
+    response = jsonify(payload)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    if last_modified and datetime.utcnow() - last_modified >= timedelta(seconds=1):
+        response.last_modified = last_modified
+    return response
+
+
+def _not_modified_since(last_modified):
+    """True when the request's If-Modified-Since already covers last_modified"""
+    since = request.if_modified_since
+    return bool(last_modified and since and last_modified.replace(microsecond=0) <= since.replace(tzinfo=None))
+
+
+def _dispatch_json_action(actions):
+    """Route a JSON POST body to actions[data['action']]; handlers take the body and return a response"""
+    data = request.get_json()
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    handler = actions.get(data.get('action'))
+    if handler is None:
+        return jsonify({'success': False, 'error': 'Invalid action'}), 400
+    return handler(data)
+
+
+# Roles allowed to create, update and delete checklist units and points
+MANAGER_ROLES = frozenset({'Manager'})
+
+
+def manager_only(error_message):
+    """Decorator for JSON action handlers restricted to MANAGER_ROLES; answers 403 with error_message"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if current_user.normalized_role not in MANAGER_ROLES:
+                current_app.logger.warning(
+                    "Non-Manager user %s (role: '%s') denied %s",
+                    current_user.id, current_user.user_role, f.__name__
+                )
+                return jsonify({'success': False, 'error': error_message}), 403
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+# Generated PDFs larger than this are spooled to a temporary file instead of memory
+PDF_SPOOL_MAX_SIZE = 2 * 1024 * 1024
+
+# Identical checklist item writes repeated within this window are answered without a commit
+ITEM_WRITE_DEDUPE_SECONDS = 0.5
+_recent_item_writes = {}
+_recent_item_writes_lock = threading.Lock()
+
+
+def _get_recent_item_write(key, state):
+    """Return the item payload of an identical write to key made within the dedupe window, else None"""
+    now = time.monotonic()
+    with _recent_item_writes_lock:
+        recent = _recent_item_writes.get(key)
+        if recent and recent[1] == state and now - recent[0] < ITEM_WRITE_DEDUPE_SECONDS:
+            return recent[2]
+    return None
+
+
+def _bar_opening_item_key(entry_id, checklist_point_id):
+    """Dedupe key for one bar opening checklist item (shared by every user writing it)"""
+    return ('bar_opening', entry_id, checklist_point_id)
+
+
+def _remember_item_write(key, state, item_payload):
+    """Record a committed item write and drop entries older than the dedupe window"""
+    now = time.monotonic()
+    with _recent_item_writes_lock:
+        _recent_item_writes[key] = (now, state, item_payload)
+        stale = [k for k, v in _recent_item_writes.items() if now - v[0] >= ITEM_WRITE_DEDUPE_SECONDS]
+        for k in stale:
+            del _recent_item_writes[k]
+
+
+@checklist_bp.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Roll back and log unexpected errors from checklist views in one place"""
+    if isinstance(e, HTTPException):
+        return e
+    db.session.rollback()
+    current_app.logger.error("Unexpected error in %s: %s", request.endpoint, e, exc_info=True)
+    # Details (SQL, constraint names, paths) stay in the log; clients only get a generic message
+    if request.accept_mimetypes.best == 'text/html':
+        return render_template('error.html', error='An unexpected error occurred'), 500
+    return jsonify({'success': False, 'error': 'An unexpected error occurred'}), 500
+
+
+def _pdf_job_response(job_id):
+    """Status response for a background PDF job owned by the current user, or the PDF once finished"""
+    job = get_pdf_job(job_id, current_user.id)
+    if not job:
+        return jsonify({'success': False, 'error': 'PDF job not found'}), 404
+    
+    if job['status'] == 'failed':
+        return jsonify({'success': False, 'status': 'failed', 'error': job['error']}), 500
+    
+    if job['status'] != 'finished':
+        return jsonify({'success': True, 'status': job['status']}), 202
+    
+    # The result stays until the TTL prune, so a retried or interrupted download still gets the file
+    if not os.path.isfile(job['path']):
+        return jsonify({'success': False, 'error': 'PDF job not found'}), 404
+    return send_file(
+        job['path'],
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=job['filename']
+    )
+
+
+def _save_entry_without_unique_index(values, update_columns):
+    """Update the newest entry for the slot (or add one) where the upsert's unique index is missing"""
+    entry = TemperatureEntry.query.filter_by(
+        log_id=values['log_id'], scheduled_time=values['scheduled_time']
+    ).order_by(TemperatureEntry.id.desc()).first()
+    if entry is None:
+        entry = TemperatureEntry(**values)
+        db.session.add(entry)
+    else:
+        for column in update_columns:
+            setattr(entry, column, values[column])
+    db.session.flush()
+    return entry
+
+# Report months arrive from the PDF forms as 'YYYY-MM'
+_MONTH_RE = re.compile(r'^(\d{4})-(\d{2})$')
+
+
+def _parse_report_month(month, year):
+    """Return (year, month_num) from a 'YYYY-MM' month, or a bare year for the current month; None if invalid"""
+    if month:
+        match = _MONTH_RE.match(month) if isinstance(month, str) else None
+        if not match:
+            return None
+        year, month_num = int(match[1]), int(match[2])
+    else:
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            return None
+        month_num = date.today().month
+    if not 1 <= month_num <= 12:
+        return None
+    return year, month_num
+
+
+def _row_serializer(fields):
+    """Build a serializer turning a model instance into a dict of the given attributes"""
+    getter = attrgetter(*fields)
+    return lambda obj: dict(zip(fields, getter(obj)))
+
+
 ICE_SCOOP_TIME_SLOTS = [
     {'index': 1, 'label': '08:00'},
     {'index': 2, 'label': '12:00'},
@@ -440,22 +626,135 @@ def kitchen_ice_scoop_entries():
 # COLD STORAGE TEMPERATURE LOG ROUTES
 # ============================================
 
+# Columns the unit lists, JSON payloads and PDFs read; audit columns are left unloaded
+COLD_STORAGE_UNIT_COLUMNS = ('id', 'unit_number', 'location', 'unit_type', 'min_temp', 'max_temp')
+# Unique index rejecting a second active unit with the same number in an organisation and context
+COLD_STORAGE_UNIT_NUMBER_INDEX = 'uq_cold_storage_unit_active_number'
+
+
+def _cold_storage_unit_query():
+    """ColdStorageUnit query that loads only COLD_STORAGE_UNIT_COLUMNS"""
+    return ColdStorageUnit.query.options(
+        load_only(*(getattr(ColdStorageUnit, c) for c in COLD_STORAGE_UNIT_COLUMNS))
+    )
+
+
+def _cold_storage_unit_number_taken(unit_number, context, exclude_id=None):
+    """
+    True if an active unit the current user can see already uses unit_number in context.
+    Checked on every write: uq_cold_storage_unit_active_number is keyed on the stamped organisation string,
+    so it does not cover legacy units without an organisation, and it is skipped on databases that
+    already held duplicates.
+    """
+    org_filter = get_organization_filter(ColdStorageUnit)
+    query = ColdStorageUnit.query.filter(org_filter).filter_by(
+        unit_number=unit_number,
+        context=context,
+        is_active=True
+    )
+    if exclude_id is not None:
+        query = query.filter(ColdStorageUnit.id != exclude_id)
+    return db.session.query(query.exists()).scalar()
+
+
+def _is_duplicate_unit_number(error):
+    """True if an IntegrityError came from the active unit number index rather than another constraint"""
+    return COLD_STORAGE_UNIT_NUMBER_INDEX in str(error.orig)
+
+
+def _get_active_cold_storage_units(context):
+    """Active cold storage units for the current organisation"""
+    org_filter = get_organization_filter(ColdStorageUnit)
+    return _cold_storage_unit_query().filter(org_filter).filter_by(
+        is_active=True,
+        context=context
+    ).order_by(ColdStorageUnit.unit_number).all()
+
+
+def _get_cold_storage_unit(unit_id):
+    """
+    Load a cold storage unit and whether it belongs to the current organisation in one query.
+    Returns (unit, in_organisation), or (None, False) when the unit does not exist.
+    """
+    org_filter = get_organization_filter(ColdStorageUnit)
+    row = db.session.query(ColdStorageUnit, org_filter).filter(ColdStorageUnit.id == unit_id).first()
+    return (row[0], bool(row[1])) if row else (None, False)
+
+
+def _parse_iso_datetime(value):
+    """Parse an ISO 8601 timestamp from the browser (a trailing 'Z' means UTC)"""
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+
+
+TEMPERATURE_ENTRY_FIELDS = {
+    'scheduled_time': (str, REQUIRED, 'Scheduled time', 10),
+    'temperature': (float, None, 'Temperature'),
+    'corrective_action': (str, '', 'Corrective action'),
+    'action_time': (_parse_iso_datetime, None, 'Action time'),
+    'recheck_temperature': (float, None, 'Recheck temperature'),
+    'initial': (str, '', 'Initial', 10),
+    'is_late_entry': (bool, False, 'Late entry flag'),
+}
+
+
+# Cold storage PDFs are deterministic for a given unit set, range and data version
+COLD_STORAGE_PDF_CACHE_TTL = 600
+# Each entry holds up to PDF_SPOOL_MAX_SIZE bytes, so cap the count to bound worker memory (~32 MB)
+COLD_STORAGE_PDF_CACHE_MAX_ENTRIES = 16
+
+
+def _temperature_data_version(unit_ids, start_date, end_date):
+    """Row-version of the temperature logs in range: entry count plus the latest entry and log changes"""
+    return tuple(db.session.query(
+        func.count(TemperatureEntry.id),
+        func.max(TemperatureEntry.entry_timestamp),
+        func.max(TemperatureLog.updated_at)
+    ).select_from(TemperatureLog).outerjoin(
+        TemperatureEntry, TemperatureEntry.log_id == TemperatureLog.id
+    ).filter(
+        TemperatureLog.unit_id.in_(unit_ids),
+        TemperatureLog.log_date >= start_date,
+        TemperatureLog.log_date <= end_date
+    ).one())
+
+
+def _build_cold_storage_pdf(generate, units, start_date, end_date, *args):
+    """
+    Build a cold storage PDF with generate(units, start_date, end_date, *args, out=...).
+    The bytes of PDFs that fit in memory are cached until the units or logs in range change.
+    """
+    key = (
+        generate.__name__,
+        tuple((unit.id, unit.unit_number, unit.location, unit.unit_type, unit.min_temp, unit.max_temp) for unit in units),
+        start_date,
+        end_date,
+        tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args),
+        _temperature_data_version([unit.id for unit in units], start_date, end_date)
+    )
+    cached = get_cached('cold_storage_pdfs', key)
+    if cached is not None:
+        return io.BytesIO(cached)
+    
+    # Small files stay in memory, larger ones spill to disk and are not cached
+    pdf_buffer = generate(units, start_date, end_date, *args, out=SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE))
+    if pdf_buffer.seek(0, io.SEEK_END) <= PDF_SPOOL_MAX_SIZE:
+        pdf_buffer.seek(0)
+        set_cached('cold_storage_pdfs', key, pdf_buffer.read(), ttl=COLD_STORAGE_PDF_CACHE_TTL,
+                   max_entries=COLD_STORAGE_PDF_CACHE_MAX_ENTRIES)
+    pdf_buffer.seek(0)
+    return pdf_buffer
+
+
 @checklist_bp.route('/kitchen/cold-storage')
 @login_required
 @role_required(['Chef', 'Manager'])
 def kitchen_cold_storage_temperature_log():
     """Kitchen Cold Storage Temperature Log page - accessible only to Chef and Manager"""
     # Ensure schema is up to date (adds missing columns like 'location')
-    from utils.db_helpers import ensure_schema_updates
     ensure_schema_updates()
     
     try:
-        org_filter = get_organization_filter(ColdStorageUnit)
-        # Filter by kitchen context
-        units = ColdStorageUnit.query.filter(org_filter).filter_by(
-            is_active=True, 
-            context='kitchen'
-        ).order_by(ColdStorageUnit.unit_number).all()
+        units = _get_active_cold_storage_units('kitchen')
     except Exception as e:
         current_app.logger.error(f"Error loading cold storage units: {str(e)}", exc_info=True)
         # If table doesn't exist yet, return empty list
@@ -472,16 +771,10 @@ def kitchen_cold_storage_temperature_log():
 def cold_storage_temperature_log():
     """Main page for Cold Storage Temperature Log"""
     # Ensure schema is up to date (adds missing columns like 'location')
-    from utils.db_helpers import ensure_schema_updates
     ensure_schema_updates()
     
     try:
-        org_filter = get_organization_filter(ColdStorageUnit)
-        # Filter by bar context
-        units = ColdStorageUnit.query.filter(org_filter).filter_by(
-            is_active=True, 
-            context='bar'
-        ).order_by(ColdStorageUnit.unit_number).all()
+        units = _get_active_cold_storage_units('bar')
     except Exception as e:
         current_app.logger.error(f"Error loading cold storage units: {str(e)}", exc_info=True)
         # If table doesn't exist yet, return empty list
@@ -499,17 +792,11 @@ def cold_storage_temperature_log():
 def kitchen_manage_cold_storage_units():
     """API endpoint for managing cold storage units (Kitchen) - accessible only to Chef and Manager"""
     # Ensure schema is up to date before any operations
-    from utils.db_helpers import ensure_schema_updates
     ensure_schema_updates()
     
     if request.method == 'GET':
         try:
-            org_filter = get_organization_filter(ColdStorageUnit)
-            # Filter by kitchen context
-            units = ColdStorageUnit.query.filter(org_filter).filter_by(
-                is_active=True, 
-                context='kitchen'
-            ).order_by(ColdStorageUnit.unit_number).all()
+            units = _get_active_cold_storage_units('kitchen')
             return jsonify([{
                 'id': unit.id,
                 'unit_number': unit.unit_number,
@@ -558,17 +845,7 @@ def kitchen_manage_cold_storage_units():
                     unit_type = 'Wine Chiller'
                 
                 try:
-                    # Check if unit number already exists in organization (within same context)
-                    org_filter = get_organization_filter(ColdStorageUnit)
-                    existing_unit = ColdStorageUnit.query.filter(org_filter).filter_by(
-                        unit_number=unit_number,
-                        context='kitchen',  # Check within kitchen context
-                        is_active=True
-                    ).first()
-                    
-                    if existing_unit:
-                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" already exists in your organization'}), 400
-                    
+                    # Duplicates the user can see are refused below; uq_cold_storage_unit_active_number catches races on commit
                     # Handle temperature values - convert to float if provided, otherwise None
                     min_temp = None
                     max_temp = None
@@ -588,6 +865,9 @@ def kitchen_manage_cold_storage_units():
                         if min_temp is not None and max_temp is not None and min_temp >= max_temp:
                             return jsonify({'success': False, 'error': 'Minimum temperature must be less than maximum temperature'}), 400
                     
+                    if _cold_storage_unit_number_taken(unit_number, 'kitchen'):
+                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" already exists in your organization'}), 400
+                    
                     # Create the unit with kitchen context
                     unit = ColdStorageUnit(
                         unit_number=unit_number,
@@ -613,6 +893,12 @@ def kitchen_manage_cold_storage_units():
                         'min_temp': unit.min_temp,
                         'max_temp': unit.max_temp
                     }})
+                except IntegrityError as e:
+                    db.session.rollback()
+                    if _is_duplicate_unit_number(e):
+                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" is already in use'}), 400
+                    current_app.logger.error(f"Integrity error creating unit: {str(e)}", exc_info=True)
+                    return jsonify({'success': False, 'error': 'Database constraint error. Please contact support.'}), 500
                 except ValueError as e:
                     db.session.rollback()
                     current_app.logger.error(f"ValueError creating unit: {str(e)}")
@@ -636,6 +922,13 @@ def kitchen_manage_cold_storage_units():
                 if not data.get('id'):
                     return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
                 
+                # Validate required fields
+                unit_number = str(data.get('unit_number') or '').strip()
+                location = str(data.get('location') or '').strip()
+                unit_type = str(data.get('unit_type') or '').strip()
+                if not unit_number or not location or not unit_type:
+                    return jsonify({'success': False, 'error': 'Unit number, location, and unit type are required'}), 400
+                
                 try:
                     unit = ColdStorageUnit.query.get(data['id'])
                     if not unit:
@@ -645,10 +938,6 @@ def kitchen_manage_cold_storage_units():
                     if not ColdStorageUnit.query.filter(org_filter).filter_by(id=unit.id).first():
                         return jsonify({'success': False, 'error': 'Unauthorized'}), 403
                     
-                    # Validate required fields
-                    if not data.get('unit_number') or not data.get('location') or not data.get('unit_type'):
-                        return jsonify({'success': False, 'error': 'Unit number, location, and unit type are required'}), 400
-                    
                     # Handle temperature values - convert to float if provided, otherwise None
                     min_temp = None
                     max_temp = None
@@ -658,17 +947,26 @@ def kitchen_manage_cold_storage_units():
                         max_temp = float(data['max_temp'])
                     
                     # Normalize "Chiller" to "Wine Chiller" for database storage
-                    normalized_unit_type = data['unit_type']
+                    if unit.is_active and _cold_storage_unit_number_taken(unit_number, unit.context, exclude_id=unit.id):
+                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" already exists in your organization'}), 400
+                    
+                    normalized_unit_type = unit_type
                     if normalized_unit_type == 'Chiller':
                         normalized_unit_type = 'Wine Chiller'
                     
-                    unit.unit_number = data['unit_number']
-                    unit.location = data['location']
+                    unit.unit_number = unit_number
+                    unit.location = location
                     unit.unit_type = normalized_unit_type
                     unit.min_temp = min_temp
                     unit.max_temp = max_temp
                     db.session.commit()
                     return jsonify({'success': True})
+                except IntegrityError as e:
+                    db.session.rollback()
+                    if _is_duplicate_unit_number(e):
+                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" is already in use'}), 400
+                    current_app.logger.error(f"Integrity error updating unit: {str(e)}", exc_info=True)
+                    return jsonify({'success': False, 'error': 'Database constraint error. Please contact support.'}), 500
                 except ValueError as e:
                     db.session.rollback()
                     return jsonify({'success': False, 'error': f'Invalid temperature value: {str(e)}'}), 400
@@ -714,17 +1012,11 @@ def kitchen_manage_cold_storage_units():
 def manage_cold_storage_units():
     """API endpoint for managing cold storage units"""
     # Ensure schema is up to date before any operations
-    from utils.db_helpers import ensure_schema_updates
     ensure_schema_updates()
     
     if request.method == 'GET':
         try:
-            org_filter = get_organization_filter(ColdStorageUnit)
-            # Filter by bar context
-            units = ColdStorageUnit.query.filter(org_filter).filter_by(
-                is_active=True, 
-                context='bar'
-            ).order_by(ColdStorageUnit.unit_number).all()
+            units = _get_active_cold_storage_units('bar')
             return jsonify([{
                 'id': unit.id,
                 'unit_number': unit.unit_number,
@@ -773,17 +1065,7 @@ def manage_cold_storage_units():
                     unit_type = 'Wine Chiller'
                 
                 try:
-                    # Check if unit number already exists in organization (within same context)
-                    org_filter = get_organization_filter(ColdStorageUnit)
-                    existing_unit = ColdStorageUnit.query.filter(org_filter).filter_by(
-                        unit_number=unit_number,
-                        context='bar',  # Check within bar context
-                        is_active=True
-                    ).first()
-                    
-                    if existing_unit:
-                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" already exists in your organization'}), 400
-                    
+                    # Duplicates the user can see are refused below; uq_cold_storage_unit_active_number catches races on commit
                     # Handle temperature values - convert to float if provided, otherwise None
                     min_temp = None
                     max_temp = None
@@ -803,6 +1085,9 @@ def manage_cold_storage_units():
                         if min_temp is not None and max_temp is not None and min_temp >= max_temp:
                             return jsonify({'success': False, 'error': 'Minimum temperature must be less than maximum temperature'}), 400
                     
+                    if _cold_storage_unit_number_taken(unit_number, 'bar'):
+                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" already exists in your organization'}), 400
+                    
                     # Create the unit with bar context
                     unit = ColdStorageUnit(
                         unit_number=unit_number,
@@ -828,6 +1113,12 @@ def manage_cold_storage_units():
                         'min_temp': unit.min_temp,
                         'max_temp': unit.max_temp
                     }})
+                except IntegrityError as e:
+                    db.session.rollback()
+                    if _is_duplicate_unit_number(e):
+                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" is already in use'}), 400
+                    current_app.logger.error(f"Integrity error creating unit: {str(e)}", exc_info=True)
+                    return jsonify({'success': False, 'error': 'Database constraint error. Please contact support.'}), 500
                 except ValueError as e:
                     db.session.rollback()
                     current_app.logger.error(f"ValueError creating unit: {str(e)}")
@@ -851,6 +1142,13 @@ def manage_cold_storage_units():
                 if not data.get('id'):
                     return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
                 
+                # Validate required fields
+                unit_number = str(data.get('unit_number') or '').strip()
+                location = str(data.get('location') or '').strip()
+                unit_type = str(data.get('unit_type') or '').strip()
+                if not unit_number or not location or not unit_type:
+                    return jsonify({'success': False, 'error': 'Unit number, location, and unit type are required'}), 400
+                
                 try:
                     unit = ColdStorageUnit.query.get(data['id'])
                     if not unit:
@@ -860,10 +1158,6 @@ def manage_cold_storage_units():
                     if not ColdStorageUnit.query.filter(org_filter).filter_by(id=unit.id).first():
                         return jsonify({'success': False, 'error': 'Unauthorized'}), 403
                     
-                    # Validate required fields
-                    if not data.get('unit_number') or not data.get('location') or not data.get('unit_type'):
-                        return jsonify({'success': False, 'error': 'Unit number, location, and unit type are required'}), 400
-                    
                     # Handle temperature values - convert to float if provided, otherwise None
                     min_temp = None
                     max_temp = None
@@ -873,17 +1167,26 @@ def manage_cold_storage_units():
                         max_temp = float(data['max_temp'])
                     
                     # Normalize "Chiller" to "Wine Chiller" for database storage
-                    normalized_unit_type = data['unit_type']
+                    if unit.is_active and _cold_storage_unit_number_taken(unit_number, unit.context, exclude_id=unit.id):
+                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" already exists in your organization'}), 400
+                    
+                    normalized_unit_type = unit_type
                     if normalized_unit_type == 'Chiller':
                         normalized_unit_type = 'Wine Chiller'
                     
-                    unit.unit_number = data['unit_number']
-                    unit.location = data['location']
+                    unit.unit_number = unit_number
+                    unit.location = location
                     unit.unit_type = normalized_unit_type
                     unit.min_temp = min_temp
                     unit.max_temp = max_temp
                     db.session.commit()
                     return jsonify({'success': True})
+                except IntegrityError as e:
+                    db.session.rollback()
+                    if _is_duplicate_unit_number(e):
+                        return jsonify({'success': False, 'error': f'Unit number "{unit_number}" is already in use'}), 400
+                    current_app.logger.error(f"Integrity error updating unit: {str(e)}", exc_info=True)
+                    return jsonify({'success': False, 'error': 'Database constraint error. Please contact support.'}), 500
                 except ValueError as e:
                     db.session.rollback()
                     return jsonify({'success': False, 'error': f'Invalid temperature value: {str(e)}'}), 400
@@ -930,7 +1233,6 @@ def kitchen_temperature_log_entry(unit_id, date_str):
     """API endpoint for getting/creating temperature log entries (Kitchen) - accessible only to Chef and Manager"""
     # Forward to the bar route which has the same implementation
     # The access control is already handled by the decorator
-    from flask import redirect, url_for
     return temperature_log_entry(unit_id, date_str)
 
 
@@ -941,7 +1243,6 @@ def temperature_log_entry(unit_id, date_str):
     """API endpoint for getting/creating temperature log entries"""
     try:
         # Ensure schema is up to date before accessing data
-        from utils.db_helpers import ensure_schema_updates
         ensure_schema_updates()
         
         log_date = datetime.strptime(date_str, '%Y-%m-%d').date()
@@ -952,9 +1253,10 @@ def temperature_log_entry(unit_id, date_str):
         return jsonify({'success': False, 'error': f'Error processing request: {str(e)}'}), 500
     
     try:
-        unit = ColdStorageUnit.query.get_or_404(unit_id)
-        org_filter = get_organization_filter(ColdStorageUnit)
-        if not ColdStorageUnit.query.filter(org_filter).filter_by(id=unit.id).first():
+        unit, in_organisation = _get_cold_storage_unit(unit_id)
+        if unit is None:
+            return jsonify({'success': False, 'error': 'Unit not found'}), 404
+        if not in_organisation:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
     except Exception as e:
         current_app.logger.error(f"Error loading unit {unit_id}: {str(e)}", exc_info=True)
@@ -962,8 +1264,11 @@ def temperature_log_entry(unit_id, date_str):
     
     if request.method == 'GET':
         try:
-            # Get or create log for this unit and date
-            log = TemperatureLog.query.filter_by(unit_id=unit_id, log_date=log_date).first()
+            # Get or create log for this unit and date (only the columns the response uses)
+            log = TemperatureLog.query.options(load_only(
+                TemperatureLog.id, TemperatureLog.unit_id, TemperatureLog.log_date,
+                TemperatureLog.supervisor_verified, TemperatureLog.supervisor_name
+            )).filter_by(unit_id=unit_id, log_date=log_date).first()
             
             if not log:
                 # Create new log
@@ -980,8 +1285,18 @@ def temperature_log_entry(unit_id, date_str):
                 db.session.add(log)
                 db.session.commit()
             
-            # Get all entries for this log, ordered by scheduled time
-            entries = log.entries.order_by(TemperatureEntry.scheduled_time).all()
+            # Get all entries for this log, ordered by scheduled time, as plain column rows
+            entries = log.entries.with_entities(
+                TemperatureEntry.id,
+                TemperatureEntry.scheduled_time,
+                TemperatureEntry.temperature,
+                TemperatureEntry.corrective_action,
+                TemperatureEntry.action_time,
+                TemperatureEntry.recheck_temperature,
+                TemperatureEntry.initial,
+                TemperatureEntry.is_late_entry,
+                TemperatureEntry.entry_timestamp
+            ).order_by(TemperatureEntry.scheduled_time).all()
             entry_dict = {entry.scheduled_time: {
                 'id': entry.id,
                 'temperature': entry.temperature,
@@ -1033,71 +1348,50 @@ def temperature_log_entry(unit_id, date_str):
             
             if action == 'save_entry':
                 try:
-                    # Get or create log
-                    log = TemperatureLog.query.filter_by(unit_id=unit_id, log_date=log_date).first()
-                    if not log:
-                        # Calculate week_start_date (Monday of the week)
-                        week_start = TemperatureLog.calculate_week_start(log_date)
-                        # Get the scheduled_time from the entry being saved
-                        scheduled_time = data.get('scheduled_time', '10:00 AM')
-                        # Get temperature from the entry being saved (for database compatibility)
-                        # If temperature is None and database requires NOT NULL, use 0.0 as default
-                        temperature = data.get('temperature')
-                        if temperature is None:
-                            temperature = 0.0  # Default value if database requires NOT NULL
-                        log = TemperatureLog(
-                            unit_id=unit_id,
-                            log_date=log_date,
-                            week_start_date=week_start,
-                            time_slot=scheduled_time,  # Set time_slot from the entry being saved
-                            temperature=temperature,  # Set temperature for database compatibility
-                            organisation=current_user.organisation or current_user.restaurant_bar_name
-                        )
-                        db.session.add(log)
-                        db.session.commit()
-                    
-                    scheduled_time = data['scheduled_time']
-                    temperature = data.get('temperature')
-                    corrective_action = data.get('corrective_action', '')
-                    action_time_str = data.get('action_time')
-                    recheck_temperature = data.get('recheck_temperature')
-                    initial = data.get('initial', '')
-                    is_late_entry = data.get('is_late_entry', False)
-                    
-                    # Check if entry already exists
-                    entry = TemperatureEntry.query.filter_by(log_id=log.id, scheduled_time=scheduled_time).first()
-                    
-                    if entry:
-                        # Update existing entry
-                        entry.temperature = temperature
-                        entry.corrective_action = corrective_action
-                        entry.recheck_temperature = recheck_temperature
-                        entry.initial = initial
-                        entry.is_late_entry = is_late_entry
-                        if action_time_str:
-                            entry.action_time = datetime.fromisoformat(action_time_str.replace('Z', '+00:00'))
-                        entry.entry_timestamp = datetime.utcnow()
+                    # Validate the whole payload before any database work
+                    fields, error = validate_json_fields(data, TEMPERATURE_ENTRY_FIELDS)
+                    if error:
+                        return jsonify({'success': False, 'error': error}), 400
+                    scheduled_time = fields['scheduled_time']
+                    temperature = fields['temperature']
+                    
+                    # Get or create log; ON CONFLICT keeps concurrent first saves from colliding on unique_unit_date
+                    log_id = db.session.query(TemperatureLog.id).filter_by(unit_id=unit_id, log_date=log_date).scalar()
+                    if log_id is None:
+                        insert_or_ignore(TemperatureLog, ['unit_id', 'log_date'], {
+                            'unit_id': unit_id,
+                            'log_date': log_date,
+                            'week_start_date': TemperatureLog.calculate_week_start(log_date),
+                            'time_slot': scheduled_time,  # Set time_slot from the entry being saved
+                            # Temperature for database compatibility (0.0 if the column is NOT NULL)
+                            'temperature': temperature if temperature is not None else 0.0,
+                            'organisation': current_user.organisation_name
+                        })
+                        log_id = db.session.query(TemperatureLog.id).filter_by(unit_id=unit_id, log_date=log_date).scalar()
+                    
+                    # Insert or update the entry for this slot in one statement
+                    values = {
+                        'log_id': log_id,
+                        'scheduled_time': scheduled_time,
+                        'temperature': temperature,
+                        'corrective_action': fields['corrective_action'],
+                        'recheck_temperature': fields['recheck_temperature'],
+                        'initial': fields['initial'],
+                        'is_late_entry': fields['is_late_entry'],
+                        'created_by': current_user.id
+                    }
+                    if fields['action_time']:
+                        values['action_time'] = fields['action_time']
+                    update_columns = [column for column in values if column not in ('log_id', 'scheduled_time', 'created_by')]
+                    if has_unique_index('unique_log_scheduled_time'):
+                        entry = upsert(TemperatureEntry, ['log_id', 'scheduled_time'], values, update_columns)
                     else:
-                        # Create new entry
-                        entry = TemperatureEntry(
-                            log_id=log.id,
-                            scheduled_time=scheduled_time,
-                            temperature=temperature,
-                            corrective_action=corrective_action,
-                            recheck_temperature=recheck_temperature,
-                            initial=initial,
-                            is_late_entry=is_late_entry,
-                            created_by=current_user.id
-                        )
-                        if action_time_str:
-                            entry.action_time = datetime.fromisoformat(action_time_str.replace('Z', '+00:00'))
-                        db.session.add(entry)
-                    
+                        # The index is skipped while legacy duplicates exist, so ON CONFLICT would have no target
+                        entry = _save_entry_without_unique_index(values, update_columns)
+                    # Check if out of range (before commit expires the unit and forces a reload)
+                    is_out_of_range = TemperatureEntry.temperature_out_of_range(temperature, unit)
                     db.session.commit()
                     
-                    # Check if out of range
-                    is_out_of_range = entry.is_out_of_range(unit) if temperature is not None else False
-                    
                     return jsonify({
                         'success': True,
                         'entry': {
@@ -1145,8 +1439,6 @@ def temperature_log_entry(unit_id, date_str):
 def kitchen_generate_checklist_pdf():
     """Generate checklist PDF (Kitchen) - accessible only to Chef and Manager"""
     try:
-        from utils.pdf_generator import generate_checklist_pdf
-        
         data = request.get_json()
         unit_ids = data.get('unit_ids', [])
         start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
@@ -1160,7 +1452,7 @@ def kitchen_generate_checklist_pdf():
         
         org_filter = get_organization_filter(ColdStorageUnit)
         # Filter by kitchen context
-        units = ColdStorageUnit.query.filter(org_filter).filter(
+        units = _cold_storage_unit_query().filter(org_filter).filter(
             ColdStorageUnit.id.in_(unit_ids),
             ColdStorageUnit.is_active == True,
             ColdStorageUnit.context == 'kitchen'  # Only kitchen units
@@ -1169,8 +1461,8 @@ def kitchen_generate_checklist_pdf():
         if not units:
             return jsonify({'success': False, 'error': 'No units found'}), 400
         
-        # Generate PDF
-        pdf_buffer = generate_checklist_pdf(units, start_date, end_date, times)
+        # Generate PDF (or reuse an identical one while the logs are unchanged)
+        pdf_buffer = _build_cold_storage_pdf(pdf_generator.generate_checklist_pdf, units, start_date, end_date, times)
         
         return send_file(
             pdf_buffer,
@@ -1189,8 +1481,6 @@ def kitchen_generate_checklist_pdf():
 def generate_checklist_pdf():
     """Generate checklist PDF organized by date/time with all selected units"""
     try:
-        from utils.pdf_generator import generate_checklist_pdf
-        
         data = request.get_json()
         unit_ids = data.get('unit_ids', [])
         times = data.get('times', [])
@@ -1205,7 +1495,7 @@ def generate_checklist_pdf():
         
         org_filter = get_organization_filter(ColdStorageUnit)
         # Filter by bar context
-        units = ColdStorageUnit.query.filter(org_filter).filter(
+        units = _cold_storage_unit_query().filter(org_filter).filter(
             ColdStorageUnit.id.in_(unit_ids),
             ColdStorageUnit.is_active == True,
             ColdStorageUnit.context == 'bar'  # Only bar units
@@ -1214,8 +1504,8 @@ def generate_checklist_pdf():
         if not units:
             return jsonify({'success': False, 'error': 'No units found'}), 400
         
-        # Generate PDF
-        pdf_buffer = generate_checklist_pdf(units, start_date, end_date, times)
+        # Generate PDF (or reuse an identical one while the logs are unchanged)
+        pdf_buffer = _build_cold_storage_pdf(pdf_generator.generate_checklist_pdf, units, start_date, end_date, times)
         
         return send_file(
             pdf_buffer,
@@ -1234,8 +1524,6 @@ def generate_checklist_pdf():
 def kitchen_generate_temperature_log_pdf():
     """Generate PDF for temperature logs (Kitchen) - accessible only to Chef and Manager"""
     try:
-        from utils.pdf_generator import generate_temperature_log_pdf
-        
         data = request.get_json()
         unit_ids = data.get('unit_ids', [])
         start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
@@ -1243,7 +1531,7 @@ def kitchen_generate_temperature_log_pdf():
         
         org_filter = get_organization_filter(ColdStorageUnit)
         # Filter by kitchen context
-        units = ColdStorageUnit.query.filter(org_filter).filter(
+        units = _cold_storage_unit_query().filter(org_filter).filter(
             ColdStorageUnit.id.in_(unit_ids),
             ColdStorageUnit.is_active == True,
             ColdStorageUnit.context == 'kitchen'  # Only kitchen units
@@ -1252,8 +1540,8 @@ def kitchen_generate_temperature_log_pdf():
         if not units:
             return jsonify({'success': False, 'error': 'No units selected'}), 400
         
-        # Generate PDF
-        pdf_buffer = generate_temperature_log_pdf(units, start_date, end_date)
+        # Generate PDF (or reuse an identical one while the logs are unchanged)
+        pdf_buffer = _build_cold_storage_pdf(pdf_generator.generate_temperature_log_pdf, units, start_date, end_date)
         
         return send_file(
             pdf_buffer,
@@ -1272,8 +1560,6 @@ def kitchen_generate_temperature_log_pdf():
 def generate_temperature_log_pdf():
     """Generate PDF for temperature logs"""
     try:
-        from utils.pdf_generator import generate_temperature_log_pdf
-        
         data = request.get_json()
         unit_ids = data.get('unit_ids', [])
         start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
@@ -1281,7 +1567,7 @@ def generate_temperature_log_pdf():
         
         org_filter = get_organization_filter(ColdStorageUnit)
         # Filter by bar context
-        units = ColdStorageUnit.query.filter(org_filter).filter(
+        units = _cold_storage_unit_query().filter(org_filter).filter(
             ColdStorageUnit.id.in_(unit_ids),
             ColdStorageUnit.is_active == True,
             ColdStorageUnit.context == 'bar'  # Only bar units
@@ -1290,8 +1576,8 @@ def generate_temperature_log_pdf():
         if not units:
             return jsonify({'success': False, 'error': 'No units selected'}), 400
         
-        # Generate PDF
-        pdf_buffer = generate_temperature_log_pdf(units, start_date, end_date)
+        # Generate PDF (or reuse an identical one while the logs are unchanged)
+        pdf_buffer = _build_cold_storage_pdf(pdf_generator.generate_temperature_log_pdf, units, start_date, end_date)
         
         return send_file(
             pdf_buffer,
@@ -2655,8 +2941,6 @@ def bar_closing_checklist_entries():
 def generate_bar_closing_checklist_pdf():
     """Generate monthly PDF for BAR Closing Checklist - Available to Manager and Bartender"""
     try:
-        from utils.pdf_generator import generate_bar_closing_checklist_pdf
-        
         data = request.get_json()
         unit_id = data.get('unit_id')
         month = data.get('month')  # Format: 'YYYY-MM'
@@ -2685,7 +2969,7 @@ def generate_bar_closing_checklist_pdf():
             return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
         
         # Generate PDF
-        pdf_buffer = generate_bar_closing_checklist_pdf(unit, year, month_num)
+        pdf_buffer = pdf_generator.generate_bar_closing_checklist_pdf(unit, year, month_num)
         
         # Generate filename
         month_names = ['January', 'February', 'March', 'April', 'May', 'June',
@@ -3143,8 +3427,6 @@ def chopping_board_checklist_entries():
 def generate_chopping_board_checklist_pdf():
     """Generate monthly PDF for Chopping Board Checklist - Available to Manager and Bartender"""
     try:
-        from utils.pdf_generator import generate_chopping_board_checklist_pdf
-        
         data = request.get_json()
         unit_id = data.get('unit_id')
         month = data.get('month')  # Format: 'YYYY-MM'
@@ -3173,7 +3455,7 @@ def generate_chopping_board_checklist_pdf():
             return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
         
         # Generate PDF
-        pdf_buffer = generate_chopping_board_checklist_pdf(unit, year, month_num)
+        pdf_buffer = pdf_generator.generate_chopping_board_checklist_pdf(unit, year, month_num)
         
         # Generate filename
         month_names = ['January', 'February', 'March', 'April', 'May', 'June',
@@ -3632,8 +3914,6 @@ def kitchen_chopping_board_checklist_entries():
 def generate_kitchen_chopping_board_checklist_pdf():
     """Generate monthly PDF for Chopping Board Checklist - Available to Manager and Bartender"""
     try:
-        from utils.pdf_generator import generate_kitchen_chopping_board_checklist_pdf
-        
         data = request.get_json()
         unit_id = data.get('unit_id')
         month = data.get('month')  # Format: 'YYYY-MM'
@@ -3662,7 +3942,7 @@ def generate_kitchen_chopping_board_checklist_pdf():
             return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
         
         # Generate PDF
-        pdf_buffer = generate_kitchen_chopping_board_checklist_pdf(unit, year, month_num)
+        pdf_buffer = pdf_generator.generate_kitchen_chopping_board_checklist_pdf(unit, year, month_num)
         
         # Generate filename
         month_names = ['January', 'February', 'March', 'April', 'May', 'June',
@@ -3689,6 +3969,25 @@ def generate_kitchen_chopping_board_checklist_pdf():
 # CHOPPING BOARD CHECKLIST ROUTES
 # ============================================
 
+# JSON body specs for the opening checklist write actions: name -> (type, default, label[, max_length])
+BAR_OPENING_UNIT_FIELDS = {
+    'unit_name': (str, 'BAR', 'Unit name', 100),
+    'description': (str, '', 'Description', 255),
+}
+BAR_OPENING_POINT_FIELDS = {
+    'unit_id': (int, REQUIRED, 'Unit ID'),
+    'group_name': (str, 'Cleaning & Sanitisation', 'Group name', 100),
+    'point_text': (str, REQUIRED, 'Checklist point text', 500),
+    'display_order': (int, REQUIRED, 'Display order'),
+}
+BAR_OPENING_ITEM_FIELDS = {
+    'entry_id': (int, REQUIRED, 'Entry ID'),
+    'checklist_point_id': (int, REQUIRED, 'Checklist point ID'),
+    'is_completed': (bool, False, 'Completed flag'),
+    'staff_initials': (str, '', 'Staff initials', 10),
+}
+
+
 @checklist_bp.route('/bar/opening', methods=['GET'])
 @login_required
 @role_required(['Manager', 'Bartender'])
@@ -3703,281 +4002,225 @@ def bar_opening_checklist():
 @role_required(['Manager', 'Bartender'])
 def manage_bar_opening_units():
     """API endpoint for managing opening checklist units - Manager only for create/update/delete"""
+    # Unexpected errors are rolled back and logged by handle_unexpected_error
     if request.method == 'GET':
-        try:
-            org_filter = get_organization_filter(BarOpeningChecklistUnit)
-            units = BarOpeningChecklistUnit.query.filter(org_filter).filter_by(
-                is_active=True
-            ).order_by(BarOpeningChecklistUnit.unit_name).all()
-            return jsonify([{
-                'id': unit.id,
-                'unit_name': unit.unit_name,
-                'description': unit.description
-            } for unit in units])
-        except Exception as e:
-            current_app.logger.error(f"Error loading units: {str(e)}", exc_info=True)
-            return jsonify([])
+        org_filter = get_organization_filter(BarOpeningChecklistUnit)
+        units = BarOpeningChecklistUnit.query.filter(org_filter).filter_by(
+            is_active=True
+        ).order_by(BarOpeningChecklistUnit.unit_name).all()
+        return _conditional_json([{
+            'id': unit.id,
+            'unit_name': unit.unit_name,
+            'description': unit.description
+        } for unit in units])
     
-    elif request.method == 'POST':
-        try:
-            data = request.get_json()
-            if not data:
-                return jsonify({'success': False, 'error': 'No data provided'}), 400
-            
-            action = data.get('action')
-            
-            if action == 'create':
-                # Normalize role check - strip whitespace and handle None
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    current_app.logger.warning(f"Non-Manager user {current_user.id} (role: '{current_user.user_role}') attempted to create unit")
-                    return jsonify({'success': False, 'error': 'Only Managers can create new units'}), 403
-                
-                unit_name = data.get('unit_name', '').strip() or 'BAR'
-                description = data.get('description', '').strip()
-                
-                try:
-                    org_filter = get_organization_filter(BarOpeningChecklistUnit)
-                    existing_unit = BarOpeningChecklistUnit.query.filter(org_filter).filter_by(
-                        unit_name=unit_name,
-                        is_active=True
-                    ).first()
-                    
-                    if existing_unit:
-                        return jsonify({'success': False, 'error': f'Unit name "{unit_name}" already exists'}), 400
-                    
-                    # Ensure organisation is not None or empty string
-                    organisation = (current_user.organisation or current_user.restaurant_bar_name or '').strip()
-                    if not organisation:
-                        return jsonify({'success': False, 'error': 'User organization is required to create units'}), 400
-                    
-                    unit = BarOpeningChecklistUnit(
-                        unit_name=unit_name,
-                        description=description,
-                        organisation=organisation,
-                        created_by=current_user.id,
-                        is_active=True
-                    )
-                    db.session.add(unit)
-                    db.session.commit()
-                    
-                    current_app.logger.info(f"Manager {current_user.id} created opening unit {unit.id} ({unit.unit_name})")
-                    return jsonify({'success': True, 'unit': {
-                        'id': unit.id,
-                        'unit_name': unit.unit_name,
-                        'description': unit.description
-                    }})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error creating unit: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error creating unit: {str(e)}'}), 500
-            
-            elif action == 'update':
-                # Normalize role check - strip whitespace and handle None
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can update units'}), 403
-                
-                if not data.get('id'):
-                    return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-                
-                try:
-                    unit = BarOpeningChecklistUnit.query.get(data['id'])
-                    if not unit:
-                        return jsonify({'success': False, 'error': 'Unit not found'}), 404
-                    
-                    org_filter = get_organization_filter(BarOpeningChecklistUnit)
-                    if not BarOpeningChecklistUnit.query.filter(org_filter).filter_by(id=unit.id).first():
-                        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
-                    
-                    unit.unit_name = data.get('unit_name', unit.unit_name)
-                    unit.description = data.get('description', unit.description)
-                    db.session.commit()
-                    return jsonify({'success': True})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error updating unit: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error updating unit: {str(e)}'}), 500
-            
-            elif action == 'delete':
-                # Normalize role check - strip whitespace and handle None
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can delete units'}), 403
-                
-                if not data.get('id'):
-                    return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-                
-                try:
-                    unit = BarOpeningChecklistUnit.query.get(data['id'])
-                    if not unit:
-                        return jsonify({'success': False, 'error': 'Unit not found'}), 404
-                    
-                    org_filter = get_organization_filter(BarOpeningChecklistUnit)
-                    if not BarOpeningChecklistUnit.query.filter(org_filter).filter_by(id=unit.id).first():
-                        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
-                    
-                    # Soft delete - set is_active to False (historical records remain)
-                    unit.is_active = False
-                    db.session.commit()
-                    return jsonify({'success': True})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error deleting unit: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error deleting unit: {str(e)}'}), 500
-            
-            else:
-                return jsonify({'success': False, 'error': 'Invalid action'}), 400
-        except Exception as e:
-            current_app.logger.error(f"Error in manage_chopping_board_units: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': str(e)}), 500
-
-
-@checklist_bp.route('/bar/opening/points', methods=['GET', 'POST'])
-@login_required
-@role_required(['Manager', 'Bartender'])
-def manage_bar_opening_points():
-    """API endpoint for managing opening checklist points - Manager only for create/update/delete"""
-    if request.method == 'GET':
-        try:
-            unit_id = request.args.get('unit_id', type=int)
-            if not unit_id:
-                return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-            
-            org_filter = get_organization_filter(BarOpeningChecklistPoint)
-            points = BarOpeningChecklistPoint.query.filter(org_filter).filter_by(
-                unit_id=unit_id,
-                is_active=True
-            ).order_by(BarOpeningChecklistPoint.display_order).all()
-            
-            return jsonify([{
-                'id': point.id,
-                'unit_id': point.unit_id,
-                'group_name': point.group_name,
-                'point_text': point.point_text,
-                'display_order': point.display_order
-            } for point in points])
-        except Exception as e:
-            current_app.logger.error(f"Error loading checklist points: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': str(e)}), 500
+    data = request.get_json()
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
     
-    elif request.method == 'POST':
-        try:
-            data = request.get_json()
-            if not data:
-                return jsonify({'success': False, 'error': 'No data provided'}), 400
-            
-            action = data.get('action')
-            
-            if action == 'create':
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can create checklist points'}), 403
-                
-                unit_id = data.get('unit_id')
-                group_name = data.get('group_name', '').strip() or 'Cleaning & Sanitisation'
-                point_text = data.get('point_text', '').strip()
-                display_order = data.get('display_order')
-                
-                if not unit_id:
-                    return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-                if not point_text:
-                    return jsonify({'success': False, 'error': 'Checklist point text is required'}), 400
-                if display_order is None:
-                    return jsonify({'success': False, 'error': 'Display order is required'}), 400
-                
-                try:
-                    # Verify unit exists and user has access
-                    org_filter = get_organization_filter(BarOpeningChecklistUnit)
-                    unit = BarOpeningChecklistUnit.query.filter(org_filter).filter_by(id=unit_id, is_active=True).first()
-                    if not unit:
-                        return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
-                    
-                    point = BarOpeningChecklistPoint(
-                        unit_id=unit_id,
-                        group_name=group_name,
-                        point_text=point_text,
-                        display_order=display_order,
-                        organisation=current_user.organisation or current_user.restaurant_bar_name,
-                        created_by=current_user.id,
-                        is_active=True
-                    )
-                    db.session.add(point)
-                    db.session.commit()
-                    
-                    return jsonify({'success': True, 'point': {
-                        'id': point.id,
-                        'unit_id': point.unit_id,
-                        'group_name': point.group_name,
-                        'point_text': point.point_text,
-                        'display_order': point.display_order
-                    }})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error creating checklist point: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error creating checklist point: {str(e)}'}), 500
-            
-            elif action == 'update':
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can update checklist points'}), 403
-                
-                if not data.get('id'):
-                    return jsonify({'success': False, 'error': 'Point ID is required'}), 400
-                
-                try:
-                    point = BarOpeningChecklistPoint.query.get(data['id'])
-                    if not point:
-                        return jsonify({'success': False, 'error': 'Checklist point not found'}), 404
-                    
-                    org_filter = get_organization_filter(BarOpeningChecklistPoint)
-                    if not BarOpeningChecklistPoint.query.filter(org_filter).filter_by(id=point.id).first():
-                        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
-                    
-                    if 'group_name' in data:
-                        point.group_name = data['group_name']
-                    if 'point_text' in data:
-                        point.point_text = data['point_text']
-                    if 'display_order' in data:
-                        point.display_order = data['display_order']
-                    
-                    db.session.commit()
-                    return jsonify({'success': True})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error updating checklist point: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error updating checklist point: {str(e)}'}), 500
-            
-            elif action == 'delete':
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can delete checklist points'}), 403
-                
-                if not data.get('id'):
-                    return jsonify({'success': False, 'error': 'Point ID is required'}), 400
-                
-                try:
-                    point = BarOpeningChecklistPoint.query.get(data['id'])
-                    if not point:
-                        return jsonify({'success': False, 'error': 'Checklist point not found'}), 404
-                    
-                    org_filter = get_organization_filter(BarOpeningChecklistPoint)
-                    if not BarOpeningChecklistPoint.query.filter(org_filter).filter_by(id=point.id).first():
-                        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
-                    
-                    # Soft delete - set is_active to False
-                    point.is_active = False
-                    db.session.commit()
-                    return jsonify({'success': True})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error deleting checklist point: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error deleting checklist point: {str(e)}'}), 500
-            
-            return jsonify({'success': False, 'error': 'Invalid action'}), 400
-        except Exception as e:
-            current_app.logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': f'Unexpected error: {str(e)}'}), 500
+    action = data.get('action')
+    
+    if action == 'create':
+        if current_user.normalized_role not in MANAGER_ROLES:
+            current_app.logger.warning("Non-Manager user %s (role: '%s') attempted to create unit",
+                                       current_user.id, current_user.user_role)
+            return jsonify({'success': False, 'error': 'Only Managers can create new units'}), 403
+        
+        fields, error = validate_json_fields(data, BAR_OPENING_UNIT_FIELDS)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        unit_name = fields['unit_name']
+        description = fields['description']
+        
+        org_filter = get_organization_filter(BarOpeningChecklistUnit)
+        existing_unit = BarOpeningChecklistUnit.query.filter(org_filter).filter_by(
+            unit_name=unit_name,
+            is_active=True
+        ).first()
+        
+        if existing_unit:
+            return jsonify({'success': False, 'error': f'Unit name "{unit_name}" already exists'}), 400
+        
+        # Ensure organisation is not None or empty string
+        organisation = (current_user.organisation or current_user.restaurant_bar_name or '').strip()
+        if not organisation:
+            return jsonify({'success': False, 'error': 'User organization is required to create units'}), 400
+        
+        unit = BarOpeningChecklistUnit(
+            unit_name=unit_name,
+            description=description,
+            organisation=organisation,
+            created_by=current_user.id,
+            is_active=True
+        )
+        db.session.add(unit)
+        db.session.commit()
+        
+        current_app.logger.info("Manager %s created opening unit %s (%s)", current_user.id, unit.id, unit.unit_name)
+        return jsonify({'success': True, 'unit': {
+            'id': unit.id,
+            'unit_name': unit.unit_name,
+            'description': unit.description
+        }})
+    
+    elif action == 'update':
+        if current_user.normalized_role not in MANAGER_ROLES:
+            return jsonify({'success': False, 'error': 'Only Managers can update units'}), 403
+        
+        if not data.get('id'):
+            return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
+        
+        unit = BarOpeningChecklistUnit.query.get(data['id'])
+        if not unit:
+            return jsonify({'success': False, 'error': 'Unit not found'}), 404
+        
+        org_filter = get_organization_filter(BarOpeningChecklistUnit)
+        if not BarOpeningChecklistUnit.query.filter(org_filter).filter_by(id=unit.id).first():
+            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        
+        unit.unit_name = data.get('unit_name', unit.unit_name)
+        unit.description = data.get('description', unit.description)
+        db.session.commit()
+        return jsonify({'success': True})
+    
+    elif action == 'delete':
+        if current_user.normalized_role not in MANAGER_ROLES:
+            return jsonify({'success': False, 'error': 'Only Managers can delete units'}), 403
+        
+        if not data.get('id'):
+            return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
+        
+        unit = BarOpeningChecklistUnit.query.get(data['id'])
+        if not unit:
+            return jsonify({'success': False, 'error': 'Unit not found'}), 404
+        
+        org_filter = get_organization_filter(BarOpeningChecklistUnit)
+        if not BarOpeningChecklistUnit.query.filter(org_filter).filter_by(id=unit.id).first():
+            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        
+        # Soft delete - set is_active to False (historical records remain)
+        unit.is_active = False
+        db.session.commit()
+        return jsonify({'success': True})
+    
+    return jsonify({'success': False, 'error': 'Invalid action'}), 400
+
+
+@checklist_bp.route('/bar/opening/points', methods=['GET', 'POST'])
+@login_required
+@role_required(['Manager', 'Bartender'])
+def manage_bar_opening_points():
+    """API endpoint for managing opening checklist points - Manager only for create/update/delete"""
+    # Unexpected errors are rolled back and logged by handle_unexpected_error
+    if request.method == 'GET':
+        unit_id = request.args.get('unit_id', type=int)
+        if not unit_id:
+            return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
+        
+        org_filter = get_organization_filter(BarOpeningChecklistPoint)
+        points = BarOpeningChecklistPoint.query.filter(org_filter).filter_by(
+            unit_id=unit_id,
+            is_active=True
+        ).order_by(BarOpeningChecklistPoint.display_order).all()
+        
+        return _conditional_json([{
+            'id': point.id,
+            'unit_id': point.unit_id,
+            'group_name': point.group_name,
+            'point_text': point.point_text,
+            'display_order': point.display_order
+        } for point in points])
+    
+    data = request.get_json()
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    
+    action = data.get('action')
+    
+    if action == 'create':
+        if current_user.normalized_role not in MANAGER_ROLES:
+            return jsonify({'success': False, 'error': 'Only Managers can create checklist points'}), 403
+        
+        fields, error = validate_json_fields(data, BAR_OPENING_POINT_FIELDS)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        unit_id = fields['unit_id']
+        group_name = fields['group_name']
+        point_text = fields['point_text']
+        display_order = fields['display_order']
+        
+        # Verify unit exists and user has access
+        org_filter = get_organization_filter(BarOpeningChecklistUnit)
+        unit = BarOpeningChecklistUnit.query.filter(org_filter).filter_by(id=unit_id, is_active=True).first()
+        if not unit:
+            return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
+        
+        point = BarOpeningChecklistPoint(
+            unit_id=unit_id,
+            group_name=group_name,
+            point_text=point_text,
+            display_order=display_order,
+            organisation=current_user.organisation or current_user.restaurant_bar_name,
+            created_by=current_user.id,
+            is_active=True
+        )
+        db.session.add(point)
+        db.session.commit()
+        
+        return jsonify({'success': True, 'point': {
+            'id': point.id,
+            'unit_id': point.unit_id,
+            'group_name': point.group_name,
+            'point_text': point.point_text,
+            'display_order': point.display_order
+        }})
+    
+    elif action == 'update':
+        if current_user.normalized_role not in MANAGER_ROLES:
+            return jsonify({'success': False, 'error': 'Only Managers can update checklist points'}), 403
+        
+        if not data.get('id'):
+            return jsonify({'success': False, 'error': 'Point ID is required'}), 400
+        
+        point = BarOpeningChecklistPoint.query.get(data['id'])
+        if not point:
+            return jsonify({'success': False, 'error': 'Checklist point not found'}), 404
+        
+        org_filter = get_organization_filter(BarOpeningChecklistPoint)
+        if not BarOpeningChecklistPoint.query.filter(org_filter).filter_by(id=point.id).first():
+            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        
+        if 'group_name' in data:
+            point.group_name = data['group_name']
+        if 'point_text' in data:
+            point.point_text = data['point_text']
+        if 'display_order' in data:
+            point.display_order = data['display_order']
+        
+        db.session.commit()
+        return jsonify({'success': True})
+    
+    elif action == 'delete':
+        if current_user.normalized_role not in MANAGER_ROLES:
+            return jsonify({'success': False, 'error': 'Only Managers can delete checklist points'}), 403
+        
+        if not data.get('id'):
+            return jsonify({'success': False, 'error': 'Point ID is required'}), 400
+        
+        point = BarOpeningChecklistPoint.query.get(data['id'])
+        if not point:
+            return jsonify({'success': False, 'error': 'Checklist point not found'}), 404
+        
+        org_filter = get_organization_filter(BarOpeningChecklistPoint)
+        if not BarOpeningChecklistPoint.query.filter(org_filter).filter_by(id=point.id).first():
+            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        
+        # Soft delete - set is_active to False
+        point.is_active = False
+        db.session.commit()
+        return jsonify({'success': True})
+    
+    return jsonify({'success': False, 'error': 'Invalid action'}), 400
 
 
 @checklist_bp.route('/bar/opening/entries', methods=['GET', 'POST'])
@@ -3985,192 +4228,245 @@ def manage_bar_opening_points():
 @role_required(['Manager', 'Bartender'])
 def bar_opening_checklist_entries():
     """API endpoint for opening checklist entries"""
+    # Unexpected errors are rolled back and logged by handle_unexpected_error
     if request.method == 'GET':
+        unit_id = request.args.get('unit_id', type=int)
+        entry_date_str = request.args.get('entry_date')
+        
+        if not unit_id or not entry_date_str:
+            return jsonify({'success': False, 'error': 'Unit ID and entry date are required'}), 400
+        
         try:
-            unit_id = request.args.get('unit_id', type=int)
-            entry_date_str = request.args.get('entry_date')
-            
-            if not unit_id or not entry_date_str:
-                return jsonify({'success': False, 'error': 'Unit ID and entry date are required'}), 400
-            
             entry_date = datetime.strptime(entry_date_str, '%Y-%m-%d').date()
-            
-            # Get or create entry
-            org_filter = get_organization_filter(BarOpeningChecklistEntry)
-            entry = BarOpeningChecklistEntry.query.filter(org_filter).filter_by(
-                unit_id=unit_id,
-                entry_date=entry_date
-            ).first()
-            
-            if not entry:
-                # Create new entry
-                entry = BarOpeningChecklistEntry(
-                    unit_id=unit_id,
-                    entry_date=entry_date,
-                    organisation=current_user.organisation or current_user.restaurant_bar_name,
-                    created_by=current_user.id
-                )
-                db.session.add(entry)
-                db.session.commit()
-            
-            # Get all checklist points for this unit
-            org_filter_points = get_organization_filter(BarOpeningChecklistPoint)
-            points = BarOpeningChecklistPoint.query.filter(org_filter_points).filter_by(
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid date format'}), 400
+        
+        # Get or create entry
+        org_filter = get_organization_filter(BarOpeningChecklistEntry)
+        entry = BarOpeningChecklistEntry.query.filter(org_filter).filter_by(
+            unit_id=unit_id,
+            entry_date=entry_date
+        ).first()
+        
+        if not entry:
+            # Create new entry
+            entry = BarOpeningChecklistEntry(
                 unit_id=unit_id,
-                is_active=True
-            ).order_by(BarOpeningChecklistPoint.display_order).all()
-            
-            # Get all items for this entry
-            items = {item.checklist_point_id: {
-                'id': item.id,
-                'is_completed': item.is_completed,
-                'staff_initials': item.staff_initials
-            } for item in entry.items.all()}
-            
-            # Build response with points and their completion status
-            points_data = []
-            for point in points:
-                item = items.get(point.id)
-                points_data.append({
-                    'point_id': point.id,
-                    'group_name': point.group_name,
-                    'point_text': point.point_text,
-                    'display_order': point.display_order,
-                    'item_id': item['id'] if item else None,
-                    'is_completed': item['is_completed'] if item else False,
-                    'staff_initials': item['staff_initials'] if item else None
-                })
-            
-            return jsonify({
-                'success': True,
-                'entry_id': entry.id,
-                'unit_id': entry.unit_id,
-                'entry_date': entry.entry_date.isoformat(),
-                'points': points_data
+                entry_date=entry_date,
+                organisation=current_user.organisation or current_user.restaurant_bar_name,
+                created_by=current_user.id
+            )
+            db.session.add(entry)
+            db.session.commit()
+        
+        # Get all checklist points for this unit
+        org_filter_points = get_organization_filter(BarOpeningChecklistPoint)
+        points = BarOpeningChecklistPoint.query.filter(org_filter_points).filter_by(
+            unit_id=unit_id,
+            is_active=True
+        ).order_by(BarOpeningChecklistPoint.display_order).all()
+        
+        # Get all items for this entry
+        items = {item.checklist_point_id: {
+            'id': item.id,
+            'is_completed': item.is_completed,
+            'staff_initials': item.staff_initials
+        } for item in entry.items.all()}
+        
+        # Build response with points and their completion status
+        points_data = []
+        for point in points:
+            item = items.get(point.id)
+            points_data.append({
+                'point_id': point.id,
+                'group_name': point.group_name,
+                'point_text': point.point_text,
+                'display_order': point.display_order,
+                'item_id': item['id'] if item else None,
+                'is_completed': item['is_completed'] if item else False,
+                'staff_initials': item['staff_initials'] if item else None
             })
-        except Exception as e:
-            current_app.logger.error(f"Error loading entry: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': str(e)}), 500
+        
+        return jsonify({
+            'success': True,
+            'entry_id': entry.id,
+            'unit_id': entry.unit_id,
+            'entry_date': entry.entry_date.isoformat(),
+            'points': points_data
+        })
     
-    elif request.method == 'POST':
-        try:
-            data = request.get_json()
-            if not data:
-                return jsonify({'success': False, 'error': 'No data provided'}), 400
-            
-            action = data.get('action')
-            
-            if action == 'update_item':
-                # Staff can update items (mark as completed, add initials)
-                entry_id = data.get('entry_id')
-                checklist_point_id = data.get('checklist_point_id')
-                is_completed = data.get('is_completed', False)
-                staff_initials = data.get('staff_initials', '').strip()
-                
-                if not entry_id or not checklist_point_id:
-                    return jsonify({'success': False, 'error': 'Entry ID and checklist point ID are required'}), 400
-                
-                try:
-                    # Verify entry exists and user has access
-                    org_filter = get_organization_filter(BarOpeningChecklistEntry)
-                    entry = BarOpeningChecklistEntry.query.filter(org_filter).filter_by(id=entry_id).first()
-                    if not entry:
-                        return jsonify({'success': False, 'error': 'Entry not found or unauthorized'}), 404
-                    
-                    # Get or create item
-                    item = BarOpeningChecklistItem.query.filter_by(
-                        entry_id=entry_id,
-                        checklist_point_id=checklist_point_id
-                    ).first()
-                    
-                    if item:
-                        # Update existing item
-                        item.is_completed = is_completed
-                        item.staff_initials = staff_initials if staff_initials else None
-                    else:
-                        # Create new item
-                        item = BarOpeningChecklistItem(
-                            entry_id=entry_id,
-                            checklist_point_id=checklist_point_id,
-                            is_completed=is_completed,
-                            staff_initials=staff_initials if staff_initials else None,
-                            organisation=current_user.organisation or current_user.restaurant_bar_name
-                        )
-                        db.session.add(item)
-                    
-                    db.session.commit()
-                    
-                    return jsonify({
-                        'success': True,
-                        'item': {
-                            'id': item.id,
-                            'is_completed': item.is_completed,
-                            'staff_initials': item.staff_initials
-                        }
-                    })
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error updating item: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error updating item: {str(e)}'}), 500
-            
-            return jsonify({'success': False, 'error': 'Invalid action'}), 400
-        except Exception as e:
-            current_app.logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': f'Unexpected error: {str(e)}'}), 500
-
-
-@checklist_bp.route('/bar/opening/pdf', methods=['POST'])
-@login_required
-@role_required(['Manager', 'Bartender'])
-def generate_bar_opening_checklist_pdf():
-    """Generate monthly PDF for Opening Checklist - Available to Manager and Bartender"""
-    try:
-        from utils.pdf_generator import generate_bar_opening_checklist_pdf
+    data = request.get_json()
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    
+    action = data.get('action')
+    
+    if action == 'update_item':
+        # Staff can update items (mark as completed, add initials)
+        fields, error = validate_json_fields(data, BAR_OPENING_ITEM_FIELDS)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        entry_id = fields['entry_id']
+        checklist_point_id = fields['checklist_point_id']
+        is_completed = fields['is_completed']
+        staff_initials = fields['staff_initials']
         
-        data = request.get_json()
-        unit_id = data.get('unit_id')
-        month = data.get('month')  # Format: 'YYYY-MM'
-        year = data.get('year')
+        # Verify entry exists and user has access
+        org_filter = get_organization_filter(BarOpeningChecklistEntry)
+        entry = BarOpeningChecklistEntry.query.filter(org_filter).filter_by(id=entry_id).first()
+        if not entry:
+            return jsonify({'success': False, 'error': 'Entry not found or unauthorized'}), 404
         
-        if not unit_id:
-            return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-        if not month and not year:
-            return jsonify({'success': False, 'error': 'Month and year are required'}), 400
+        # Coalesce repeated identical toggles (double clicks, client retries). The key is the item, not the
+        # user, and every committed write to it is remembered, so a repeat only matches the item's current state
+        dedupe_key = _bar_opening_item_key(entry_id, checklist_point_id)
+        dedupe_state = (is_completed, staff_initials or None)
+        recent_item = _get_recent_item_write(dedupe_key, dedupe_state)
+        if recent_item:
+            return jsonify({'success': True, 'item': recent_item, 'deduped': True})
         
-        # Parse month/year
-        if month:
-            year, month_num = map(int, month.split('-'))
-        elif year:
-            # If only year provided, use current month
-            from datetime import date
-            month_num = date.today().month
-            year = int(year)
-        else:
-            return jsonify({'success': False, 'error': 'Month and year are required'}), 400
+        # Create or update the item in one statement (unique on entry_id + checklist_point_id)
+        item = upsert(
+            BarOpeningChecklistItem,
+            ['entry_id', 'checklist_point_id'],
+            {
+                'entry_id': entry_id,
+                'checklist_point_id': checklist_point_id,
+                'is_completed': is_completed,
+                'staff_initials': staff_initials if staff_initials else None,
+                'organisation': current_user.organisation or current_user.restaurant_bar_name
+            },
+            ['is_completed', 'staff_initials']
+        )
+        db.session.commit()
         
-        # Verify unit exists and user has access
-        org_filter = get_organization_filter(BarOpeningChecklistUnit)
-        unit = BarOpeningChecklistUnit.query.filter(org_filter).filter_by(id=unit_id, is_active=True).first()
-        if not unit:
-            return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
+        item_payload = {
+            'id': item.id,
+            'is_completed': item.is_completed,
+            'staff_initials': item.staff_initials
+        }
+        _remember_item_write(dedupe_key, dedupe_state, item_payload)
         
-        # Generate PDF
-        pdf_buffer = generate_bar_opening_checklist_pdf(unit, year, month_num)
+        return jsonify({'success': True, 'item': item_payload})
+    
+    elif action == 'update_items':
+        # Apply several item updates in one transaction with a single commit
+        updates = data.get('items')
+        if not isinstance(updates, list) or not updates:
+            return jsonify({'success': False, 'error': 'Items are required'}), 400
         
-        # Generate filename
-        month_names = ['January', 'February', 'March', 'April', 'May', 'June',
-                      'July', 'August', 'September', 'October', 'November', 'December']
-        filename = f'BAR_Opening_Checklist_{month_names[month_num-1]}_{year}.pdf'
+        parsed_updates = []
+        for update in updates:
+            if not isinstance(update, dict):
+                return jsonify({'success': False, 'error': 'Invalid item'}), 400
+            fields, error = validate_json_fields(update, BAR_OPENING_ITEM_FIELDS)
+            if error:
+                return jsonify({'success': False, 'error': error}), 400
+            parsed_updates.append(fields)
         
-        return send_file(
-            pdf_buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        )
-    except Exception as e:
-        current_app.logger.error(f"Error generating PDF: {str(e)}", exc_info=True)
-        return jsonify({'success': False, 'error': str(e)}), 500
+        # Verify every referenced entry exists and user has access
+        entry_ids = {fields['entry_id'] for fields in parsed_updates}
+        org_filter = get_organization_filter(BarOpeningChecklistEntry)
+        accessible = BarOpeningChecklistEntry.query.filter(org_filter).filter(
+            BarOpeningChecklistEntry.id.in_(entry_ids)
+        ).count()
+        if accessible != len(entry_ids):
+            return jsonify({'success': False, 'error': 'Entry not found or unauthorized'}), 404
+        
+        organisation = current_user.organisation or current_user.restaurant_bar_name
+        items = []
+        for fields in parsed_updates:
+            item = upsert(
+                BarOpeningChecklistItem,
+                ['entry_id', 'checklist_point_id'],
+                {
+                    'entry_id': fields['entry_id'],
+                    'checklist_point_id': fields['checklist_point_id'],
+                    'is_completed': fields['is_completed'],
+                    'staff_initials': fields['staff_initials'] or None,
+                    'organisation': organisation
+                },
+                ['is_completed', 'staff_initials']
+            )
+            items.append({
+                'id': item.id,
+                'checklist_point_id': item.checklist_point_id,
+                'is_completed': item.is_completed,
+                'staff_initials': item.staff_initials
+            })
+        db.session.commit()
+        
+        # Keep the single-item dedupe window in step with the items' new state
+        for fields, item_payload in zip(parsed_updates, items):
+            _remember_item_write(
+                _bar_opening_item_key(fields['entry_id'], fields['checklist_point_id']),
+                (item_payload['is_completed'], item_payload['staff_initials']),
+                {key: item_payload[key] for key in ('id', 'is_completed', 'staff_initials')}
+            )
+        
+        return jsonify({'success': True, 'items': items})
+    
+    return jsonify({'success': False, 'error': 'Invalid action'}), 400
+
+
+@checklist_bp.route('/bar/opening/pdf', methods=['POST'])
+@login_required
+@role_required(['Manager', 'Bartender'])
+def generate_bar_opening_checklist_pdf():
+    """Generate monthly PDF for Opening Checklist - Available to Manager and Bartender"""
+    data = request.get_json()
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    
+    unit_id = data.get('unit_id')
+    month = data.get('month')  # Format: 'YYYY-MM'
+    year = data.get('year')
+    
+    if not unit_id:
+        return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
+    if not month and not year:
+        return jsonify({'success': False, 'error': 'Month and year are required'}), 400
+    
+    # Parse month/year (a bare year means the current month)
+    parsed = _parse_report_month(month, year)
+    if not parsed:
+        return jsonify({'success': False, 'error': 'Invalid month format'}), 400
+    year, month_num = parsed
+    
+    # Verify unit exists and user has access
+    org_filter = get_organization_filter(BarOpeningChecklistUnit)
+    unit = BarOpeningChecklistUnit.query.filter(org_filter).filter_by(id=unit_id, is_active=True).first()
+    if not unit:
+        return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
+    
+    # Generate filename
+    filename = f'BAR_Opening_Checklist_{month_name[month_num]}_{year}.pdf'
+    
+    # Build the PDF in the background; the client polls the status URL for the file
+    job_id = submit_pdf_job(_build_bar_opening_checklist_pdf, unit.id, year, month_num,
+                            filename=filename, owner_id=current_user.id)
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': url_for('checklist.bar_opening_checklist_pdf_status', job_id=job_id)
+    }), 202
+
+
+def _build_bar_opening_checklist_pdf(unit_id, year, month_num):
+    """Background task: reload the unit in the worker's app context and build the PDF"""
+    unit = BarOpeningChecklistUnit.query.get(unit_id)
+    # Keep small PDFs in memory while building, spill larger ones to disk
+    out = SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+    return pdf_generator.generate_bar_opening_checklist_pdf(unit, year, month_num, out=out)
+
+
+@checklist_bp.route('/bar/opening/pdf/<job_id>', methods=['GET'])
+@login_required
+@role_required(['Manager', 'Bartender'])
+def bar_opening_checklist_pdf_status(job_id):
+    """Poll a background Opening Checklist PDF job; returns the file once it is ready"""
+    return _pdf_job_response(job_id)
 
 
 
@@ -4193,479 +4489,482 @@ def bar_shift_closing_checklist():
     return render_template('checklist/bar_shift_closing_checklist.html', today=today)
 
 
-@checklist_bp.route('/bar/shift-closing/units', methods=['GET', 'POST'])
-@login_required
-@role_required(['Manager', 'Bartender'])
-def manage_bar_shift_closing_units():
-    """API endpoint for managing closing checklist units - Manager only for create/update/delete"""
-    if request.method == 'GET':
-        try:
-            org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
-            units = BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(
-                is_active=True
-            ).order_by(BarShiftClosingChecklistUnit.unit_name).all()
-            return jsonify([{
-                'id': unit.id,
-                'unit_name': unit.unit_name,
-                'description': unit.description
-            } for unit in units])
-        except Exception as e:
-            current_app.logger.error(f"Error loading units: {str(e)}", exc_info=True)
-            return jsonify([])
-    
-    elif request.method == 'POST':
-        try:
-            data = request.get_json()
-            if not data:
-                return jsonify({'success': False, 'error': 'No data provided'}), 400
-            
-            action = data.get('action')
-            
-            if action == 'create':
-                # Normalize role check - strip whitespace and handle None
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    current_app.logger.warning(f"Non-Manager user {current_user.id} (role: '{current_user.user_role}') attempted to create unit")
-                    return jsonify({'success': False, 'error': 'Only Managers can create new units'}), 403
-                
-                unit_name = data.get('unit_name', '').strip() or 'BAR'
-                description = data.get('description', '').strip()
-                
-                try:
-                    org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
-                    existing_unit = BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(
-                        unit_name=unit_name,
-                        is_active=True
-                    ).first()
-                    
-                    if existing_unit:
-                        return jsonify({'success': False, 'error': f'Unit name "{unit_name}" already exists'}), 400
-                    
-                    # Ensure organisation is not None or empty string
-                    organisation = (current_user.organisation or current_user.restaurant_bar_name or '').strip()
-                    if not organisation:
-                        return jsonify({'success': False, 'error': 'User organization is required to create units'}), 400
-                    
-                    unit = BarShiftClosingChecklistUnit(
-                        unit_name=unit_name,
-                        description=description,
-                        organisation=organisation,
-                        created_by=current_user.id,
-                        is_active=True
-                    )
-                    db.session.add(unit)
-                    db.session.commit()
-                    
-                    current_app.logger.info(f"Manager {current_user.id} created closing unit {unit.id} ({unit.unit_name})")
-                    return jsonify({'success': True, 'unit': {
-                        'id': unit.id,
-                        'unit_name': unit.unit_name,
-                        'description': unit.description
-                    }})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error creating unit: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error creating unit: {str(e)}'}), 500
-            
-            elif action == 'update':
-                # Normalize role check - strip whitespace and handle None
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can update units'}), 403
-                
-                if not data.get('id'):
-                    return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-                
-                try:
-                    unit = BarShiftClosingChecklistUnit.query.get(data['id'])
-                    if not unit:
-                        return jsonify({'success': False, 'error': 'Unit not found'}), 404
-                    
-                    org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
-                    if not BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(id=unit.id).first():
-                        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
-                    
-                    unit.unit_name = data.get('unit_name', unit.unit_name)
-                    unit.description = data.get('description', unit.description)
-                    db.session.commit()
-                    return jsonify({'success': True})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error updating unit: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error updating unit: {str(e)}'}), 500
-            
-            elif action == 'delete':
-                # Normalize role check - strip whitespace and handle None
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can delete units'}), 403
-                
-                if not data.get('id'):
-                    return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-                
-                try:
-                    unit = BarShiftClosingChecklistUnit.query.get(data['id'])
-                    if not unit:
-                        return jsonify({'success': False, 'error': 'Unit not found'}), 404
-                    
-                    org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
-                    if not BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(id=unit.id).first():
-                        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
-                    
-                    # Soft delete - set is_active to False (historical records remain)
-                    unit.is_active = False
-                    db.session.commit()
-                    return jsonify({'success': True})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error deleting unit: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error deleting unit: {str(e)}'}), 500
-            
-            else:
-                return jsonify({'success': False, 'error': 'Invalid action'}), 400
-        except Exception as e:
-            current_app.logger.error(f"Error in manage_chopping_board_units: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': str(e)}), 500
+# Columns returned by the shift closing JSON endpoints
+BAR_SHIFT_CLOSING_UNIT_COLUMNS = ('id', 'unit_name', 'description')
+BAR_SHIFT_CLOSING_POINT_COLUMNS = ('id', 'unit_id', 'group_name', 'point_text', 'display_order')
+BAR_SHIFT_CLOSING_ITEM_COLUMNS = ('id', 'checklist_point_id', 'is_completed', 'staff_initials')
 
+# JSON body specs for shift closing item writes (see utils.validation.validate_json_fields)
+BAR_SHIFT_CLOSING_ITEM_FIELDS = {
+    'entry_id': (int, REQUIRED, 'Entry ID'),
+    'checklist_point_id': (int, REQUIRED, 'Checklist point ID'),
+    'is_completed': (bool, False, 'Completed flag'),
+    'staff_initials': (str, '', 'Staff initials', 10),
+}
 
-@checklist_bp.route('/bar/shift-closing/points', methods=['GET', 'POST'])
-@login_required
-@role_required(['Manager', 'Bartender'])
-def manage_bar_shift_closing_points():
-    """API endpoint for managing closing checklist points - Manager only for create/update/delete"""
-    if request.method == 'GET':
-        try:
-            unit_id = request.args.get('unit_id', type=int)
-            if not unit_id:
-                return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-            
-            org_filter = get_organization_filter(BarShiftClosingChecklistPoint)
-            points = BarShiftClosingChecklistPoint.query.filter(org_filter).filter_by(
-                unit_id=unit_id,
-                is_active=True
-            ).order_by(BarShiftClosingChecklistPoint.display_order).all()
-            
-            return jsonify([{
-                'id': point.id,
-                'unit_id': point.unit_id,
-                'group_name': point.group_name,
-                'point_text': point.point_text,
-                'display_order': point.display_order
-            } for point in points])
-        except Exception as e:
-            current_app.logger.error(f"Error loading checklist points: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': str(e)}), 500
+_serialize_shift_closing_unit = _row_serializer(BAR_SHIFT_CLOSING_UNIT_COLUMNS)
+_serialize_shift_closing_point = _row_serializer(BAR_SHIFT_CLOSING_POINT_COLUMNS)
+_serialize_shift_closing_item = _row_serializer(BAR_SHIFT_CLOSING_ITEM_COLUMNS)
+
+
+@manager_only('Only Managers can create new units')
+def _create_shift_closing_unit(data):
+    """Create a closing checklist unit in the user's organisation"""
+    organisation = current_user.organisation_name
+    unit_name = data.get('unit_name', '').strip() or 'BAR'
+    description = data.get('description', '').strip()
     
-    elif request.method == 'POST':
-        try:
-            data = request.get_json()
-            if not data:
-                return jsonify({'success': False, 'error': 'No data provided'}), 400
-            
-            action = data.get('action')
-            
-            if action == 'create':
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can create checklist points'}), 403
-                
-                unit_id = data.get('unit_id')
-                group_name = data.get('group_name', '').strip() or 'Cleaning & Sanitisation'
-                point_text = data.get('point_text', '').strip()
-                display_order = data.get('display_order')
-                
-                if not unit_id:
-                    return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-                if not point_text:
-                    return jsonify({'success': False, 'error': 'Checklist point text is required'}), 400
-                if display_order is None:
-                    return jsonify({'success': False, 'error': 'Display order is required'}), 400
-                
-                try:
-                    # Verify unit exists and user has access
-                    org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
-                    unit = BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(id=unit_id, is_active=True).first()
-                    if not unit:
-                        return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
-                    
-                    point = BarShiftClosingChecklistPoint(
-                        unit_id=unit_id,
-                        group_name=group_name,
-                        point_text=point_text,
-                        display_order=display_order,
-                        organisation=current_user.organisation or current_user.restaurant_bar_name,
-                        created_by=current_user.id,
-                        is_active=True
-                    )
-                    db.session.add(point)
-                    db.session.commit()
-                    
-                    return jsonify({'success': True, 'point': {
-                        'id': point.id,
-                        'unit_id': point.unit_id,
-                        'group_name': point.group_name,
-                        'point_text': point.point_text,
-                        'display_order': point.display_order
-                    }})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error creating checklist point: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error creating checklist point: {str(e)}'}), 500
-            
-            elif action == 'update':
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can update checklist points'}), 403
-                
-                if not data.get('id'):
-                    return jsonify({'success': False, 'error': 'Point ID is required'}), 400
-                
-                try:
-                    point = BarShiftClosingChecklistPoint.query.get(data['id'])
-                    if not point:
-                        return jsonify({'success': False, 'error': 'Checklist point not found'}), 404
-                    
-                    org_filter = get_organization_filter(BarShiftClosingChecklistPoint)
-                    if not BarShiftClosingChecklistPoint.query.filter(org_filter).filter_by(id=point.id).first():
-                        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
-                    
-                    if 'group_name' in data:
-                        point.group_name = data['group_name']
-                    if 'point_text' in data:
-                        point.point_text = data['point_text']
-                    if 'display_order' in data:
-                        point.display_order = data['display_order']
-                    
-                    db.session.commit()
-                    return jsonify({'success': True})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error updating checklist point: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error updating checklist point: {str(e)}'}), 500
-            
-            elif action == 'delete':
-                user_role = (current_user.user_role or '').strip()
-                if user_role != 'Manager':
-                    return jsonify({'success': False, 'error': 'Only Managers can delete checklist points'}), 403
-                
-                if not data.get('id'):
-                    return jsonify({'success': False, 'error': 'Point ID is required'}), 400
-                
-                try:
-                    point = BarShiftClosingChecklistPoint.query.get(data['id'])
-                    if not point:
-                        return jsonify({'success': False, 'error': 'Checklist point not found'}), 404
-                    
-                    org_filter = get_organization_filter(BarShiftClosingChecklistPoint)
-                    if not BarShiftClosingChecklistPoint.query.filter(org_filter).filter_by(id=point.id).first():
-                        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
-                    
-                    # Soft delete - set is_active to False
-                    point.is_active = False
-                    db.session.commit()
-                    return jsonify({'success': True})
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error deleting checklist point: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error deleting checklist point: {str(e)}'}), 500
-            
-            return jsonify({'success': False, 'error': 'Invalid action'}), 400
-        except Exception as e:
-            current_app.logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': f'Unexpected error: {str(e)}'}), 500
+    org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
+    existing_unit = BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(
+        unit_name=unit_name,
+        is_active=True
+    ).first()
+    
+    if existing_unit:
+        return jsonify({'success': False, 'error': f'Unit name "{unit_name}" already exists'}), 400
+    
+    # Ensure organisation is not None or empty string
+    if not (organisation or '').strip():
+        return jsonify({'success': False, 'error': 'User organization is required to create units'}), 400
+    
+    unit = BarShiftClosingChecklistUnit(
+        unit_name=unit_name,
+        description=description,
+        organisation=organisation.strip(),
+        created_by=current_user.id,
+        is_active=True
+    )
+    db.session.add(unit)
+    db.session.commit()
+    invalidate_cached('bar_shift_closing_units')
+    
+    current_app.logger.info("Manager %s created closing unit %s (%s)", current_user.id, unit.id, unit.unit_name)
+    return jsonify({'success': True, 'unit': _serialize_shift_closing_unit(unit)})
+
+
+@manager_only('Only Managers can update units')
+def _update_shift_closing_unit(data):
+    """Rename or re-describe a closing checklist unit"""
+    if not data.get('id'):
+        return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
+    
+    # Lookup and organisation check in one query; other organisations' rows read as not found
+    org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
+    unit = BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(id=data['id']).first()
+    if not unit:
+        return jsonify({'success': False, 'error': 'Unit not found'}), 404
+    
+    unit.unit_name = data.get('unit_name', unit.unit_name)
+    unit.description = data.get('description', unit.description)
+    db.session.commit()
+    invalidate_cached('bar_shift_closing_units')
+    return jsonify({'success': True})
+
+
+@manager_only('Only Managers can delete units')
+def _delete_shift_closing_unit(data):
+    """Soft delete a closing checklist unit"""
+    if not data.get('id'):
+        return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
+    
+    # Lookup and organisation check in one query; other organisations' rows read as not found
+    org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
+    unit = BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(id=data['id']).first()
+    if not unit:
+        return jsonify({'success': False, 'error': 'Unit not found'}), 404
+    
+    # Soft delete - set is_active to False (historical records remain)
+    unit.is_active = False
+    db.session.commit()
+    invalidate_cached('bar_shift_closing_units')
+    return jsonify({'success': True})
 
 
-@checklist_bp.route('/bar/shift-closing/entries', methods=['GET', 'POST'])
+# POST actions on /bar/shift-closing/units
+_SHIFT_CLOSING_UNIT_ACTIONS = {
+    'create': _create_shift_closing_unit,
+    'update': _update_shift_closing_unit,
+    'delete': _delete_shift_closing_unit,
+}
+
+
+@checklist_bp.route('/bar/shift-closing/units', methods=['GET', 'POST'])
 @login_required
 @role_required(['Manager', 'Bartender'])
-def bar_shift_closing_checklist_entries():
-    """API endpoint for closing checklist entries"""
+def manage_bar_shift_closing_units():
+    """API endpoint for managing closing checklist units - Manager only for create/update/delete"""
+    # Unexpected errors are rolled back and logged by handle_unexpected_error
     if request.method == 'GET':
-        try:
-            unit_id = request.args.get('unit_id', type=int)
-            entry_date_str = request.args.get('entry_date')
-            
-            if not unit_id or not entry_date_str:
-                return jsonify({'success': False, 'error': 'Unit ID and entry date are required'}), 400
-            
-            entry_date = datetime.strptime(entry_date_str, '%Y-%m-%d').date()
-            
-            # Get or create entry
-            org_filter = get_organization_filter(BarShiftClosingChecklistEntry)
-            entry = BarShiftClosingChecklistEntry.query.filter(org_filter).filter_by(
-                unit_id=unit_id,
-                entry_date=entry_date
-            ).first()
-            
-            if not entry:
-                # Create new entry
-                entry = BarShiftClosingChecklistEntry(
-                    unit_id=unit_id,
-                    entry_date=entry_date,
-                    organisation=current_user.organisation or current_user.restaurant_bar_name,
-                    created_by=current_user.id
-                )
-                db.session.add(entry)
-                db.session.commit()
-            
-            # Get all checklist points for this unit
-            org_filter_points = get_organization_filter(BarShiftClosingChecklistPoint)
-            points = BarShiftClosingChecklistPoint.query.filter(org_filter_points).filter_by(
+        cache_key = get_organization_cache_key()
+        units_data = get_cached('bar_shift_closing_units', cache_key)
+        if units_data is None:
+            org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
+            units = BarShiftClosingChecklistUnit.query.options(
+                load_only(*(getattr(BarShiftClosingChecklistUnit, c) for c in BAR_SHIFT_CLOSING_UNIT_COLUMNS))
+            ).filter(org_filter).filter_by(
+                is_active=True
+            ).order_by(BarShiftClosingChecklistUnit.unit_name).all()
+            units_data = [_serialize_shift_closing_unit(unit) for unit in units]
+            set_cached('bar_shift_closing_units', cache_key, units_data)
+        return _conditional_json(units_data)
+    
+    return _dispatch_json_action(_SHIFT_CLOSING_UNIT_ACTIONS)
+
+
+@manager_only('Only Managers can create checklist points')
+def _create_shift_closing_point(data):
+    """Add a checklist point to a closing checklist unit"""
+    organisation = current_user.organisation_name
+    unit_id = data.get('unit_id')
+    group_name = data.get('group_name', '').strip() or 'Cleaning & Sanitisation'
+    point_text = data.get('point_text', '').strip()
+    display_order = data.get('display_order')
+    
+    if not unit_id:
+        return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
+    if not point_text:
+        return jsonify({'success': False, 'error': 'Checklist point text is required'}), 400
+    if display_order is None:
+        return jsonify({'success': False, 'error': 'Display order is required'}), 400
+    
+    # Verify unit exists and user has access
+    org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
+    unit = BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(id=unit_id, is_active=True).first()
+    if not unit:
+        return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
+    
+    point = BarShiftClosingChecklistPoint(
+        unit_id=unit_id,
+        group_name=group_name,
+        point_text=point_text,
+        display_order=display_order,
+        organisation=organisation,
+        created_by=current_user.id,
+        is_active=True
+    )
+    db.session.add(point)
+    db.session.commit()
+    invalidate_cached('bar_shift_closing_points')
+    
+    return jsonify({'success': True, 'point': _serialize_shift_closing_point(point)})
+
+
+@manager_only('Only Managers can update checklist points')
+def _update_shift_closing_point(data):
+    """Edit a closing checklist point"""
+    if not data.get('id'):
+        return jsonify({'success': False, 'error': 'Point ID is required'}), 400
+    
+    # Lookup and organisation check in one query; other organisations' rows read as not found
+    org_filter = get_organization_filter(BarShiftClosingChecklistPoint)
+    point = BarShiftClosingChecklistPoint.query.filter(org_filter).filter_by(id=data['id']).first()
+    if not point:
+        return jsonify({'success': False, 'error': 'Checklist point not found'}), 404
+    
+    if 'group_name' in data:
+        point.group_name = data['group_name']
+    if 'point_text' in data:
+        point.point_text = data['point_text']
+    if 'display_order' in data:
+        point.display_order = data['display_order']
+    
+    db.session.commit()
+    invalidate_cached('bar_shift_closing_points')
+    return jsonify({'success': True})
+
+
+@manager_only('Only Managers can delete checklist points')
+def _delete_shift_closing_point(data):
+    """Soft delete a closing checklist point"""
+    if not data.get('id'):
+        return jsonify({'success': False, 'error': 'Point ID is required'}), 400
+    
+    # Lookup and organisation check in one query; other organisations' rows read as not found
+    org_filter = get_organization_filter(BarShiftClosingChecklistPoint)
+    point = BarShiftClosingChecklistPoint.query.filter(org_filter).filter_by(id=data['id']).first()
+    if not point:
+        return jsonify({'success': False, 'error': 'Checklist point not found'}), 404
+    
+    # Soft delete - set is_active to False
+    point.is_active = False
+    db.session.commit()
+    invalidate_cached('bar_shift_closing_points')
+    return jsonify({'success': True})
+
+
+# POST actions on /bar/shift-closing/points
+_SHIFT_CLOSING_POINT_ACTIONS = {
+    'create': _create_shift_closing_point,
+    'update': _update_shift_closing_point,
+    'delete': _delete_shift_closing_point,
+}
+
+
+@checklist_bp.route('/bar/shift-closing/points', methods=['GET', 'POST'])
+@login_required
+@role_required(['Manager', 'Bartender'])
+def manage_bar_shift_closing_points():
+    """API endpoint for managing closing checklist points - Manager only for create/update/delete"""
+    # Unexpected errors are rolled back and logged by handle_unexpected_error
+    if request.method == 'GET':
+        unit_id = request.args.get('unit_id', type=int)
+        if not unit_id:
+            return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
+        
+        cache_key = (get_organization_cache_key(), unit_id)
+        points_data = get_cached('bar_shift_closing_points', cache_key)
+        if points_data is None:
+            org_filter = get_organization_filter(BarShiftClosingChecklistPoint)
+            points = BarShiftClosingChecklistPoint.query.options(
+                load_only(*(getattr(BarShiftClosingChecklistPoint, c) for c in BAR_SHIFT_CLOSING_POINT_COLUMNS))
+            ).filter(org_filter).filter_by(
                 unit_id=unit_id,
                 is_active=True
             ).order_by(BarShiftClosingChecklistPoint.display_order).all()
-            
-            # Get all items for this entry
-            items = {item.checklist_point_id: {
-                'id': item.id,
-                'is_completed': item.is_completed,
-                'staff_initials': item.staff_initials
-            } for item in entry.items.all()}
-            
-            # Build response with points and their completion status
-            points_data = []
-            for point in points:
-                item = items.get(point.id)
-                points_data.append({
-                    'point_id': point.id,
-                    'group_name': point.group_name,
-                    'point_text': point.point_text,
-                    'display_order': point.display_order,
-                    'item_id': item['id'] if item else None,
-                    'is_completed': item['is_completed'] if item else False,
-                    'staff_initials': item['staff_initials'] if item else None
-                })
-            
-            return jsonify({
-                'success': True,
-                'entry_id': entry.id,
-                'unit_id': entry.unit_id,
-                'entry_date': entry.entry_date.isoformat(),
-                'points': points_data
-            })
-        except Exception as e:
-            current_app.logger.error(f"Error loading entry: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': str(e)}), 500
+            points_data = [_serialize_shift_closing_point(point) for point in points]
+            set_cached('bar_shift_closing_points', cache_key, points_data)
+        return _conditional_json(points_data)
     
-    elif request.method == 'POST':
-        try:
-            data = request.get_json()
-            if not data:
-                return jsonify({'success': False, 'error': 'No data provided'}), 400
-            
-            action = data.get('action')
-            
-            if action == 'update_item':
-                # Staff can update items (mark as completed, add initials)
-                entry_id = data.get('entry_id')
-                checklist_point_id = data.get('checklist_point_id')
-                is_completed = data.get('is_completed', False)
-                staff_initials = data.get('staff_initials', '').strip()
-                
-                if not entry_id or not checklist_point_id:
-                    return jsonify({'success': False, 'error': 'Entry ID and checklist point ID are required'}), 400
-                
-                try:
-                    # Verify entry exists and user has access
-                    org_filter = get_organization_filter(BarShiftClosingChecklistEntry)
-                    entry = BarShiftClosingChecklistEntry.query.filter(org_filter).filter_by(id=entry_id).first()
-                    if not entry:
-                        return jsonify({'success': False, 'error': 'Entry not found or unauthorized'}), 404
-                    
-                    # Get or create item
-                    item = BarShiftClosingChecklistItem.query.filter_by(
-                        entry_id=entry_id,
-                        checklist_point_id=checklist_point_id
-                    ).first()
-                    
-                    if item:
-                        # Update existing item
-                        item.is_completed = is_completed
-                        item.staff_initials = staff_initials if staff_initials else None
-                    else:
-                        # Create new item
-                        item = BarShiftClosingChecklistItem(
-                            entry_id=entry_id,
-                            checklist_point_id=checklist_point_id,
-                            is_completed=is_completed,
-                            staff_initials=staff_initials if staff_initials else None,
-                            organisation=current_user.organisation or current_user.restaurant_bar_name
-                        )
-                        db.session.add(item)
-                    
-                    db.session.commit()
-                    
-                    return jsonify({
-                        'success': True,
-                        'item': {
-                            'id': item.id,
-                            'is_completed': item.is_completed,
-                            'staff_initials': item.staff_initials
-                        }
-                    })
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error updating item: {str(e)}", exc_info=True)
-                    return jsonify({'success': False, 'error': f'Error updating item: {str(e)}'}), 500
-            
-            return jsonify({'success': False, 'error': 'Invalid action'}), 400
-        except Exception as e:
-            current_app.logger.error(f"Unexpected error: {str(e)}", exc_info=True)
-            return jsonify({'success': False, 'error': f'Unexpected error: {str(e)}'}), 500
+    return _dispatch_json_action(_SHIFT_CLOSING_POINT_ACTIONS)
+
+
+def _update_shift_closing_item(data):
+    """Mark one checklist item complete or not, with staff initials"""
+    fields, error = validate_json_fields(data, BAR_SHIFT_CLOSING_ITEM_FIELDS)
+    if error:
+        return jsonify({'success': False, 'error': error}), 400
+    entry_id = fields['entry_id']
+    checklist_point_id = fields['checklist_point_id']
+    is_completed = fields['is_completed']
+    staff_initials = fields['staff_initials']
+    
+    # Verify entry exists and user has access
+    org_filter = get_organization_filter(BarShiftClosingChecklistEntry)
+    entry = BarShiftClosingChecklistEntry.query.filter(org_filter).filter_by(id=entry_id).first()
+    if not entry:
+        return jsonify({'success': False, 'error': 'Entry not found or unauthorized'}), 404
+    
+    # Create or update the item in one statement (unique on entry_id + checklist_point_id)
+    item = upsert(
+        BarShiftClosingChecklistItem,
+        ['entry_id', 'checklist_point_id'],
+        {
+            'entry_id': entry_id,
+            'checklist_point_id': checklist_point_id,
+            'is_completed': is_completed,
+            'staff_initials': staff_initials if staff_initials else None,
+            'organisation': current_user.organisation_name
+        },
+        ['is_completed', 'staff_initials']
+    )
+    db.session.commit()
+    
+    return jsonify({'success': True, 'item': _serialize_shift_closing_item(item)})
 
 
-@checklist_bp.route('/bar/shift-closing/pdf', methods=['POST'])
+def _update_shift_closing_items(data):
+    """Apply several checklist item changes as one multi-row upsert and a single commit"""
+    updates = data.get('items')
+    if not isinstance(updates, list) or not updates:
+        return jsonify({'success': False, 'error': 'Items are required'}), 400
+    
+    organisation = current_user.organisation_name
+    rows = []
+    for update in updates:
+        if not isinstance(update, dict):
+            return jsonify({'success': False, 'error': 'Invalid item'}), 400
+        # Typed fields: ids are ints (so '5' and 5 are the same entry), 'false' is False, initials are strings
+        fields, error = validate_json_fields(update, BAR_SHIFT_CLOSING_ITEM_FIELDS)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        rows.append({
+            'entry_id': fields['entry_id'],
+            'checklist_point_id': fields['checklist_point_id'],
+            'is_completed': fields['is_completed'],
+            'staff_initials': fields['staff_initials'] or None,
+            'organisation': organisation
+        })
+    
+    # Verify every referenced entry exists and user has access
+    entry_ids = {row['entry_id'] for row in rows}
+    org_filter = get_organization_filter(BarShiftClosingChecklistEntry)
+    accessible = BarShiftClosingChecklistEntry.query.filter(org_filter).filter(
+        BarShiftClosingChecklistEntry.id.in_(entry_ids)
+    ).count()
+    if accessible != len(entry_ids):
+        return jsonify({'success': False, 'error': 'Entry not found or unauthorized'}), 404
+    
+    items = upsert_many(
+        BarShiftClosingChecklistItem,
+        ['entry_id', 'checklist_point_id'],
+        rows,
+        ['is_completed', 'staff_initials']
+    )
+    db.session.commit()
+    
+    return jsonify({'success': True, 'items': [_serialize_shift_closing_item(item) for item in items]})
+
+
+# POST actions on /bar/shift-closing/entries (staff can update items)
+_SHIFT_CLOSING_ENTRY_ACTIONS = {
+    'update_item': _update_shift_closing_item,
+    'update_items': _update_shift_closing_items,
+}
+
+
+@checklist_bp.route('/bar/shift-closing/entries', methods=['GET', 'POST'])
 @login_required
 @role_required(['Manager', 'Bartender'])
-def generate_bar_shift_closing_checklist_pdf():
-    """Generate monthly PDF for Closing Checklist - Available to Manager and Bartender"""
-    try:
-        from utils.pdf_generator import generate_bar_shift_closing_checklist_pdf
+def bar_shift_closing_checklist_entries():
+    """API endpoint for closing checklist entries"""
+    # Unexpected errors are rolled back and logged by handle_unexpected_error
+    if request.method == 'GET':
+        unit_id = request.args.get('unit_id', type=int)
+        entry_date_str = request.args.get('entry_date')
         
-        data = request.get_json()
-        unit_id = data.get('unit_id')
-        month = data.get('month')  # Format: 'YYYY-MM'
-        year = data.get('year')
+        if not unit_id or not entry_date_str:
+            return jsonify({'success': False, 'error': 'Unit ID and entry date are required'}), 400
         
-        if not unit_id:
-            return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
-        if not month and not year:
-            return jsonify({'success': False, 'error': 'Month and year are required'}), 400
+        try:
+            entry_date = datetime.strptime(entry_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid entry date'}), 400
         
-        # Parse month/year
-        if month:
-            year, month_num = map(int, month.split('-'))
-        elif year:
-            # If only year provided, use current month
-            from datetime import date
-            month_num = date.today().month
-            year = int(year)
-        else:
-            return jsonify({'success': False, 'error': 'Month and year are required'}), 400
+        # Get or create entry
+        org_filter = get_organization_filter(BarShiftClosingChecklistEntry)
+        entry_query = BarShiftClosingChecklistEntry.query.filter(org_filter).filter_by(
+            unit_id=unit_id,
+            entry_date=entry_date
+        )
+        entry = entry_query.first()
         
-        # Verify unit exists and user has access
-        org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
-        unit = BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(id=unit_id, is_active=True).first()
-        if not unit:
-            return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
+        if not entry:
+            # Create new entry; ON CONFLICT DO NOTHING keeps concurrent first loads from colliding
+            insert_or_ignore(BarShiftClosingChecklistEntry, ['unit_id', 'entry_date'], {
+                'unit_id': unit_id,
+                'entry_date': entry_date,
+                'organisation': current_user.organisation_name,
+                'created_by': current_user.id
+            })
+            db.session.commit()
+            entry = entry_query.first()
+            if not entry:
+                return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
         
-        # Generate PDF
-        pdf_buffer = generate_bar_shift_closing_checklist_pdf(unit, year, month_num)
+        # Newest change to the entry, its items or the unit's points (inactive included, so
+        # removals count); answers 304 before the join when the client is up to date
+        org_filter_points = get_organization_filter(BarShiftClosingChecklistPoint)
+        items_modified = db.session.query(func.max(BarShiftClosingChecklistItem.updated_at)).filter(
+            BarShiftClosingChecklistItem.entry_id == entry.id
+        ).scalar_subquery()
+        points_modified = db.session.query(func.max(BarShiftClosingChecklistPoint.updated_at)).filter(
+            org_filter_points
+        ).filter(BarShiftClosingChecklistPoint.unit_id == unit_id).scalar_subquery()
+        timestamps = [entry.updated_at, *db.session.query(items_modified, points_modified).one()]
+        last_modified = max((ts for ts in timestamps if ts), default=None)
+        if _not_modified_since(last_modified):
+            return '', 304
         
-        # Generate filename
-        month_names = ['January', 'February', 'March', 'April', 'May', 'June',
-                      'July', 'August', 'September', 'October', 'November', 'December']
-        filename = f'BAR_Closing_Checklist_{month_names[month_num-1]}_{year}.pdf'
+        # Active checklist points for this unit with this entry's item (if any) in one query
+        rows = db.session.query(
+            BarShiftClosingChecklistPoint.id,
+            BarShiftClosingChecklistPoint.group_name,
+            BarShiftClosingChecklistPoint.point_text,
+            BarShiftClosingChecklistPoint.display_order,
+            BarShiftClosingChecklistItem.id,
+            BarShiftClosingChecklistItem.is_completed,
+            BarShiftClosingChecklistItem.staff_initials
+        ).outerjoin(
+            BarShiftClosingChecklistItem,
+            and_(
+                BarShiftClosingChecklistItem.checklist_point_id == BarShiftClosingChecklistPoint.id,
+                BarShiftClosingChecklistItem.entry_id == entry.id
+            )
+        ).filter(org_filter_points).filter(
+            BarShiftClosingChecklistPoint.unit_id == unit_id,
+            BarShiftClosingChecklistPoint.is_active == True
+        ).order_by(BarShiftClosingChecklistPoint.display_order).all()
         
-        return send_file(
-            pdf_buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        )
-    except Exception as e:
-        current_app.logger.error(f"Error generating PDF: {str(e)}", exc_info=True)
-        return jsonify({'success': False, 'error': str(e)}), 500
+        # Build response with points and their completion status
+        points_data = [{
+            'point_id': point_id,
+            'group_name': group_name,
+            'point_text': point_text,
+            'display_order': display_order,
+            'item_id': item_id,
+            'is_completed': bool(is_completed),
+            'staff_initials': staff_initials
+        } for point_id, group_name, point_text, display_order, item_id, is_completed, staff_initials in rows]
+        
+        return _last_modified_json({
+            'success': True,
+            'entry_id': entry.id,
+            'unit_id': entry.unit_id,
+            'entry_date': entry.entry_date.isoformat(),
+            'points': points_data
+        }, last_modified)
+    
+    return _dispatch_json_action(_SHIFT_CLOSING_ENTRY_ACTIONS)
+
+
+@checklist_bp.route('/bar/shift-closing/pdf', methods=['POST'])
+@login_required
+@role_required(['Manager', 'Bartender'])
+def generate_bar_shift_closing_checklist_pdf():
+    """Generate monthly PDF for Closing Checklist - Available to Manager and Bartender"""
+    data = request.get_json()
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    
+    unit_id = data.get('unit_id')
+    month = data.get('month')  # Format: 'YYYY-MM'
+    year = data.get('year')
+    
+    if not unit_id:
+        return jsonify({'success': False, 'error': 'Unit ID is required'}), 400
+    if not month and not year:
+        return jsonify({'success': False, 'error': 'Month and year are required'}), 400
+    
+    # Parse month/year (a bare year means the current month)
+    parsed = _parse_report_month(month, year)
+    if not parsed:
+        return jsonify({'success': False, 'error': 'Invalid month format'}), 400
+    year, month_num = parsed
+    
+    # Verify unit exists and user has access
+    org_filter = get_organization_filter(BarShiftClosingChecklistUnit)
+    unit = BarShiftClosingChecklistUnit.query.filter(org_filter).filter_by(id=unit_id, is_active=True).first()
+    if not unit:
+        return jsonify({'success': False, 'error': 'Unit not found or unauthorized'}), 404
+    
+    # Generate filename
+    filename = f'BAR_Closing_Checklist_{month_name[month_num]}_{year}.pdf'
+    
+    # Build the PDF in the background; the client polls the status URL for the file
+    job_id = submit_pdf_job(_build_bar_shift_closing_checklist_pdf, unit.id, year, month_num,
+                            filename=filename, owner_id=current_user.id)
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': url_for('checklist.bar_shift_closing_checklist_pdf_status', job_id=job_id)
+    }), 202
+
+
+def _build_bar_shift_closing_checklist_pdf(unit_id, year, month_num):
+    """Background task: reload the unit in the worker's app context and build the PDF"""
+    unit = BarShiftClosingChecklistUnit.query.get(unit_id)
+    # Keep small PDFs in memory while building, spill larger ones to disk
+    out = SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+    return pdf_generator.generate_bar_shift_closing_checklist_pdf(unit, year, month_num, out=out)
+
+
+@checklist_bp.route('/bar/shift-closing/pdf/<job_id>', methods=['GET'])
+@login_required
+@role_required(['Manager', 'Bartender'])
+def bar_shift_closing_checklist_pdf_status(job_id):
+    """Poll a background Closing Checklist PDF job; returns the file once it is ready"""
+    return _pdf_job_response(job_id)
 
 
 
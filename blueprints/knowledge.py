@@ -2,23 +2,126 @@
 Knowledge Hub Blueprint
 Handles Bartender Library and Chef Library pages
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, send_from_directory, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, send_from_directory, current_app, abort
 from flask_login import login_required, current_user
 from functools import wraps
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor
 from models import Book, db
-from utils.helpers import get_organization_filter
-from utils.file_upload import save_uploaded_file, allowed_file
+from utils.helpers import get_organization_filter, get_organization_cache_key
+from utils.cache import get_cached, set_cached, invalidate_cached
+from utils.file_upload import save_uploaded_file, delete_uploaded_file, new_upload_paths, upload_relative_path
+from utils.pdf_covers import render_pdf_cover_in_pool, render_pdf_covers_in_pool
 import os
-from werkzeug.utils import secure_filename
-from urllib.parse import urlparse, urljoin
+from werkzeug.security import safe_join
+from werkzeug.exceptions import HTTPException, NotFound
+from urllib.parse import urlparse, urljoin, quote
 import requests
 from bs4 import BeautifulSoup
 from PIL import Image
-import uuid
 from io import BytesIO
 
 knowledge_bp = Blueprint('knowledge', __name__, url_prefix='/knowledge')
 
+# Library page endpoint per library type
+LIBRARY_ENDPOINTS = {'bartender': 'knowledge.bartender_library', 'chef': 'knowledge.chef_library'}
+
+# Cache namespace for library listings; invalidated after every book write below
+LIBRARY_BOOKS_CACHE = 'library_books'
+
+# Folder under UPLOAD_FOLDER for book cover images
+BOOK_COVERS_FOLDER = 'books/covers'
+
+# Columns the library templates render for each book card
+LIBRARY_BOOK_COLUMNS = (Book.id, Book.title, Book.article_url, Book.pdf_path, Book.cover_image_path)
+
+
+# Roles that may open books in each library
+LIBRARY_ROLES = {'bartender': ('Bartender', 'Manager'), 'chef': ('Chef', 'Manager')}
+
+# Book PDFs are access-controlled per user, so browsers may cache them privately only
+BOOK_PDF_CACHE_MAX_AGE = 60 * 60
+
+# Covers rendered on demand; once rendered the library links the stored (immutable) cover file instead
+BOOK_COVER_CACHE_MAX_AGE = 24 * 60 * 60
+
+# Per-book cover render state ('pending' while queued, 'failed' once the PDF could not be rendered),
+# so library page views neither queue a render twice nor retry a broken PDF on every hit
+COVER_JOBS_CACHE = 'book_cover_jobs'
+COVER_PENDING_TTL = 10 * 60
+COVER_FAILED_TTL = 24 * 60 * 60
+
+
+def book_pdf_locations(stored_path):
+    """
+    Paths relative to UPLOAD_FOLDER where a stored book PDF may be, most likely first.
+    pdf_path is stored as 'uploads/books/pdfs/<file>' (from save_uploaded_file); older uploads
+    may sit under UPLOAD_FOLDER with the 'uploads/' prefix kept.
+    """
+    relative_path = upload_relative_path(stored_path)
+    if relative_path != stored_path:
+        return (relative_path, stored_path)
+    return (stored_path,)
+
+
+def find_book_pdf(stored_path):
+    """Absolute path of a stored book PDF, or None if it is in none of its locations"""
+    for file_path in book_pdf_locations(stored_path):
+        candidate = os.path.join(current_app.config['UPLOAD_FOLDER'], file_path)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def check_library_access(library_type):
+    """Abort with 403 unless the current user may open books in library_type"""
+    allowed_roles = LIBRARY_ROLES.get(library_type)
+    if allowed_roles and current_user.user_role not in allowed_roles:
+        abort(403)
+
+
+def send_book_pdf(file_path):
+    """Send a book PDF (file_path relative to UPLOAD_FOLDER) with private caching headers"""
+    accel_prefix = current_app.config.get('BOOK_PDF_X_ACCEL_PREFIX')
+    if accel_prefix:
+        # Access is already checked; hand the transfer to nginx's internal location
+        full_path = safe_join(current_app.config['UPLOAD_FOLDER'], file_path)
+        if full_path is None or not os.path.isfile(full_path):
+            raise NotFound()
+        response = current_app.response_class(mimetype='application/pdf')
+        response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{quote(file_path)}"
+        response.cache_control.max_age = BOOK_PDF_CACHE_MAX_AGE
+    else:
+        response = send_from_directory(
+            current_app.config['UPLOAD_FOLDER'],
+            file_path,
+            as_attachment=False,
+            mimetype='application/pdf',
+            max_age=BOOK_PDF_CACHE_MAX_AGE
+        )
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+
+def library_redirect(library_type):
+    """Redirect to the library page for library_type (the Bartender Library for unknown types)"""
+    return redirect(url_for(LIBRARY_ENDPOINTS.get(library_type, 'knowledge.bartender_library')))
+
+
+def get_library_books(library_type):
+    """Books in a library for the current organisation, newest first, as lightweight rows (cached briefly)"""
+    cache_key = (get_organization_cache_key(), library_type)
+    books = get_cached(LIBRARY_BOOKS_CACHE, cache_key)
+    if books is None:
+        org_filter = get_organization_filter(Book)
+        # Rows are plain tuples, not session-bound instances, so they can be shared between requests
+        books = db.session.query(*LIBRARY_BOOK_COLUMNS).filter(org_filter).filter(
+            Book.library_type == library_type
+        ).order_by(Book.created_at.desc()).all()
+        set_cached(LIBRARY_BOOKS_CACHE, cache_key, books)
+    return books
+
 
 def fetch_cover_image_from_url(article_url):
     """
@@ -92,98 +195,182 @@ def fetch_cover_image_from_url(article_url):
         # Open image with PIL
         img = Image.open(BytesIO(img_response.content))
         
-        # Convert to RGB if necessary (handles RGBA, P, etc.)
-        if img.mode != 'RGB':
+        # Palette, bilevel and gray+alpha images would be resized with nearest-neighbour (or lose their
+        # palette); convert them first so LANCZOS applies
+        if img.mode in ('P', '1', 'LA'):
             img = img.convert('RGB')
         
-        # Resize to reasonable cover size (maintain aspect ratio)
+        # Resize to reasonable cover size (maintain aspect ratio) before anything loads the pixels:
+        # thumbnail() lets the JPEG decoder scale down while decoding instead of decoding full size
         max_width = 600
         max_height = 800
         
         if img.width > max_width or img.height > max_height:
             img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
         
-        # Generate unique filename
-        filename = f"{uuid.uuid4().hex}.jpg"
+        # Convert the remaining modes (CMYK, RGBA, ...) after resizing, on the smaller image
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
         
-        # Ensure output directory exists
-        upload_folder = current_app.config['UPLOAD_FOLDER']
-        output_dir = os.path.join(upload_folder, 'books', 'covers')
-        os.makedirs(output_dir, exist_ok=True)
+        # Generate unique filename and ensure output directory exists
+        output_path, cover_image_path = new_upload_paths(BOOK_COVERS_FOLDER, 'jpg')
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
         # Save the image
-        output_path = os.path.join(output_dir, filename)
         img.save(output_path, 'JPEG', quality=85)
         
         # Return the relative path with 'uploads/' prefix
-        return os.path.join('uploads', 'books', 'covers', filename).replace('\\', '/')
+        return cover_image_path
         
     except Exception as e:
         current_app.logger.error(f'Error fetching cover image from URL {article_url}: {str(e)}', exc_info=True)
         return None
 
 
-def extract_pdf_first_page_as_image(pdf_path, output_folder='books/covers'):
+# Cover fetches download the article page and image; keep them off the request thread.
+# The queue lives in this worker only (the app runs one gunicorn worker, see Procfile/Dockerfile): tasks lost
+# to a restart or --max-requests recycle are not replayed, but book_cover queues a render again for any
+# book still without a cover once its in-process 'pending' mark is gone
+_cover_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='book-cover')
+
+
+def _fetch_cover_for_book(app, book_id, article_url):
+    """Background task: fetch the article's cover image and attach it to the book"""
+    with app.app_context():
+        cover_image_path = fetch_cover_image_from_url(article_url)
+        if not cover_image_path:
+            return
+        try:
+            book = db.session.get(Book, book_id)
+            # Skip if the book was deleted, its URL changed again, or a cover was uploaded meanwhile
+            if book and book.article_url == article_url and not book.cover_image_path:
+                book.cover_image_path = cover_image_path
+                db.session.commit()
+                invalidate_cached(LIBRARY_BOOKS_CACHE)
+                return
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f'Error saving fetched cover for book {book_id}: {str(e)}', exc_info=True)
+        # The fetched image is not used; remove it
+        with suppress(OSError):
+            delete_uploaded_file(cover_image_path)
+
+
+def queue_cover_fetch(book_id, article_url):
+    """Fetch the cover for book_id in the background; the library shows a placeholder until then"""
+    app = current_app._get_current_object()
+    _cover_executor.submit(_fetch_cover_for_book, app, book_id, article_url)
+
+
+def _regenerate_cover_for_book(app, book_id, pdf_full_path):
+    """Background task: render the book's PDF cover and swap it in for the old cover"""
+    with app.app_context():
+        cover_image_path = extract_pdf_first_page_as_image(pdf_full_path)
+        if not cover_image_path:
+            set_cached(COVER_JOBS_CACHE, book_id, 'failed', ttl=COVER_FAILED_TTL)
+            return
+        try:
+            book = db.session.get(Book, book_id)
+            if book:
+                old_cover_path = book.cover_image_path
+                book.cover_image_path = cover_image_path
+                db.session.commit()
+                invalidate_cached(LIBRARY_BOOKS_CACHE)
+                # Delete the old cover only once the new one is saved
+                if old_cover_path:
+                    try:
+                        delete_uploaded_file(old_cover_path)
+                    except Exception as e:
+                        app.logger.warning(f'Could not delete old cover: {str(e)}')
+                return
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f'Error saving regenerated cover for book {book_id}: {str(e)}', exc_info=True)
+        # The book is gone or could not be updated; remove the unused image
+        with suppress(OSError):
+            delete_uploaded_file(cover_image_path)
+
+
+def queue_cover_regeneration(book_id, pdf_full_path):
+    """Render the cover for book_id from its PDF in the background; the current cover stays until then"""
+    app = current_app._get_current_object()
+    set_cached(COVER_JOBS_CACHE, book_id, 'pending', ttl=COVER_PENDING_TTL)
+    _cover_executor.submit(_regenerate_cover_for_book, app, book_id, pdf_full_path)
+
+
+def regenerate_covers(book_ids):
+    """
+    Re-render the covers of the given PDF books from their first page, one cover pool task per book.
+    Not organisation-scoped (for CLI use inside an app context); returns the number of covers replaced.
+    """
+    jobs = []
+    targets = []
+    for book in Book.query.filter(Book.id.in_(book_ids), Book.pdf_path.isnot(None)):
+        pdf_full_path = find_book_pdf(book.pdf_path)
+        if not pdf_full_path:
+            current_app.logger.warning(f'PDF file not found for book {book.id}, keeping its cover')
+            continue
+        output_path, cover_image_path = new_upload_paths(BOOK_COVERS_FOLDER, 'jpg')
+        jobs.append((pdf_full_path, output_path))
+        targets.append((book, cover_image_path))
+    if not jobs:
+        return 0
+    
+    old_cover_paths = []
+    for (book, cover_image_path), rendered in zip(targets, render_pdf_covers_in_pool(jobs)):
+        if rendered:
+            old_cover_paths.append(book.cover_image_path)
+            book.cover_image_path = cover_image_path
+    db.session.commit()
+    invalidate_cached(LIBRARY_BOOKS_CACHE)
+    
+    # Delete the replaced covers only once the books refer to the new ones
+    for old_cover_path in filter(None, old_cover_paths):
+        try:
+            delete_uploaded_file(old_cover_path)
+        except Exception as e:
+            current_app.logger.warning(f'Could not delete old cover: {str(e)}')
+    return len(old_cover_paths)
+
+
+def _remove_uploaded_files(app, stored_paths):
+    """Background task: delete upload files that no committed row refers to any more"""
+    with app.app_context():
+        for stored_path in stored_paths:
+            try:
+                delete_uploaded_file(stored_path)
+            except Exception as e:
+                app.logger.warning(f'Could not delete file {stored_path}: {str(e)}')
+
+
+def queue_file_removal(*stored_paths):
+    """Delete stored upload paths in the background (call after the commit that drops them)"""
+    stored_paths = [path for path in stored_paths if path]
+    if stored_paths:
+        app = current_app._get_current_object()
+        _cover_executor.submit(_remove_uploaded_files, app, stored_paths)
+
+
+def extract_pdf_first_page_as_image(pdf_path, output_folder=BOOK_COVERS_FOLDER):
     """
     Extract the first page of a PDF and save it as an image.
     Returns the path to the saved image, or None if extraction fails.
     """
     try:
-        try:
-            import fitz  # type: ignore # PyMuPDF
-        except ImportError:
-            # PyMuPDF not installed - return None (PDF thumbnails won't work)
-            current_app.logger.warning("PyMuPDF not available - PDF thumbnail generation disabled")
-            return None
-        from PIL import Image
-        import uuid
-        
-        # Open the PDF
-        pdf_document = fitz.open(pdf_path)
-        
-        if len(pdf_document) == 0:
-            pdf_document.close()
-            return None
-        
-        # Get the first page
-        first_page = pdf_document[0]
-        
-        # Render page to an image (pixmap)
-        # Use a reasonable resolution (2x for better quality)
-        zoom = 2.0
-        mat = fitz.Matrix(zoom, zoom)
-        pix = first_page.get_pixmap(matrix=mat)
-        
-        # Convert to PIL Image
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        
-        # Resize to a reasonable cover size (e.g., 400x600 for portrait, 600x400 for landscape)
-        # Maintain aspect ratio
-        max_width = 600
-        max_height = 800
-        
-        if img.width > max_width or img.height > max_height:
-            img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
-        
         # Generate a unique filename
-        filename = f"{uuid.uuid4().hex}.jpg"
-        
-        # Ensure output directory exists
-        upload_folder = current_app.config['UPLOAD_FOLDER']
-        output_dir = os.path.join(upload_folder, output_folder)
-        os.makedirs(output_dir, exist_ok=True)
+        output_path, cover_image_path = new_upload_paths(output_folder, 'jpg')
         
-        # Save the image
-        output_path = os.path.join(output_dir, filename)
-        img.save(output_path, 'JPEG', quality=85)
-        
-        # Clean up
-        pix = None
-        pdf_document.close()
+        # Render in the cover process pool so the GIL-bound render does not stall request threads
+        if not render_pdf_cover_in_pool(pdf_path, output_path):
+            return None
         
         # Return the relative path with 'uploads/' prefix (as stored in database, matching save_uploaded_file format)
-        return os.path.join('uploads', output_folder, filename).replace('\\', '/')
+        return cover_image_path
         
+    except ImportError:
+        # PyMuPDF not installed - return None (PDF thumbnails won't work)
+        current_app.logger.warning("PyMuPDF not available - PDF thumbnail generation disabled")
+        return None
     except Exception as e:
         current_app.logger.error(f'Error extracting PDF first page: {str(e)}', exc_info=True)
         return None
@@ -191,14 +378,13 @@ def extract_pdf_first_page_as_image(pdf_path, output_folder='books/covers'):
 
 def role_required(*roles):
     """Decorator to require specific roles"""
+    allowed_roles = frozenset(roles)
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             if not current_user.is_authenticated:
-                from flask import redirect, url_for
                 return redirect(url_for('auth.login'))
-            if current_user.user_role not in roles:
-                from flask import abort
+            if current_user.user_role not in allowed_roles:
                 abort(403)
             return f(*args, **kwargs)
         return decorated_function
@@ -210,11 +396,8 @@ def role_required(*roles):
 @role_required('Bartender', 'Manager')
 def bartender_library():
     """Display Bartender Library page - Only visible to Manager and Bartender"""
-    from utils.db_helpers import ensure_schema_updates
-    ensure_schema_updates()
     
-    org_filter = get_organization_filter(Book)
-    books = Book.query.filter(org_filter).filter_by(library_type='bartender').order_by(Book.created_at.desc()).all()
+    books = get_library_books('bartender')
     return render_template('knowledge/bartender_library.html', books=books)
 
 
@@ -223,11 +406,8 @@ def bartender_library():
 @role_required('Chef', 'Manager')
 def chef_library():
     """Display Chef Library page - Only visible to Manager and Chef"""
-    from utils.db_helpers import ensure_schema_updates
-    ensure_schema_updates()
     
-    org_filter = get_organization_filter(Book)
-    books = Book.query.filter(org_filter).filter_by(library_type='chef').order_by(Book.created_at.desc()).all()
+    books = get_library_books('chef')
     return render_template('knowledge/chef_library.html', books=books)
 
 
@@ -236,9 +416,6 @@ def chef_library():
 @role_required('Manager')
 def add_book():
     """Add a new article link to the library"""
-    from utils.db_helpers import ensure_schema_updates
-    from urllib.parse import urlparse
-    ensure_schema_updates()
     
     try:
         title = request.form.get('title', '').strip()
@@ -256,17 +433,17 @@ def add_book():
         # Validate URL
         if not article_url:
             flash('Article URL is required.', 'error')
-            return redirect(url_for(f'knowledge.{library_type}_library'))
+            return library_redirect(library_type)
         
         # Validate URL format
         try:
             parsed = urlparse(article_url)
             if not parsed.scheme or not parsed.netloc:
                 flash('Please enter a valid URL (e.g., https://example.com/article).', 'error')
-                return redirect(url_for(f'knowledge.{library_type}_library'))
+                return library_redirect(library_type)
         except Exception:
             flash('Please enter a valid URL.', 'error')
-            return redirect(url_for(f'knowledge.{library_type}_library'))
+            return library_redirect(library_type)
         
         # If no title provided, use a default
         if not title:
@@ -276,11 +453,8 @@ def add_book():
         cover_image_path = None
         cover_file = request.files.get('cover_image')
         if cover_file and cover_file.filename != '':
-            if allowed_file(cover_file.filename):
-                cover_image_path = save_uploaded_file(cover_file, 'books/covers')
-        else:
-            # If no manual upload, try to fetch cover image from article URL
-            cover_image_path = fetch_cover_image_from_url(article_url)
+            # save_uploaded_file checks the extension and returns None for disallowed files
+            cover_image_path = save_uploaded_file(cover_file, BOOK_COVERS_FOLDER)
         
         # Ensure organization is set (required for persistence and filtering)
         organisation = current_user.organisation.strip() if current_user.organisation and current_user.organisation.strip() else None
@@ -294,7 +468,7 @@ def add_book():
             library_type=library_type,
             article_url=article_url,
             pdf_path=None,  # No PDF for article links
-            cover_image_path=cover_image_path,  # Optional cover image (from upload or auto-fetch)
+            cover_image_path=cover_image_path,  # Optional uploaded cover image (auto-fetched after commit otherwise)
             created_by=current_user.id,
             organisation=organisation
         )
@@ -304,9 +478,13 @@ def add_book():
         # Commit to database
         try:
             db.session.commit()
+            invalidate_cached(LIBRARY_BOOKS_CACHE)
             db.session.refresh(book)
             if book.is_persisted():
                 current_app.logger.info(f'Article "{title}" (ID: {book.id}) successfully saved to database for organization: {organisation}')
+                if not cover_image_path:
+                    # If no manual upload, fetch the cover image from the article URL
+                    queue_cover_fetch(book.id, article_url)
                 flash('Article link added successfully!', 'success')
             else:
                 current_app.logger.error(f'Article "{title}" was not properly persisted after commit')
@@ -315,9 +493,9 @@ def add_book():
             db.session.rollback()
             current_app.logger.error(f'Database commit failed for article "{title}": {str(commit_error)}', exc_info=True)
             flash('Error: Article could not be saved to database. Please try again.', 'error')
-            return redirect(url_for(f'knowledge.{library_type}_library'))
+            return library_redirect(library_type)
         
-        return redirect(url_for(f'knowledge.{library_type}_library'))
+        return library_redirect(library_type)
         
     except Exception as e:
         db.session.rollback()
@@ -330,11 +508,8 @@ def add_book():
 @login_required
 def view_book_pdf(book_id):
     """Serve PDF file for a book - Access restricted by library type and user role"""
-    from utils.db_helpers import ensure_schema_updates
-    from werkzeug.exceptions import NotFound
-    from flask import abort
-    ensure_schema_updates()
     
+    library_type = None
     try:
         org_filter = get_organization_filter(Book)
         book = Book.query.filter(org_filter).filter_by(id=book_id).first()
@@ -342,107 +517,73 @@ def view_book_pdf(book_id):
         if not book:
             current_app.logger.error(f'Book with id {book_id} not found for user {current_user.id}')
             raise NotFound(description=f'Book with id {book_id} not found')
+        library_type = book.library_type
         
         # Check if user has access to this library type
-        if book.library_type == 'bartender' and current_user.user_role not in ['Bartender', 'Manager']:
-            abort(403)
-        elif book.library_type == 'chef' and current_user.user_role not in ['Chef', 'Manager']:
-            abort(403)
+        check_library_access(library_type)
         
         if not book.pdf_path:
             current_app.logger.error(f'Book {book_id} has no pdf_path')
             flash('PDF file not found.', 'error')
             # Redirect to the correct library based on book type
-            library_route = f'{book.library_type}_library' if book.library_type in ['bartender', 'chef'] else 'bartender_library'
-            return redirect(url_for(f'knowledge.{library_route}'))
-        
-        # book.pdf_path is stored as 'uploads/books/pdfs/filename.pdf' (from save_uploaded_file)
-        # We need to remove 'uploads/' prefix to get the relative path for send_from_directory
-        stored_path = book.pdf_path
+            return library_redirect(library_type)
         
-        # Normalize the path - remove 'uploads/' prefix if present
-        if stored_path.startswith('uploads/'):
-            file_path = stored_path.replace('uploads/', '', 1)
-        else:
-            file_path = stored_path
-        
-        # Construct full path to verify file exists
-        full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], file_path)
-        
-        # Check if file exists at the expected location
-        if not os.path.exists(full_path):
-            # Try alternative path formats
-            alt_paths = [
-                # Try with uploads/ prefix as absolute path
-                os.path.join(current_app.config['UPLOAD_FOLDER'], stored_path),
-                # Try the stored path as-is (if it's already absolute)
-                stored_path,
-                # Try without uploads/ prefix
-                os.path.join(current_app.config['UPLOAD_FOLDER'], file_path),
-            ]
-            
-            found = False
-            for alt_path in alt_paths:
-                if os.path.exists(alt_path):
-                    # Determine the correct file_path for send_from_directory
-                    if alt_path.startswith(current_app.config['UPLOAD_FOLDER']):
-                        # Extract relative path from UPLOAD_FOLDER
-                        file_path = os.path.relpath(alt_path, current_app.config['UPLOAD_FOLDER'])
-                    elif alt_path.startswith('uploads/'):
-                        # Remove uploads/ prefix
-                        file_path = alt_path.replace('uploads/', '', 1)
-                    else:
-                        # Use as-is
-                        file_path = alt_path
-                    found = True
-                    current_app.logger.info(f'Found PDF at alternative path: {alt_path}, using file_path: {file_path}')
-                    break
-            
-            if not found:
-                # Log detailed error information
-                current_app.logger.error(
-                    f'PDF file not found for book {book_id}. '
-                    f'Stored path: {stored_path}, '
-                    f'Expected full path: {full_path}, '
-                    f'UPLOAD_FOLDER: {current_app.config["UPLOAD_FOLDER"]}, '
-                    f'File exists check: {os.path.exists(full_path)}'
-                )
-                flash('PDF file not found on server.', 'error')
-                # Redirect to the correct library based on book type
-                library_route = f'{book.library_type}_library' if book.library_type in ['bartender', 'chef'] else 'bartender_library'
-                return redirect(url_for(f'knowledge.{library_route}'))
-        
-        # Use send_from_directory to serve the file directly
-        # file_path should be relative to UPLOAD_FOLDER (e.g., 'books/pdfs/filename.pdf')
-        try:
-            current_app.logger.info(f'Serving PDF for book {book_id}: {file_path} from {current_app.config["UPLOAD_FOLDER"]}')
-            return send_from_directory(
-                current_app.config['UPLOAD_FOLDER'],
-                file_path,
-                as_attachment=False,
-                mimetype='application/pdf'
-            )
-        except Exception as e:
-            current_app.logger.error(f'Error serving PDF file: {str(e)}, file_path: {file_path}, UPLOAD_FOLDER: {current_app.config["UPLOAD_FOLDER"]}')
-            flash('Error loading PDF file.', 'error')
-            library_route = f'{book.library_type}_library' if book.library_type in ['bartender', 'chef'] else 'bartender_library'
-            return redirect(url_for(f'knowledge.{library_route}'))
-    except NotFound:
+        # Serve from the first location that has the file; send_from_directory raises NotFound if it is missing
+        for file_path in book_pdf_locations(book.pdf_path):
+            try:
+                current_app.logger.info(f'Serving PDF for book {book_id}: {file_path} from {current_app.config["UPLOAD_FOLDER"]}')
+                return send_book_pdf(file_path)
+            except NotFound:
+                continue
+        
+        current_app.logger.error(
+            f'PDF file not found for book {book_id}. '
+            f'Stored path: {book.pdf_path}, '
+            f'UPLOAD_FOLDER: {current_app.config["UPLOAD_FOLDER"]}'
+        )
+        flash('PDF file not found on server.', 'error')
+        # Redirect to the correct library based on book type
+        return library_redirect(library_type)
+    except HTTPException:
+        # 403/404 from the checks above are responses, not serving errors
         raise
     except Exception as e:
         current_app.logger.error(f'Error serving PDF for book {book_id}: {str(e)}', exc_info=True)
         flash('Error loading PDF file.', 'error')
-        # Try to get the book to determine which library to redirect to
-        try:
-            org_filter = get_organization_filter(Book)
-            book = Book.query.filter(org_filter).filter_by(id=book_id).first()
-            if book and book.library_type in ['bartender', 'chef']:
-                library_route = f'{book.library_type}_library'
+        # Redirect to the book's library if it was loaded before the error
+        return library_redirect(library_type)
+
+
+@knowledge_bp.route('/book/<int:book_id>/cover')
+@login_required
+def book_cover(book_id):
+    """Serve a PDF book's cover; the first request queues rendering it from the first page"""
+    
+    org_filter = get_organization_filter(Book)
+    book = Book.query.filter(org_filter).filter_by(id=book_id).first_or_404()
+    check_library_access(book.library_type)
+    
+    if not book.cover_image_path:
+        # Render in the background (never on the request thread); failed renders are not retried until they expire
+        if get_cached(COVER_JOBS_CACHE, book_id) is None:
+            pdf_full_path = find_book_pdf(book.pdf_path) if book.pdf_path else None
+            if pdf_full_path:
+                queue_cover_regeneration(book_id, pdf_full_path)
             else:
-                library_route = 'bartender_library'
-        except:
-            library_route = 'bartender_library'
-        return redirect(url_for(f'knowledge.{library_route}'))
+                set_cached(COVER_JOBS_CACHE, book_id, 'failed', ttl=COVER_FAILED_TTL)
+        # No cover yet: the card's image error handler shows the placeholder
+        response = current_app.response_class(status=404)
+        response.cache_control.no_store = True
+        return response
+    
+    response = send_from_directory(
+        current_app.config['UPLOAD_FOLDER'],
+        upload_relative_path(book.cover_image_path),
+        max_age=BOOK_COVER_CACHE_MAX_AGE
+    )
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
 
 
 @knowledge_bp.route('/book/<int:book_id>/edit', methods=['POST'])
@@ -450,34 +591,32 @@ def view_book_pdf(book_id):
 @role_required('Manager')
 def edit_book(book_id):
     """Edit an article link"""
-    from utils.db_helpers import ensure_schema_updates
-    from urllib.parse import urlparse
-    ensure_schema_updates()
     
     try:
         org_filter = get_organization_filter(Book)
         book = Book.query.filter(org_filter).filter_by(id=book_id).first_or_404()
+        library_type = book.library_type
         
         title = request.form.get('title', '').strip()
         article_url = request.form.get('article_url', '').strip()
         
         if not title:
             flash('Title is required.', 'error')
-            return redirect(url_for(f'knowledge.{book.library_type}_library'))
+            return library_redirect(library_type)
         
         if not article_url:
             flash('Article URL is required.', 'error')
-            return redirect(url_for(f'knowledge.{book.library_type}_library'))
+            return library_redirect(library_type)
         
         # Validate URL format
         try:
             parsed = urlparse(article_url)
             if not parsed.scheme or not parsed.netloc:
                 flash('Please enter a valid URL (e.g., https://example.com/article).', 'error')
-                return redirect(url_for(f'knowledge.{book.library_type}_library'))
+                return library_redirect(library_type)
         except Exception:
             flash('Please enter a valid URL.', 'error')
-            return redirect(url_for(f'knowledge.{book.library_type}_library'))
+            return library_redirect(library_type)
         
         # Update book details
         book.title = title
@@ -485,42 +624,33 @@ def edit_book(book_id):
         book.article_url = article_url
         
         # Handle cover image upload (optional)
+        fetch_cover = False
+        old_cover_path = None
         cover_file = request.files.get('cover_image')
         if cover_file and cover_file.filename != '':
-            if allowed_file(cover_file.filename):
-                # Delete old cover image if exists
-                if book.cover_image_path:
-                    old_cover_path = os.path.join(current_app.config['UPLOAD_FOLDER'], book.cover_image_path.replace('uploads/', '', 1))
-                    try:
-                        if os.path.exists(old_cover_path):
-                            os.remove(old_cover_path)
-                    except Exception as e:
-                        current_app.logger.warning(f'Could not delete old cover: {str(e)}')
-                
-                # Save new cover image
-                cover_image_path = save_uploaded_file(cover_file, 'books/covers')
-                if cover_image_path:
-                    book.cover_image_path = cover_image_path
-        elif article_url != old_article_url:
-            # If article URL changed and no new cover uploaded, try to fetch new cover
-            # Delete old cover image if exists
-            if book.cover_image_path:
-                old_cover_path = os.path.join(current_app.config['UPLOAD_FOLDER'], book.cover_image_path.replace('uploads/', '', 1))
-                try:
-                    if os.path.exists(old_cover_path):
-                        os.remove(old_cover_path)
-                except Exception as e:
-                    current_app.logger.warning(f'Could not delete old cover: {str(e)}')
-            
-            # Fetch new cover image from updated URL
-            cover_image_path = fetch_cover_image_from_url(article_url)
+            # Save new cover image (None for disallowed file types)
+            cover_image_path = save_uploaded_file(cover_file, BOOK_COVERS_FOLDER)
             if cover_image_path:
+                old_cover_path = book.cover_image_path
                 book.cover_image_path = cover_image_path
+        elif article_url != old_article_url:
+            # If article URL changed and no new cover uploaded, try to fetch new cover
+            old_cover_path = book.cover_image_path
+            book.cover_image_path = None
+            fetch_cover = True
         
         db.session.commit()
+        invalidate_cached(LIBRARY_BOOKS_CACHE)
+        
+        # Delete the replaced cover only once the book no longer refers to it
+        queue_file_removal(old_cover_path)
+        
+        if fetch_cover:
+            # Fetch new cover image from updated URL
+            queue_cover_fetch(book_id, article_url)
         
         flash('Article link updated successfully!', 'success')
-        return redirect(url_for(f'knowledge.{book.library_type}_library'))
+        return library_redirect(library_type)
         
     except Exception as e:
         db.session.rollback()
@@ -534,8 +664,6 @@ def edit_book(book_id):
 @role_required('Manager')
 def delete_book(book_id):
     """Delete a book"""
-    from utils.db_helpers import ensure_schema_updates
-    ensure_schema_updates()
     
     try:
         org_filter = get_organization_filter(Book)
@@ -543,32 +671,18 @@ def delete_book(book_id):
         
         library_type = book.library_type
         
-        # Delete PDF file
-        if book.pdf_path:
-            pdf_path = os.path.join(current_app.config['UPLOAD_FOLDER'], book.pdf_path.replace('uploads/', '', 1))
-            try:
-                if os.path.exists(pdf_path):
-                    os.remove(pdf_path)
-            except Exception as e:
-                current_app.logger.warning(f'Could not delete PDF file: {str(e)}')
-        
-        # Delete cover image
-        if book.cover_image_path:
-            cover_path = os.path.join(current_app.config['UPLOAD_FOLDER'], book.cover_image_path.replace('uploads/', '', 1))
-            try:
-                if os.path.exists(cover_path):
-                    os.remove(cover_path)
-            except Exception as e:
-                current_app.logger.warning(f'Could not delete cover image: {str(e)}')
-        
         # Delete book record - only Managers can delete books
         book_title = book.title  # Store for logging
         book_org = book.organisation  # Store for logging
+        book_files = (book.pdf_path, book.cover_image_path)
         
         db.session.delete(book)
         
         try:
             db.session.commit()
+            invalidate_cached(LIBRARY_BOOKS_CACHE)
+            # Remove the PDF and cover image once the row is gone (files kept if the commit fails)
+            queue_file_removal(*book_files)
             current_app.logger.info(f'Book "{book_title}" (ID: {book_id}) deleted by Manager {current_user.id} from organization: {book_org}')
             flash('Book deleted successfully!', 'success')
         except Exception as commit_error:
@@ -576,7 +690,7 @@ def delete_book(book_id):
             current_app.logger.error(f'Database commit failed when deleting book {book_id}: {str(commit_error)}', exc_info=True)
             flash('Error: Book could not be deleted from database. Please try again.', 'error')
         
-        return redirect(url_for(f'knowledge.{library_type}_library'))
+        return library_redirect(library_type)
         
     except Exception as e:
         db.session.rollback()
@@ -590,52 +704,27 @@ def delete_book(book_id):
 @role_required('Manager')
 def regenerate_cover(book_id):
     """Regenerate cover image from PDF for a book"""
-    from utils.db_helpers import ensure_schema_updates
-    ensure_schema_updates()
     
     try:
         org_filter = get_organization_filter(Book)
         book = Book.query.filter(org_filter).filter_by(id=book_id).first_or_404()
+        library_type = book.library_type
         
         if not book.pdf_path:
             flash('PDF file not found. Cannot regenerate cover.', 'error')
-            return redirect(url_for(f'knowledge.{book.library_type}_library'))
+            return library_redirect(library_type)
         
         # Get PDF full path
-        pdf_path_stored = book.pdf_path
-        if pdf_path_stored.startswith('uploads/'):
-            pdf_full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], pdf_path_stored.replace('uploads/', '', 1))
-        else:
-            pdf_full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], pdf_path_stored)
-        
-        # Try alternative paths if not found
-        if not os.path.exists(pdf_full_path):
-            alt_path = os.path.join(current_app.config['UPLOAD_FOLDER'], pdf_path_stored)
-            if os.path.exists(alt_path):
-                pdf_full_path = alt_path
-            else:
-                flash('PDF file not found. Cannot regenerate cover.', 'error')
-                return redirect(url_for(f'knowledge.{book.library_type}_library'))
-        
-        # Delete old cover if exists
-        if book.cover_image_path:
-            old_cover_path = os.path.join(current_app.config['UPLOAD_FOLDER'], book.cover_image_path.replace('uploads/', '', 1))
-            try:
-                if os.path.exists(old_cover_path):
-                    os.remove(old_cover_path)
-            except Exception as e:
-                current_app.logger.warning(f'Could not delete old cover: {str(e)}')
+        pdf_full_path = find_book_pdf(book.pdf_path)
+        if not pdf_full_path:
+            flash('PDF file not found. Cannot regenerate cover.', 'error')
+            return library_redirect(library_type)
         
-        # Extract new cover from PDF
-        cover_image_path = extract_pdf_first_page_as_image(pdf_full_path)
-        if cover_image_path:
-            book.cover_image_path = cover_image_path
-            db.session.commit()
-            flash('Cover image regenerated successfully!', 'success')
-        else:
-            flash('Failed to regenerate cover image from PDF.', 'error')
+        # Extract new cover from PDF in the background (replaces the old cover when done)
+        queue_cover_regeneration(book_id, pdf_full_path)
+        flash('Cover image is being regenerated and will appear shortly.', 'success')
         
-        return redirect(url_for(f'knowledge.{book.library_type}_library'))
+        return library_redirect(library_type)
         
     except Exception as e:
         db.session.rollback()
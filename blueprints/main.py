@@ -2,6 +2,7 @@
 Main blueprint - handles index, errors, and file uploads
 """
 # pyright: reportMissingImports=false
+import re
 from flask import Blueprint, render_template, send_from_directory, current_app, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from utils.permissions import role_required
@@ -167,6 +168,23 @@ def user_guide():
         return render_template('error.html', error='Unable to load user guide'), 500
 
 
+# Random (uuid) upload names from new_upload_paths are never reused, so public files with those names
+# may be cached for a year without revalidating. Only folders listed here qualify. Timestamped names
+# from save_uploaded_file are only unique to the second, so they get a short max-age and revalidate
+# by ETag afterwards.
+UPLOAD_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+UPLOAD_CACHE_MAX_AGE = 60 * 60
+UUID_UPLOAD_NAME = re.compile(r'^[0-9a-f]{32}\.[a-z0-9]+$')
+IMMUTABLE_UPLOAD_FOLDERS = ('books/covers/',)
+
+# Never served by this unauthenticated route:
+# - book PDFs are only sent by knowledge.view_book_pdf after its organisation and role checks
+#   (older uploads may sit under a kept 'uploads/' prefix)
+# - PDF job results belong to their owner only (they now live in the instance folder; older
+#   deployments may still have them under uploads)
+UNSERVED_UPLOAD_FOLDERS = ('books/pdfs/', 'uploads/books/pdfs/', 'pdf_jobs/')
+
+
 @main_bp.route('/uploads/<path:filename>')
 def uploaded_file(filename):
     """Serve uploaded files"""
@@ -200,7 +218,15 @@ def uploaded_file(filename):
     # Get the relative path for send_from_directory
     relative_path = os.path.relpath(file_path, upload_folder)
     
-    return send_from_directory(upload_folder, relative_path)
+    relative_path = relative_path.replace('\\', '/')
+    if relative_path.startswith(UNSERVED_UPLOAD_FOLDERS):
+        abort(404)
+    if relative_path.startswith(IMMUTABLE_UPLOAD_FOLDERS) and UUID_UPLOAD_NAME.match(os.path.basename(relative_path)):
+        response = send_from_directory(upload_folder, relative_path, max_age=UPLOAD_IMMUTABLE_MAX_AGE)
+        response.cache_control.immutable = True
+    else:
+        response = send_from_directory(upload_folder, relative_path, max_age=UPLOAD_CACHE_MAX_AGE)
+    return response
 
 
 @main_bp.errorhandler(404)
@@ -315,12 +341,13 @@ def edit_slide(slide_id):
                         old_path_uploads = os.path.join(current_app.config['UPLOAD_FOLDER'], slide.image_path.replace('uploads/', '', 1))
                         old_path = old_path_static if os.path.exists(old_path_static) else old_path_uploads
                     
-                    if os.path.exists(old_path):
-                        try:
-                            os.remove(old_path)
-                            current_app.logger.info(f'Deleted old slide image: {old_path}')
-                        except Exception as e:
-                            current_app.logger.warning(f'Could not delete old image: {str(e)}')
+                    try:
+                        os.remove(old_path)
+                        current_app.logger.info(f'Deleted old slide image: {old_path}')
+                    except FileNotFoundError:
+                        pass
+                    except Exception as e:
+                        current_app.logger.warning(f'Could not delete old image: {str(e)}')
                 
                 # Save new image to UPLOAD_FOLDER/slides/ for persistent storage
                 image_path = save_slide_image(file)
@@ -7,10 +7,9 @@ from flask_login import login_required, current_user
 from extensions import db
 from models import Product, HomemadeIngredient
 from utils.db_helpers import ensure_schema_updates
-from utils.file_upload import save_uploaded_file
+from utils.file_upload import save_uploaded_file, delete_uploaded_file
 from datetime import datetime
 import uuid
-import os
 
 products_bp = Blueprint('products', __name__)
 
@@ -277,9 +276,7 @@ def edit_ingredient(id):
             file = request.files['image']
             if file.filename:
                 if product.image_path:
-                    old_path = os.path.join(current_app.config['UPLOAD_FOLDER'], product.image_path)
-                    if os.path.exists(old_path):
-                        os.remove(old_path)
+                    delete_uploaded_file(product.image_path)
                 product.image_path = save_uploaded_file(file, 'products')
         
         db.session.commit()
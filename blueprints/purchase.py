@@ -58,81 +58,79 @@ def create_purchase_request():
     try:
         ensure_schema_updates()
         
-        # Generate unique order number
-        order_number = f"PO-{datetime.utcnow().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
-        
-        # Determine initial status based on user role
-        # Chef/Bartender orders need Manager approval first
-        # Manager orders go directly to Purchase Manager
-        if current_user.user_role in ['Chef', 'Bartender']:
-            initial_status = 'Pending Manager Approval'
-        else:
-            initial_status = 'Pending'
-        
-        # Create purchase request
-        purchase_request = PurchaseRequest(
-            order_number=order_number,
-            ordered_date=datetime.utcnow(),
-            status=initial_status,
-            organisation=(current_user.organisation.strip() if current_user.organisation and current_user.organisation.strip() else None),
-            created_by=current_user.id
-        )
-        db.session.add(purchase_request)
-        db.session.flush()  # Get the ID
-        
-        # Process items from form
-        item_count = 0
+        # Parse and validate items from the form before creating any ORM objects
+        # Item fields arrive as item_<field>_<index>; group them by index in one pass over the form
+        rows = {}
+        for key, value in request.form.items():
+            if key.startswith('item_'):
+                field, _, index = key[len('item_'):].rpartition('_')
+                if index.isdigit():
+                    rows.setdefault(int(index), {})[field] = value
+        
+        items = []
         item_index = 0
         
         while True:
-            # Check if we have more items
-            description_key = f'item_description_{item_index}'
-            if description_key not in request.form:
+            # Items are numbered contiguously; stop at the first index without a description field
+            row = rows.get(item_index)
+            if row is None or 'description' not in row:
                 break
+            item_index += 1
             
-            description = request.form.get(description_key, '').strip()
+            description = row['description'].strip()
             if not description:
-                item_index += 1
                 continue
             
             # Get product ID if available
-            product_id = request.form.get(f'item_product_id_{item_index}', '')
+            product_id = row.get('product_id', '')
             try:
                 product_id = int(product_id) if product_id else None
             except (ValueError, TypeError):
                 product_id = None
             
             # Get other fields
-            code = request.form.get(f'item_code_{item_index}', '').strip()
-            quantity = float(request.form.get(f'item_quantity_{item_index}', 0) or 0)
-            supplier = request.form.get(f'item_supplier_{item_index}', '').strip() or 'N/A'
-            sub_category = request.form.get(f'item_sub_category_{item_index}', '').strip() or 'Other'
-            cost_per_unit = float(request.form.get(f'item_cost_per_unit_{item_index}', 0) or 0)
-            order_quantity = float(request.form.get(f'item_order_quantity_{item_index}', 0) or 0)
+            order_quantity = float(row.get('order_quantity', 0) or 0)
             
             # Only add item if order_quantity > 0
             if order_quantity > 0:
-                purchase_item = PurchaseItem(
-                    purchase_request_id=purchase_request.id,
-                    product_id=product_id,
-                    code=code,
-                    description=description,
-                    quantity=quantity,
-                    supplier=supplier,
-                    sub_category=sub_category,
-                    cost_per_unit=cost_per_unit,
-                    order_quantity=order_quantity
-                )
-                db.session.add(purchase_item)
-                item_count += 1
-            
-            item_index += 1
-        
-        if item_count == 0:
-            db.session.rollback()
+                items.append({
+                    'product_id': product_id,
+                    'code': row.get('code', '').strip(),
+                    'description': description,
+                    'quantity': float(row.get('quantity', 0) or 0),
+                    'supplier': row.get('supplier', '').strip() or 'N/A',
+                    'sub_category': row.get('sub_category', '').strip() or 'Other',
+                    'cost_per_unit': float(row.get('cost_per_unit', 0) or 0),
+                    'order_quantity': order_quantity
+                })
+        
+        if not items:
             flash('Please add at least one item with order quantity greater than 0.', 'error')
             return redirect(url_for('purchase.purchase'))
         
+        # Generate unique order number
+        order_number = f"PO-{datetime.utcnow().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
+        
+        # Determine initial status based on user role
+        # Chef/Bartender orders need Manager approval first
+        # Manager orders go directly to Purchase Manager
+        if current_user.user_role in ['Chef', 'Bartender']:
+            initial_status = 'Pending Manager Approval'
+        else:
+            initial_status = 'Pending'
+        
+        # Create purchase request with its items
+        purchase_request = PurchaseRequest(
+            order_number=order_number,
+            ordered_date=datetime.utcnow(),
+            status=initial_status,
+            organisation=(current_user.organisation.strip() if current_user.organisation and current_user.organisation.strip() else None),
+            created_by=current_user.id
+        )
+        db.session.add(purchase_request)
+        db.session.flush()  # Get the ID
+        db.session.add_all([PurchaseItem(purchase_request_id=purchase_request.id, **item) for item in items])
+        
         db.session.commit()
         flash(f'Purchase request {order_number} created successfully!', 'success')
         
@@ -261,16 +259,17 @@ def approve_purchase_request(purchase_id):
             return redirect(url_for('purchase.to_order'))
         
         # Process item modifications
+        form = request.form.to_dict()
         # Get all items and check for updates
         items_to_delete = []
         for item in purchase_request.items:
             item_id = str(item.id)
             new_quantity_key = f'order_quantity_{item_id}'
             
-            if new_quantity_key in request.form:
+            if new_quantity_key in form:
                 # Update order quantity
                 try:
-                    new_quantity = float(request.form.get(new_quantity_key, 0) or 0)
+                    new_quantity = float(form.get(new_quantity_key, 0) or 0)
                     if new_quantity > 0:
                         item.order_quantity = new_quantity
                     else:
@@ -492,6 +491,8 @@ def update_quantities(purchase_id):
     """Update quantity received for purchase items"""
     try:
         ensure_schema_updates()
+        # Snapshot the form once; per-item and per-supplier loops below look keys up repeatedly
+        form = request.form.to_dict()
         org_filter = get_organization_filter(PurchaseRequest)
         
         # Purchase Manager can update any order, others can only update their own
@@ -501,7 +502,7 @@ def update_quantities(purchase_id):
             purchase_request = PurchaseRequest.query.filter(org_filter).filter_by(id=purchase_id, created_by=current_user.id).first_or_404()
         
         # Get supplier from form (if provided, for supplier-specific updates)
-        supplier = request.form.get('supplier', '').strip()
+        supplier = form.get('supplier', '').strip()
         
         # If supplier is specified, check that supplier's status
         if supplier:
@@ -524,9 +525,9 @@ def update_quantities(purchase_id):
         # Update quantities for each item
         for item in purchase_request.items:
             qty_key = f'quantity_received_{item.id}'
-            if qty_key in request.form:
+            if qty_key in form:
                 try:
-                    qty_received = float(request.form.get(qty_key, 0) or 0)
+                    qty_received = float(form.get(qty_key, 0) or 0)
                     item.quantity_received = qty_received if qty_received >= 0 else None
                 except (ValueError, TypeError):
                     item.quantity_received = None
@@ -541,11 +542,11 @@ def update_quantities(purchase_id):
             invoice_number = None
             invoice_value = None
             
-            if invoice_num_key in request.form:
-                invoice_number = request.form.get(invoice_num_key, '').strip() or None
-            if invoice_val_key in request.form:
+            if invoice_num_key in form:
+                invoice_number = form.get(invoice_num_key, '').strip() or None
+            if invoice_val_key in form:
                 try:
-                    invoice_val = request.form.get(invoice_val_key, '').strip()
+                    invoice_val = form.get(invoice_val_key, '').strip()
                     invoice_value = float(invoice_val) if invoice_val else None
                 except (ValueError, TypeError):
                     invoice_value = None
@@ -554,11 +555,11 @@ def update_quantities(purchase_id):
                 purchase_request.set_supplier_invoice(supplier, invoice_number, invoice_value)
         
         # Also handle legacy invoice fields (for backward compatibility)
-        if 'invoice_number' in request.form and not any(f'invoice_number_{s}' in request.form for s in suppliers):
-            purchase_request.invoice_number = request.form.get('invoice_number', '').strip() or None
-        if 'invoice_value' in request.form and not any(f'invoice_value_{s}' in request.form for s in suppliers):
+        if 'invoice_number' in form and not any(f'invoice_number_{s}' in form for s in suppliers):
+            purchase_request.invoice_number = form.get('invoice_number', '').strip() or None
+        if 'invoice_value' in form and not any(f'invoice_value_{s}' in form for s in suppliers):
             try:
-                invoice_val = request.form.get('invoice_value', '').strip()
+                invoice_val = form.get('invoice_value', '').strip()
                 purchase_request.invoice_value = float(invoice_val) if invoice_val else None
             except (ValueError, TypeError):
                 purchase_request.invoice_value = None
@@ -29,6 +29,20 @@ class Config:
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Connection pool for PostgreSQL: reuse connections across requests instead of reconnecting,
+    # test them before use (pre_ping) and recycle before managed-Postgres idle timeouts kick in.
+    # Each gunicorn worker holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections; keep
+    # workers * (pool_size + max_overflow) below the server's max_connections (see DEPLOYMENT.md).
+    # SQLite keeps SQLAlchemy's defaults.
+    if database_url.startswith('postgresql'):
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            'pool_pre_ping': True,
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        }
+    
     # Upload folder - use environment variable for production, or default to static/uploads
     # For Railway: Use persistent volume at /data/uploads (survives redeployments)
     # For local dev: Use static/uploads
@@ -43,5 +57,11 @@ class Config:
         upload_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'uploads')
     UPLOAD_FOLDER = upload_base
     MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50MB max file size (for PDFs)
+    # Behind nginx, set to an internal location that aliases UPLOAD_FOLDER (e.g. /_protected_uploads)
+    # so book PDFs are sent by nginx via X-Accel-Redirect instead of through the Python worker
+    BOOK_PDF_X_ACCEL_PREFIX = os.environ.get('BOOK_PDF_X_ACCEL_PREFIX')
+    # Behind Apache (mod_xsendfile) or lighttpd, let the server send files named by an X-Sendfile header
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+    MAX_FORM_MEMORY_SIZE = 500 * 1024  # 500KB max for in-memory (non-file) form fields; file parts are spooled to disk
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'pdf'}
     
@@ -1,5 +1,6 @@
 from flask_login import UserMixin
 from datetime import datetime, timedelta
+from functools import cached_property
 import json
 
 # Import db from extensions (will be initialized in app factory)
@@ -23,6 +24,16 @@ class User(db.Model, UserMixin):
     contact_number = db.Column(db.String(20))
     country = db.Column(db.String(10))  # ISO country code (e.g., 'AE', 'US')
     currency = db.Column(db.String(10), default='AED')  # ISO currency code (e.g., 'AED', 'USD')
+    
+    @cached_property
+    def normalized_role(self):
+        """user_role with surrounding whitespace stripped ('' when unset); computed once per loaded user"""
+        return (self.user_role or '').strip()
+    
+    @cached_property
+    def organisation_name(self):
+        """Organisation stamped on records this user creates (falls back to restaurant_bar_name)"""
+        return self.organisation or self.restaurant_bar_name
 
 # -------------------------
 # PRODUCT MODEL
@@ -603,6 +614,9 @@ class Book(db.Model):
     organisation = db.Column(db.String(200))  # Organization name for sharing
     creator = db.relationship('User', foreign_keys=[created_by], backref='created_books')
     
+    # Library pages filter by library type and list newest first
+    __table_args__ = (db.Index('ix_book_library_type_created_at', 'library_type', 'created_at'),)
+    
     def __repr__(self):
         return f'<Book {self.id}: {self.title} ({self.library_type})>'
     
@@ -649,6 +663,22 @@ class ColdStorageUnit(db.Model):
     # Relationships
     temperature_logs = db.relationship('TemperatureLog', backref='unit', cascade='all, delete-orphan', lazy='dynamic')
     
+    __table_args__ = (
+        # Unit lists filter by context and active flag and sort by unit number
+        db.Index('ix_cold_storage_unit_context_active_number', 'context', 'is_active', 'unit_number'),
+        # Race backstop: active unit numbers are unique per stamped organisation string (case-insensitive)
+        # and context. This is not the scope of get_organization_filter: users without an organisation
+        # stamp their restaurant name, so they share a namespace with others of the same name, and legacy
+        # NULL-organisation units are only compared with each other. Routes check the visible scope first.
+        db.Index(
+            'uq_cold_storage_unit_active_number',
+            db.func.upper(db.func.coalesce(organisation, '')), context, unit_number,
+            unique=True,
+            sqlite_where=is_active == db.true(),
+            postgresql_where=is_active == db.true()
+        ),
+    )
+    
     def get_temperature_limits(self):
         """Get min and max temperature limits based on unit type"""
         if self.unit_type == 'Refrigerator':
@@ -688,8 +718,12 @@ class TemperatureLog(db.Model):
     # Relationships
     entries = db.relationship('TemperatureEntry', backref='log', cascade='all, delete-orphan', lazy='dynamic')
     
-    # Unique constraint: one log per unit per date
-    __table_args__ = (db.UniqueConstraint('unit_id', 'log_date', name='unique_unit_date'),)
+    # Unique constraint: one log per unit per date (also serves unit + date range lookups)
+    # log_date index: retention cleanup deletes by date across all units
+    __table_args__ = (
+        db.UniqueConstraint('unit_id', 'log_date', name='unique_unit_date'),
+        db.Index('ix_temperature_log_log_date', 'log_date'),
+    )
     
     def __repr__(self):
         return f'<TemperatureLog {self.id}: Unit {self.unit_id} - {self.log_date}>'
@@ -704,18 +738,26 @@ class TemperatureEntry(db.Model):
     recheck_temperature = db.Column(db.Float)  # Recheck temperature after corrective action
     initial = db.Column(db.String(10), nullable=False)  # User initials
     is_late_entry = db.Column(db.Boolean, default=False)  # True if entered after scheduled time
-    entry_timestamp = db.Column(db.DateTime, default=datetime.utcnow)  # Actual time of entry
+    entry_timestamp = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Actual time of entry (refreshed when re-entered)
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     creator = db.relationship('User', foreign_keys=[created_by], backref='created_temperature_entries')
     
-    def is_out_of_range(self, unit):
-        """Check if temperature is out of acceptable range"""
-        if self.temperature is None:
+    # Unique constraint: one entry per log per scheduled time (conflict target for save_entry upserts)
+    __table_args__ = (db.UniqueConstraint('log_id', 'scheduled_time', name='unique_log_scheduled_time'),)
+    
+    @staticmethod
+    def temperature_out_of_range(temperature, unit):
+        """Check if a temperature reading is outside the unit's acceptable range"""
+        if temperature is None:
             return False
         min_temp, max_temp = unit.get_temperature_limits()
         if min_temp is None or max_temp is None:
             return False
-        return self.temperature < min_temp or self.temperature > max_temp
+        return temperature < min_temp or temperature > max_temp
+    
+    def is_out_of_range(self, unit):
+        """Check if temperature is out of acceptable range"""
+        return TemperatureEntry.temperature_out_of_range(self.temperature, unit)
     
     def __repr__(self):
         return f'<TemperatureEntry {self.id}: {self.scheduled_time} - {self.temperature}°C>'
@@ -1262,6 +1304,9 @@ class BarShiftClosingChecklistUnit(db.Model):
     checklist_points = db.relationship('BarShiftClosingChecklistPoint', backref='unit', cascade='all, delete-orphan', lazy='dynamic', order_by='BarShiftClosingChecklistPoint.display_order')
     entries = db.relationship('BarShiftClosingChecklistEntry', backref='unit', cascade='all, delete-orphan', lazy='dynamic')
     
+    # Covers the active-units listing (filter on is_active, ordered by unit_name)
+    __table_args__ = (db.Index('ix_bar_shift_closing_unit_active_name', 'is_active', 'unit_name'),)
+    
     def __repr__(self):
         return f'<BarShiftClosingChecklistUnit {self.id}: {self.unit_name}>'
 
@@ -1275,11 +1320,15 @@ class BarShiftClosingChecklistPoint(db.Model):
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     creator = db.relationship('User', foreign_keys=[created_by], backref='created_bar_shift_closing_checklist_points')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
     # Relationships
     items = db.relationship('BarShiftClosingChecklistItem', backref='checklist_point', cascade='all, delete-orphan', lazy='dynamic')
     
+    # Covers the per-unit points listing (unit_id + is_active, ordered by display_order)
+    __table_args__ = (db.Index('ix_bar_shift_closing_point_unit_active_order', 'unit_id', 'is_active', 'display_order'),)
+    
     def __repr__(self):
         return f'<BarShiftClosingChecklistPoint {self.id}: {self.point_text}>'
 
@@ -300,6 +300,12 @@ function renderChecklistItems(points) {
 }
 
 // Update Checklist Item
+// Changes made in quick succession are queued and flushed together through
+// update_items, so a flurry of clicks costs one request and one commit
+const ITEM_FLUSH_DELAY_MS = 300;
+const pendingItems = new Map();
+let itemFlushTimer = null;
+
 function updateChecklistItem(pointId) {
     if (!currentEntry) return;
     
@@ -308,47 +314,145 @@ function updateChecklistItem(pointId) {
     
     if (!checkbox || !initialsInput) return;
     
-    const isCompleted = checkbox.checked;
     const initials = initialsInput.value.trim();
     
+    // Latest state per point wins; changes for another entry are flushed first
+    if (pendingItems.size > 0 && pendingItems.values().next().value.entry_id !== currentEntry.entry_id) {
+        flushChecklistItems();
+    }
+    pendingItems.set(pointId, {
+        entry_id: currentEntry.entry_id,
+        checklist_point_id: pointId,
+        is_completed: checkbox.checked,
+        staff_initials: initials || (window.userInitials || '')
+    });
+    
+    clearTimeout(itemFlushTimer);
+    itemFlushTimer = setTimeout(flushChecklistItems, ITEM_FLUSH_DELAY_MS);
+}
+
+// Don't lose queued changes when the bartender navigates away
+window.addEventListener('pagehide', flushChecklistItems);
+
+// Send queued item changes in one update_items request
+function flushChecklistItems() {
+    clearTimeout(itemFlushTimer);
+    itemFlushTimer = null;
+    if (pendingItems.size === 0) return;
+    
+    const items = Array.from(pendingItems.values());
+    pendingItems.clear();
+    const entryId = items[0].entry_id;
+    
+    // Put checkboxes back to the last saved state if the entry is still on screen
+    const revertItems = () => {
+        if (!currentEntry || currentEntry.entry_id !== entryId) return;
+        items.forEach(item => {
+            const checkbox = document.getElementById(`checkbox-${item.checklist_point_id}`);
+            const point = currentEntry.points.find(p => p.point_id === item.checklist_point_id);
+            if (checkbox && point) {
+                checkbox.checked = !!point.is_completed;
+            }
+        });
+    };
+    
     fetch('/checklist/bar/shift-closing/entries', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
+        // keepalive lets a flush started while the page unloads complete
+        keepalive: true,
         body: JSON.stringify({
-            action: 'update_item',
-            entry_id: currentEntry.entry_id,
-            checklist_point_id: pointId,
-            is_completed: isCompleted,
-            staff_initials: initials || (window.userInitials || '')
+            action: 'update_items',
+            items: items
         })
     })
     .then(response => response.json())
     .then(data => {
         if (data.success) {
             // Update local state
-            const point = currentEntry.points.find(p => p.point_id === pointId);
-            if (point) {
-                point.is_completed = isCompleted;
-                point.staff_initials = data.item.staff_initials;
-            }
+            if (!currentEntry || currentEntry.entry_id !== entryId) return;
+            data.items.forEach(item => {
+                const point = currentEntry.points.find(p => p.point_id === item.checklist_point_id);
+                if (point) {
+                    point.is_completed = item.is_completed;
+                    point.staff_initials = item.staff_initials;
+                }
+            });
         } else {
             showError(data.error || 'Failed to update checklist item');
-            // Revert checkbox
-            checkbox.checked = !isCompleted;
+            revertItems();
         }
     })
     .catch(error => {
         console.error('Error updating item:', error);
         showError('Failed to update checklist item');
-        checkbox.checked = !isCompleted;
+        revertItems();
     });
 }
 
 // Save Checklist Entry (for explicit save button)
+// Sends every item whose on-screen state differs from the saved state in one request
 function saveChecklistEntry() {
-    showSuccess('Checklist saved!');
+    if (!currentEntry) return;
+    
+    // Queued clicks are covered by the diff below
+    clearTimeout(itemFlushTimer);
+    itemFlushTimer = null;
+    pendingItems.clear();
+    
+    const items = [];
+    currentEntry.points.forEach(point => {
+        const checkbox = document.getElementById(`checkbox-${point.point_id}`);
+        const initialsInput = document.getElementById(`initials-${point.point_id}`);
+        if (!checkbox || !initialsInput) return;
+        
+        const initials = initialsInput.value.trim();
+        if (checkbox.checked !== !!point.is_completed || initials !== (point.staff_initials || '')) {
+            items.push({
+                entry_id: currentEntry.entry_id,
+                checklist_point_id: point.point_id,
+                is_completed: checkbox.checked,
+                staff_initials: initials || (window.userInitials || '')
+            });
+        }
+    });
+    
+    if (items.length === 0) {
+        showSuccess('Checklist saved!');
+        return;
+    }
+    
+    fetch('/checklist/bar/shift-closing/entries', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+            action: 'update_items',
+            items: items
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            data.items.forEach(item => {
+                const point = currentEntry.points.find(p => p.point_id === item.checklist_point_id);
+                if (point) {
+                    point.is_completed = item.is_completed;
+                    point.staff_initials = item.staff_initials;
+                }
+            });
+            showSuccess('Checklist saved!');
+        } else {
+            showError(data.error || 'Failed to save checklist');
+        }
+    })
+    .catch(error => {
+        console.error('Error saving checklist:', error);
+        showError('Failed to save checklist');
+    });
 }
 
 // Unit Management (Manager only)
@@ -618,15 +722,13 @@ function generatePDF() {
             month: monthYear
         })
     })
-    .then(response => {
-        if (response.ok) {
-            return response.blob();
-        } else {
-            return response.json().then(data => {
-                throw new Error(data.error || 'Failed to generate PDF');
-            });
+    .then(response => response.json().then(data => {
+        if (!response.ok || !data.success) {
+            throw new Error(data.error || 'Failed to generate PDF');
         }
-    })
+        // PDF is built in the background - poll until the file is ready
+        return pollPdfJob(data.status_url);
+    }))
     .then(blob => {
         const url = window.URL.createObjectURL(blob);
         const a = document.createElement('a');
@@ -644,6 +746,21 @@ function generatePDF() {
     });
 }
 
+function pollPdfJob(statusUrl) {
+    return fetch(statusUrl).then(response => {
+        if (response.status === 202) {
+            return new Promise(resolve => setTimeout(resolve, 1000))
+                .then(() => pollPdfJob(statusUrl));
+        }
+        if (response.ok) {
+            return response.blob();
+        }
+        return response.json().then(data => {
+            throw new Error(data.error || 'Failed to generate PDF');
+        });
+    });
+}
+
 // Utility Functions
 function showError(message) {
     // Simple alert for now - can be replaced with a toast notification
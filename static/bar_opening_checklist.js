@@ -347,8 +347,61 @@ function updateChecklistItem(pointId) {
 }
 
 // Save Checklist Entry (for explicit save button)
+// Sends every item whose on-screen state differs from the saved state in one request
 function saveChecklistEntry() {
-    showSuccess('Checklist saved!');
+    if (!currentEntry) return;
+    
+    const items = [];
+    currentEntry.points.forEach(point => {
+        const checkbox = document.getElementById(`checkbox-${point.point_id}`);
+        const initialsInput = document.getElementById(`initials-${point.point_id}`);
+        if (!checkbox || !initialsInput) return;
+        
+        const initials = initialsInput.value.trim();
+        if (checkbox.checked !== !!point.is_completed || initials !== (point.staff_initials || '')) {
+            items.push({
+                entry_id: currentEntry.entry_id,
+                checklist_point_id: point.point_id,
+                is_completed: checkbox.checked,
+                staff_initials: initials || (window.userInitials || '')
+            });
+        }
+    });
+    
+    if (items.length === 0) {
+        showSuccess('Checklist saved!');
+        return;
+    }
+    
+    fetch('/checklist/bar/opening/entries', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+            action: 'update_items',
+            items: items
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            data.items.forEach(item => {
+                const point = currentEntry.points.find(p => p.point_id === item.checklist_point_id);
+                if (point) {
+                    point.is_completed = item.is_completed;
+                    point.staff_initials = item.staff_initials;
+                }
+            });
+            showSuccess('Checklist saved!');
+        } else {
+            showError(data.error || 'Failed to save checklist');
+        }
+    })
+    .catch(error => {
+        console.error('Error saving checklist:', error);
+        showError('Failed to save checklist');
+    });
 }
 
 // Unit Management (Manager only)
@@ -618,15 +671,13 @@ function generatePDF() {
             month: monthYear
         })
     })
-    .then(response => {
-        if (response.ok) {
-            return response.blob();
-        } else {
-            return response.json().then(data => {
-                throw new Error(data.error || 'Failed to generate PDF');
-            });
+    .then(response => response.json().then(data => {
+        if (!response.ok || !data.success) {
+            throw new Error(data.error || 'Failed to generate PDF');
         }
-    })
+        // PDF is built in the background - poll until the file is ready
+        return pollPdfJob(data.status_url);
+    }))
     .then(blob => {
         const url = window.URL.createObjectURL(blob);
         const a = document.createElement('a');
@@ -644,6 +695,21 @@ function generatePDF() {
     });
 }
 
+function pollPdfJob(statusUrl) {
+    return fetch(statusUrl).then(response => {
+        if (response.status === 202) {
+            return new Promise(resolve => setTimeout(resolve, 1000))
+                .then(() => pollPdfJob(statusUrl));
+        }
+        if (response.ok) {
+            return response.blob();
+        }
+        return response.json().then(data => {
+            throw new Error(data.error || 'Failed to generate PDF');
+        });
+    });
+}
+
 // Utility Functions
 function showError(message) {
     // Simple alert for now - can be replaced with a toast notification
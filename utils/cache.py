@@ -0,0 +1,45 @@
+"""
+In-process cache for read-heavy, write-rare payloads
+Entries expire after a TTL so a worker that missed an invalidation never serves stale data for long
+"""
+import threading
+import time
+
+DEFAULT_TTL_SECONDS = 60
+
+_namespaces = {}
+_lock = threading.Lock()
+
+
+def get_cached(namespace, key):
+    """Return the cached value for key in namespace, or None if missing or expired"""
+    with _lock:
+        entry = _namespaces.get(namespace, {}).get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def set_cached(namespace, key, value, ttl=DEFAULT_TTL_SECONDS, max_entries=None):
+    """
+    Store value for key in namespace for ttl seconds.
+    With max_entries, the oldest stored entries are evicted so the namespace never holds more than that.
+    """
+    now = time.monotonic()
+    with _lock:
+        entries = _namespaces.setdefault(namespace, {})
+        # Drop expired entries so namespaces with many distinct keys do not grow without bound
+        for stale_key in [k for k, entry in entries.items() if entry[0] < now]:
+            del entries[stale_key]
+        # Re-insert so a refreshed key counts as the newest (dicts keep insertion order)
+        entries.pop(key, None)
+        if max_entries is not None:
+            while len(entries) >= max_entries:
+                del entries[next(iter(entries))]
+        entries[key] = (now + ttl, value)
+
+
+def invalidate_cached(namespace):
+    """Drop every entry in namespace (call after writes that change its payloads)"""
+    with _lock:
+        _namespaces.pop(namespace, None)
@@ -58,16 +58,36 @@ def table_exists(conn, table_name):
         return False
 
 
+# Database URLs whose schema updates already ran in this process
+_schema_ready = set()
+# Unique indexes ensure_schema_updates had to skip (existing duplicates), per database URL
+_skipped_unique_indexes = {}
+
+
+def has_unique_index(index_name):
+    """
+    False if ensure_schema_updates skipped the named unique index on the current database, so writes
+    must not rely on it (e.g. as an ON CONFLICT target) and have to check for duplicates themselves.
+    """
+    return index_name not in _skipped_unique_indexes.get(str(db.engine.url), ())
+
+
 def ensure_schema_updates():
     """
     Ensure database schema is up to date with migrations.
     Works with both SQLite and PostgreSQL.
+    Runs once per process and database; later calls return immediately.
     """
     try:
         with current_app.app_context():
+            db_url = str(db.engine.url)
+            if db_url in _schema_ready:
+                return
+            
             # First, ensure all tables are created
             db.create_all()
             
+            skipped_unique_indexes = set()
             with db.engine.begin() as conn:
                 # Recipe table updates
                 if table_exists(conn, 'recipe'):
@@ -135,21 +155,23 @@ def ensure_schema_updates():
 
                     # Backfill new columns from legacy data where possible
                     try:
-                        conn.execute(db.text("UPDATE recipe_ingredient SET ingredient_id = product_id WHERE ingredient_id IS NULL AND product_id IS NOT NULL"))
-                        conn.execute(db.text("UPDATE recipe_ingredient SET ingredient_type = COALESCE(ingredient_type, product_type)"))
-                        conn.execute(db.text("UPDATE recipe_ingredient SET quantity = COALESCE(quantity, quantity_ml)"))
-                        conn.execute(db.text("UPDATE recipe_ingredient SET unit = COALESCE(unit, 'ml')"))
+                        with conn.begin_nested():
+                            conn.execute(db.text("UPDATE recipe_ingredient SET ingredient_id = product_id WHERE ingredient_id IS NULL AND product_id IS NOT NULL"))
+                            conn.execute(db.text("UPDATE recipe_ingredient SET ingredient_type = COALESCE(ingredient_type, product_type)"))
+                            conn.execute(db.text("UPDATE recipe_ingredient SET quantity = COALESCE(quantity, quantity_ml)"))
+                            conn.execute(db.text("UPDATE recipe_ingredient SET unit = COALESCE(unit, 'ml')"))
                     except Exception:
                         pass  # May fail if columns don't exist
                     
                     # Backfill product_name and product_code from existing products
                     try:
-                        conn.execute(db.text("""
-                            UPDATE recipe_ingredient 
-                            SET product_name = (SELECT description FROM product WHERE product.id = recipe_ingredient.product_id),
-                                product_code = (SELECT barbuddy_code FROM product WHERE product.id = recipe_ingredient.product_id)
-                            WHERE product_id IS NOT NULL AND product_name IS NULL
-                        """))
+                        with conn.begin_nested():
+                            conn.execute(db.text("""
+                                UPDATE recipe_ingredient 
+                                SET product_name = (SELECT description FROM product WHERE product.id = recipe_ingredient.product_id),
+                                    product_code = (SELECT barbuddy_code FROM product WHERE product.id = recipe_ingredient.product_id)
+                                WHERE product_id IS NOT NULL AND product_name IS NULL
+                            """))
                     except Exception:
                         pass  # May fail if tables don't exist or columns don't match
 
@@ -167,18 +189,20 @@ def ensure_schema_updates():
                     
                     # Backfill quantity_ml if it's NULL (for existing records)
                     try:
-                        conn.execute(db.text("UPDATE homemade_ingredient_item SET quantity_ml = COALESCE(quantity_ml, COALESCE(quantity, 0)) WHERE quantity_ml IS NULL"))
+                        with conn.begin_nested():
+                            conn.execute(db.text("UPDATE homemade_ingredient_item SET quantity_ml = COALESCE(quantity_ml, COALESCE(quantity, 0)) WHERE quantity_ml IS NULL"))
                     except Exception:
                         pass  # Column might not exist or already updated
                     
                     # Backfill product_name and product_code from existing products
                     try:
-                        conn.execute(db.text("""
-                            UPDATE homemade_ingredient_item 
-                            SET product_name = (SELECT description FROM product WHERE product.id = homemade_ingredient_item.product_id),
-                                product_code = (SELECT barbuddy_code FROM product WHERE product.id = homemade_ingredient_item.product_id)
-                            WHERE product_id IS NOT NULL AND product_name IS NULL
-                        """))
+                        with conn.begin_nested():
+                            conn.execute(db.text("""
+                                UPDATE homemade_ingredient_item 
+                                SET product_name = (SELECT description FROM product WHERE product.id = homemade_ingredient_item.product_id),
+                                    product_code = (SELECT barbuddy_code FROM product WHERE product.id = homemade_ingredient_item.product_id)
+                                WHERE product_id IS NOT NULL AND product_name IS NULL
+                            """))
                     except Exception:
                         pass  # May fail if tables don't exist or columns don't match
 
@@ -202,11 +226,12 @@ def ensure_schema_updates():
                     
                     # Backfill organization for existing items based on creator's organization
                     try:
-                        conn.execute(db.text("""
-                            UPDATE homemade_ingredient 
-                            SET organisation = (SELECT organisation FROM "user" WHERE "user".id = homemade_ingredient.created_by)
-                            WHERE organisation IS NULL AND created_by IS NOT NULL
-                        """))
+                        with conn.begin_nested():
+                            conn.execute(db.text("""
+                                UPDATE homemade_ingredient 
+                                SET organisation = (SELECT organisation FROM "user" WHERE "user".id = homemade_ingredient.created_by)
+                                WHERE organisation IS NULL AND created_by IS NOT NULL
+                            """))
                     except Exception:
                         pass  # May fail if tables don't exist
 
@@ -244,24 +269,25 @@ def ensure_schema_updates():
                     purchase_request_columns = get_table_columns(conn, 'purchase_request')
                     # Update status column size if it exists and is too small
                     try:
-                        # Check current column type and alter if needed
-                        db_url = str(db.engine.url)
-                        is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
-                        if is_postgres:
-                            # For PostgreSQL, check and alter the column type
-                            result = conn.execute(db.text("""
-                                SELECT character_maximum_length 
-                                FROM information_schema.columns 
-                                WHERE table_name = 'purchase_request' AND column_name = 'status'
-                            """))
-                            max_length = result.scalar()
-                            if max_length and max_length < 50:
-                                conn.execute(db.text("ALTER TABLE purchase_request ALTER COLUMN status TYPE VARCHAR(50)"))
-                        else:
-                            # For SQLite, we can't easily check, but we can try to alter
-                            # SQLite doesn't support ALTER COLUMN, so we'll need to recreate
-                            # For now, just ensure the model is correct
-                            pass
+                        with conn.begin_nested():
+                            # Check current column type and alter if needed
+                            db_url = str(db.engine.url)
+                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            if is_postgres:
+                                # For PostgreSQL, check and alter the column type
+                                result = conn.execute(db.text("""
+                                    SELECT character_maximum_length 
+                                    FROM information_schema.columns 
+                                    WHERE table_name = 'purchase_request' AND column_name = 'status'
+                                """))
+                                max_length = result.scalar()
+                                if max_length and max_length < 50:
+                                    conn.execute(db.text("ALTER TABLE purchase_request ALTER COLUMN status TYPE VARCHAR(50)"))
+                            else:
+                                # For SQLite, we can't easily check, but we can try to alter
+                                # SQLite doesn't support ALTER COLUMN, so we'll need to recreate
+                                # For now, just ensure the model is correct
+                                pass
                     except Exception as e:
                         current_app.logger.warning(f"Could not update status column size: {str(e)}")
                     
@@ -279,20 +305,21 @@ def ensure_schema_updates():
                 # Backfill organization for existing items based on creator's organization
                 # This helps migrate existing data to the new organization system
                 try:
-                    # Backfill products: set organization from creator's organization
-                    if table_exists(conn, 'product') and table_exists(conn, 'user'):
-                        conn.execute(db.text("""
-                            UPDATE product 
-                            SET organisation = (SELECT organisation FROM "user" WHERE "user".id = product.created_by)
-                            WHERE organisation IS NULL AND created_by IS NOT NULL
-                        """))
-                    # Backfill recipes: set organization from creator's organization
-                    if table_exists(conn, 'recipe') and table_exists(conn, 'user'):
-                        conn.execute(db.text("""
-                            UPDATE recipe 
-                            SET organisation = (SELECT organisation FROM "user" WHERE "user".id = recipe.user_id)
-                            WHERE organisation IS NULL AND user_id IS NOT NULL
-                        """))
+                    with conn.begin_nested():
+                        # Backfill products: set organization from creator's organization
+                        if table_exists(conn, 'product') and table_exists(conn, 'user'):
+                            conn.execute(db.text("""
+                                UPDATE product 
+                                SET organisation = (SELECT organisation FROM "user" WHERE "user".id = product.created_by)
+                                WHERE organisation IS NULL AND created_by IS NOT NULL
+                            """))
+                        # Backfill recipes: set organization from creator's organization
+                        if table_exists(conn, 'recipe') and table_exists(conn, 'user'):
+                            conn.execute(db.text("""
+                                UPDATE recipe 
+                                SET organisation = (SELECT organisation FROM "user" WHERE "user".id = recipe.user_id)
+                                WHERE organisation IS NULL AND user_id IS NOT NULL
+                            """))
                 except Exception as e:
                     current_app.logger.warning(f"Could not backfill organization data: {str(e)}")
                     pass  # Continue even if backfill fails
@@ -305,20 +332,22 @@ def ensure_schema_updates():
                     # Make pdf_path nullable if it's not already
                     # Note: SQLite doesn't support ALTER COLUMN, so this is mainly for PostgreSQL
                     try:
-                        db_url = str(db.engine.url)
-                        is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
-                        if is_postgres and 'pdf_path' in book_columns:
-                            # Check if pdf_path is currently NOT NULL
-                            result = conn.execute(db.text("""
-                                SELECT is_nullable 
-                                FROM information_schema.columns 
-                                WHERE table_name = 'book' AND column_name = 'pdf_path'
-                            """))
-                            is_nullable = result.scalar()
-                            if is_nullable == 'NO':
-                                conn.execute(db.text("ALTER TABLE book ALTER COLUMN pdf_path DROP NOT NULL"))
+                        with conn.begin_nested():
+                            db_url = str(db.engine.url)
+                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            if is_postgres and 'pdf_path' in book_columns:
+                                # Check if pdf_path is currently NOT NULL
+                                result = conn.execute(db.text("""
+                                    SELECT is_nullable 
+                                    FROM information_schema.columns 
+                                    WHERE table_name = 'book' AND column_name = 'pdf_path'
+                                """))
+                                is_nullable = result.scalar()
+                                if is_nullable == 'NO':
+                                    conn.execute(db.text("ALTER TABLE book ALTER COLUMN pdf_path DROP NOT NULL"))
                     except Exception as e:
                         current_app.logger.warning(f"Could not update pdf_path column: {str(e)}")
+                    conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_book_library_type_created_at ON book (library_type, created_at)"))
                 
                 # Cold Storage Unit table updates
                 if table_exists(conn, 'cold_storage_unit'):
@@ -326,19 +355,20 @@ def ensure_schema_updates():
                     if 'location' not in cold_storage_columns:
                         # Add location column - for existing records, set a default value
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                # For PostgreSQL: Add column with default, update existing rows, then set NOT NULL
-                                conn.execute(db.text("ALTER TABLE cold_storage_unit ADD COLUMN location VARCHAR(200) DEFAULT 'Unknown'"))
-                                conn.execute(db.text("UPDATE cold_storage_unit SET location = 'Unknown' WHERE location IS NULL"))
-                                # Now make it NOT NULL
-                                conn.execute(db.text("ALTER TABLE cold_storage_unit ALTER COLUMN location SET NOT NULL"))
-                            else:
-                                # For SQLite: Add column with default (SQLite doesn't support NOT NULL on ALTER)
-                                conn.execute(db.text("ALTER TABLE cold_storage_unit ADD COLUMN location VARCHAR(200) DEFAULT 'Unknown'"))
-                                conn.execute(db.text("UPDATE cold_storage_unit SET location = 'Unknown' WHERE location IS NULL"))
+                                if is_postgres:
+                                    # For PostgreSQL: Add column with default, update existing rows, then set NOT NULL
+                                    conn.execute(db.text("ALTER TABLE cold_storage_unit ADD COLUMN location VARCHAR(200) DEFAULT 'Unknown'"))
+                                    conn.execute(db.text("UPDATE cold_storage_unit SET location = 'Unknown' WHERE location IS NULL"))
+                                    # Now make it NOT NULL
+                                    conn.execute(db.text("ALTER TABLE cold_storage_unit ALTER COLUMN location SET NOT NULL"))
+                                else:
+                                    # For SQLite: Add column with default (SQLite doesn't support NOT NULL on ALTER)
+                                    conn.execute(db.text("ALTER TABLE cold_storage_unit ADD COLUMN location VARCHAR(200) DEFAULT 'Unknown'"))
+                                    conn.execute(db.text("UPDATE cold_storage_unit SET location = 'Unknown' WHERE location IS NULL"))
                         except Exception as e:
                             current_app.logger.warning(f"Could not add location column to cold_storage_unit: {str(e)}")
                     if 'min_temp' not in cold_storage_columns:
@@ -356,25 +386,27 @@ def ensure_schema_updates():
                     # Add context column to separate Bar and Kitchen units
                     if 'context' not in cold_storage_columns:
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                # For PostgreSQL: Add column with default, update existing rows, then set NOT NULL
-                                conn.execute(db.text("ALTER TABLE cold_storage_unit ADD COLUMN context VARCHAR(20) DEFAULT 'bar'"))
-                                conn.execute(db.text("UPDATE cold_storage_unit SET context = 'bar' WHERE context IS NULL"))
-                                # Now make it NOT NULL
-                                conn.execute(db.text("ALTER TABLE cold_storage_unit ALTER COLUMN context SET NOT NULL"))
-                            else:
-                                # For SQLite: Add column with default (SQLite doesn't support NOT NULL on ALTER)
-                                conn.execute(db.text("ALTER TABLE cold_storage_unit ADD COLUMN context VARCHAR(20) DEFAULT 'bar'"))
-                                conn.execute(db.text("UPDATE cold_storage_unit SET context = 'bar' WHERE context IS NULL"))
+                                if is_postgres:
+                                    # For PostgreSQL: Add column with default, update existing rows, then set NOT NULL
+                                    conn.execute(db.text("ALTER TABLE cold_storage_unit ADD COLUMN context VARCHAR(20) DEFAULT 'bar'"))
+                                    conn.execute(db.text("UPDATE cold_storage_unit SET context = 'bar' WHERE context IS NULL"))
+                                    # Now make it NOT NULL
+                                    conn.execute(db.text("ALTER TABLE cold_storage_unit ALTER COLUMN context SET NOT NULL"))
+                                else:
+                                    # For SQLite: Add column with default (SQLite doesn't support NOT NULL on ALTER)
+                                    conn.execute(db.text("ALTER TABLE cold_storage_unit ADD COLUMN context VARCHAR(20) DEFAULT 'bar'"))
+                                    conn.execute(db.text("UPDATE cold_storage_unit SET context = 'bar' WHERE context IS NULL"))
                         except Exception as e:
                             current_app.logger.warning(f"Could not add context column to cold_storage_unit: {str(e)}")
                     else:
                         # Column exists, but update any NULL values to 'bar' (default for existing units)
                         try:
-                            conn.execute(db.text("UPDATE cold_storage_unit SET context = 'bar' WHERE context IS NULL"))
+                            with conn.begin_nested():
+                                conn.execute(db.text("UPDATE cold_storage_unit SET context = 'bar' WHERE context IS NULL"))
                         except Exception as e:
                             current_app.logger.warning(f"Could not update context values in cold_storage_unit: {str(e)}")
                 
@@ -384,71 +416,74 @@ def ensure_schema_updates():
                     # Handle week_start_date column
                     if 'week_start_date' not in temp_log_columns:
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                # For PostgreSQL: Add column, calculate week_start_date for existing rows, then set NOT NULL
-                                conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN week_start_date DATE"))
-                                # Calculate week_start_date for existing rows (Monday of the week)
-                                # date_trunc('week', date) gives Monday of the week in PostgreSQL
-                                conn.execute(db.text("""
-                                    UPDATE temperature_log 
-                                    SET week_start_date = DATE(date_trunc('week', log_date))
-                                    WHERE week_start_date IS NULL
-                                """))
-                                # Set NOT NULL constraint
-                                conn.execute(db.text("ALTER TABLE temperature_log ALTER COLUMN week_start_date SET NOT NULL"))
-                            else:
-                                # For SQLite: Add column with default (SQLite doesn't support NOT NULL on ALTER easily)
-                                conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN week_start_date DATE"))
-                                # Calculate week_start_date for existing rows (Monday of the week)
-                                # strftime('%w', date) returns 0-6 where 0=Sunday, 1=Monday, etc.
-                                # To get to Monday: subtract (day_of_week - 1) days, handling Sunday specially
-                                conn.execute(db.text("""
-                                    UPDATE temperature_log 
-                                    SET week_start_date = date(log_date, '-' || CASE 
-                                        WHEN CAST(strftime('%%w', log_date) AS INTEGER) = 0 THEN '6'
-                                        ELSE CAST(strftime('%%w', log_date) AS INTEGER) - 1
-                                    END || ' days')
-                                    WHERE week_start_date IS NULL
-                                """))
+                                if is_postgres:
+                                    # For PostgreSQL: Add column, calculate week_start_date for existing rows, then set NOT NULL
+                                    conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN week_start_date DATE"))
+                                    # Calculate week_start_date for existing rows (Monday of the week)
+                                    # date_trunc('week', date) gives Monday of the week in PostgreSQL
+                                    conn.execute(db.text("""
+                                        UPDATE temperature_log 
+                                        SET week_start_date = DATE(date_trunc('week', log_date))
+                                        WHERE week_start_date IS NULL
+                                    """))
+                                    # Set NOT NULL constraint
+                                    conn.execute(db.text("ALTER TABLE temperature_log ALTER COLUMN week_start_date SET NOT NULL"))
+                                else:
+                                    # For SQLite: Add column with default (SQLite doesn't support NOT NULL on ALTER easily)
+                                    conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN week_start_date DATE"))
+                                    # Calculate week_start_date for existing rows (Monday of the week)
+                                    # strftime('%w', date) returns 0-6 where 0=Sunday, 1=Monday, etc.
+                                    # To get to Monday: subtract (day_of_week - 1) days, handling Sunday specially
+                                    conn.execute(db.text("""
+                                        UPDATE temperature_log 
+                                        SET week_start_date = date(log_date, '-' || CASE 
+                                            WHEN CAST(strftime('%%w', log_date) AS INTEGER) = 0 THEN '6'
+                                            ELSE CAST(strftime('%%w', log_date) AS INTEGER) - 1
+                                        END || ' days')
+                                        WHERE week_start_date IS NULL
+                                    """))
                         except Exception as e:
                             current_app.logger.warning(f"Could not add week_start_date column to temperature_log: {str(e)}")
                     else:
                         # Column exists, but update any NULL values
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                # Update NULL week_start_date values for existing rows
-                                conn.execute(db.text("""
-                                    UPDATE temperature_log 
-                                    SET week_start_date = DATE(date_trunc('week', log_date))
-                                    WHERE week_start_date IS NULL
-                                """))
-                            else:
-                                # Update NULL week_start_date values for existing rows in SQLite
-                                conn.execute(db.text("""
-                                    UPDATE temperature_log 
-                                    SET week_start_date = date(log_date, '-' || CASE 
-                                        WHEN CAST(strftime('%%w', log_date) AS INTEGER) = 0 THEN '6'
-                                        ELSE CAST(strftime('%%w', log_date) AS INTEGER) - 1
-                                    END || ' days')
-                                    WHERE week_start_date IS NULL
-                                """))
+                                if is_postgres:
+                                    # Update NULL week_start_date values for existing rows
+                                    conn.execute(db.text("""
+                                        UPDATE temperature_log 
+                                        SET week_start_date = DATE(date_trunc('week', log_date))
+                                        WHERE week_start_date IS NULL
+                                    """))
+                                else:
+                                    # Update NULL week_start_date values for existing rows in SQLite
+                                    conn.execute(db.text("""
+                                        UPDATE temperature_log 
+                                        SET week_start_date = date(log_date, '-' || CASE 
+                                            WHEN CAST(strftime('%%w', log_date) AS INTEGER) = 0 THEN '6'
+                                            ELSE CAST(strftime('%%w', log_date) AS INTEGER) - 1
+                                        END || ' days')
+                                        WHERE week_start_date IS NULL
+                                    """))
                         except Exception as e:
                             current_app.logger.warning(f"Could not update week_start_date values in temperature_log: {str(e)}")
                     if 'supervisor_verified' not in temp_log_columns:
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN supervisor_verified BOOLEAN DEFAULT FALSE"))
-                            else:
-                                conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN supervisor_verified BOOLEAN DEFAULT 0"))
+                                if is_postgres:
+                                    conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN supervisor_verified BOOLEAN DEFAULT FALSE"))
+                                else:
+                                    conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN supervisor_verified BOOLEAN DEFAULT 0"))
                         except Exception as e:
                             current_app.logger.warning(f"Could not add supervisor_verified column to temperature_log: {str(e)}")
                     if 'supervisor_name' not in temp_log_columns:
@@ -464,80 +499,85 @@ def ensure_schema_updates():
                     # Handle temperature column - add if missing, or update NULL values if it exists with NOT NULL constraint
                     if 'temperature' not in temp_log_columns:
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                # For PostgreSQL: Add column as nullable first (temperature should be in entries, not log)
-                                conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN temperature FLOAT"))
-                            else:
-                                # For SQLite: Add column as nullable
-                                conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN temperature FLOAT"))
+                                if is_postgres:
+                                    # For PostgreSQL: Add column as nullable first (temperature should be in entries, not log)
+                                    conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN temperature FLOAT"))
+                                else:
+                                    # For SQLite: Add column as nullable
+                                    conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN temperature FLOAT"))
                         except Exception as e:
                             current_app.logger.warning(f"Could not add temperature column to temperature_log: {str(e)}")
                     else:
                         # Column exists - update any NULL values to satisfy NOT NULL constraint if needed
                         try:
-                            # Set a default temperature for NULL values (0.0 as placeholder)
-                            # This ensures NOT NULL constraint is satisfied
-                            conn.execute(db.text("""
-                                UPDATE temperature_log 
-                                SET temperature = 0.0
-                                WHERE temperature IS NULL
-                            """))
+                            with conn.begin_nested():
+                                # Set a default temperature for NULL values (0.0 as placeholder)
+                                # This ensures NOT NULL constraint is satisfied
+                                conn.execute(db.text("""
+                                    UPDATE temperature_log 
+                                    SET temperature = 0.0
+                                    WHERE temperature IS NULL
+                                """))
                             
-                            # Try to make column nullable if possible (may fail if constraint is strict)
-                            try:
-                                db_url = str(db.engine.url)
-                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                                # Try to make column nullable if possible (may fail if constraint is strict)
+                                try:
+                                    with conn.begin_nested():
+                                        db_url = str(db.engine.url)
+                                        is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                                 
-                                if is_postgres:
-                                    # Try to drop NOT NULL constraint if it exists
-                                    conn.execute(db.text("ALTER TABLE temperature_log ALTER COLUMN temperature DROP NOT NULL"))
-                            except Exception as alter_error:
-                                # If we can't alter (constraint might be strict), that's okay
-                                # We've already set default values, so new inserts will work
-                                current_app.logger.debug(f"Could not alter temperature column to nullable (this is okay): {str(alter_error)}")
+                                        if is_postgres:
+                                            # Try to drop NOT NULL constraint if it exists
+                                            conn.execute(db.text("ALTER TABLE temperature_log ALTER COLUMN temperature DROP NOT NULL"))
+                                except Exception as alter_error:
+                                    # If we can't alter (constraint might be strict), that's okay
+                                    # We've already set default values, so new inserts will work
+                                    current_app.logger.debug(f"Could not alter temperature column to nullable (this is okay): {str(alter_error)}")
                         except Exception as e:
                             current_app.logger.warning(f"Could not update temperature column in temperature_log: {str(e)}")
                     # Handle time_slot column - add if missing, or update NULL values if it exists
                     if 'time_slot' not in temp_log_columns:
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                # For PostgreSQL: Add column with default, update existing rows, then set NOT NULL if needed
-                                conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN time_slot VARCHAR(10) DEFAULT '10:00 AM'"))
-                                conn.execute(db.text("UPDATE temperature_log SET time_slot = '10:00 AM' WHERE time_slot IS NULL"))
-                                # Note: We keep it nullable in the model for backward compatibility, but DB may have NOT NULL
-                            else:
-                                # For SQLite: Add column with default
-                                conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN time_slot VARCHAR(10) DEFAULT '10:00 AM'"))
-                                conn.execute(db.text("UPDATE temperature_log SET time_slot = '10:00 AM' WHERE time_slot IS NULL"))
+                                if is_postgres:
+                                    # For PostgreSQL: Add column with default, update existing rows, then set NOT NULL if needed
+                                    conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN time_slot VARCHAR(10) DEFAULT '10:00 AM'"))
+                                    conn.execute(db.text("UPDATE temperature_log SET time_slot = '10:00 AM' WHERE time_slot IS NULL"))
+                                    # Note: We keep it nullable in the model for backward compatibility, but DB may have NOT NULL
+                                else:
+                                    # For SQLite: Add column with default
+                                    conn.execute(db.text("ALTER TABLE temperature_log ADD COLUMN time_slot VARCHAR(10) DEFAULT '10:00 AM'"))
+                                    conn.execute(db.text("UPDATE temperature_log SET time_slot = '10:00 AM' WHERE time_slot IS NULL"))
                         except Exception as e:
                             current_app.logger.warning(f"Could not add time_slot column to temperature_log: {str(e)}")
                     else:
                         # Column exists - update any NULL values to ensure NOT NULL constraint is satisfied
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                # For PostgreSQL: Set a default value for NULL time_slot values
-                                # Use the first scheduled time as default
-                                conn.execute(db.text("""
-                                    UPDATE temperature_log 
-                                    SET time_slot = '10:00 AM'
-                                    WHERE time_slot IS NULL
-                                """))
-                            else:
-                                # For SQLite: Set default for NULL values
-                                conn.execute(db.text("""
-                                    UPDATE temperature_log 
-                                    SET time_slot = '10:00 AM'
-                                    WHERE time_slot IS NULL
-                                """))
+                                if is_postgres:
+                                    # For PostgreSQL: Set a default value for NULL time_slot values
+                                    # Use the first scheduled time as default
+                                    conn.execute(db.text("""
+                                        UPDATE temperature_log 
+                                        SET time_slot = '10:00 AM'
+                                        WHERE time_slot IS NULL
+                                    """))
+                                else:
+                                    # For SQLite: Set default for NULL values
+                                    conn.execute(db.text("""
+                                        UPDATE temperature_log 
+                                        SET time_slot = '10:00 AM'
+                                        WHERE time_slot IS NULL
+                                    """))
                         except Exception as e:
                             current_app.logger.warning(f"Could not update time_slot values in temperature_log: {str(e)}")
                 
@@ -550,32 +590,85 @@ def ensure_schema_updates():
                         conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN recheck_temperature FLOAT"))
                     if 'initial' not in temp_entry_columns:
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN initial VARCHAR(10) DEFAULT ''"))
-                                conn.execute(db.text("UPDATE temperature_entry SET initial = '' WHERE initial IS NULL"))
-                                conn.execute(db.text("ALTER TABLE temperature_entry ALTER COLUMN initial SET NOT NULL"))
-                            else:
-                                conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN initial VARCHAR(10) DEFAULT ''"))
+                                if is_postgres:
+                                    conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN initial VARCHAR(10) DEFAULT ''"))
+                                    conn.execute(db.text("UPDATE temperature_entry SET initial = '' WHERE initial IS NULL"))
+                                    conn.execute(db.text("ALTER TABLE temperature_entry ALTER COLUMN initial SET NOT NULL"))
+                                else:
+                                    conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN initial VARCHAR(10) DEFAULT ''"))
                         except Exception as e:
                             current_app.logger.warning(f"Could not add initial column to temperature_entry: {str(e)}")
                     if 'is_late_entry' not in temp_entry_columns:
                         try:
-                            db_url = str(db.engine.url)
-                            is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
+                            with conn.begin_nested():
+                                db_url = str(db.engine.url)
+                                is_postgres = 'postgresql' in db_url.lower() or 'postgres' in db_url.lower()
                             
-                            if is_postgres:
-                                conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN is_late_entry BOOLEAN DEFAULT FALSE"))
-                            else:
-                                conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN is_late_entry BOOLEAN DEFAULT 0"))
+                                if is_postgres:
+                                    conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN is_late_entry BOOLEAN DEFAULT FALSE"))
+                                else:
+                                    conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN is_late_entry BOOLEAN DEFAULT 0"))
                         except Exception as e:
                             current_app.logger.warning(f"Could not add is_late_entry column to temperature_entry: {str(e)}")
                     if 'entry_timestamp' not in temp_entry_columns:
                         conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN entry_timestamp TIMESTAMP"))
                     if 'created_by' not in temp_entry_columns:
                         conn.execute(db.text("ALTER TABLE temperature_entry ADD COLUMN created_by INTEGER"))
+                    # One entry per log and scheduled time. Temperature records are compliance data, so
+                    # existing duplicates are never deleted here: the index waits until they are resolved by hand
+                    duplicate_groups = conn.execute(db.text("""
+                        SELECT log_id, scheduled_time, COUNT(*) FROM temperature_entry
+                        WHERE scheduled_time IS NOT NULL
+                        GROUP BY log_id, scheduled_time HAVING COUNT(*) > 1
+                    """)).fetchall()
+                    if duplicate_groups:
+                        current_app.logger.warning(
+                            f"Skipping unique index unique_log_scheduled_time: {len(duplicate_groups)} "
+                            f"(log_id, scheduled_time) group(s) in temperature_entry have duplicate rows, e.g. "
+                            f"{[tuple(row) for row in duplicate_groups[:10]]}. Resolve them manually to enable the index."
+                        )
+                        skipped_unique_indexes.add('unique_log_scheduled_time')
+                    else:
+                        try:
+                            with conn.begin_nested():
+                                conn.execute(db.text("CREATE UNIQUE INDEX IF NOT EXISTS unique_log_scheduled_time ON temperature_entry (log_id, scheduled_time)"))
+                        except Exception as e:
+                            current_app.logger.warning(f"Could not add unique index to temperature_entry: {str(e)}")
+                            skipped_unique_indexes.add('unique_log_scheduled_time')
+                
+                # Cold storage indexes (create_all only adds indexes to new tables)
+                if table_exists(conn, 'cold_storage_unit'):
+                    conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_cold_storage_unit_context_active_number ON cold_storage_unit (context, is_active, unit_number)"))
+                    try:
+                        with conn.begin_nested():
+                            conn.execute(db.text("""
+                                CREATE UNIQUE INDEX IF NOT EXISTS uq_cold_storage_unit_active_number
+                                ON cold_storage_unit (UPPER(COALESCE(organisation, '')), context, unit_number)
+                                WHERE is_active
+                            """))
+                    except Exception as e:
+                        # Existing duplicate active unit numbers have to be resolved by hand first
+                        current_app.logger.warning(f"Could not add unique unit number index to cold_storage_unit: {str(e)}")
+                if table_exists(conn, 'temperature_log'):
+                    conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_temperature_log_log_date ON temperature_log (log_date)"))
+                
+                # Bar shift closing checklist updates (create_all only adds indexes to new tables)
+                if table_exists(conn, 'bar_shift_closing_checklist_unit'):
+                    conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_bar_shift_closing_unit_active_name ON bar_shift_closing_checklist_unit (is_active, unit_name)"))
+                if table_exists(conn, 'bar_shift_closing_checklist_point'):
+                    point_columns = get_table_columns(conn, 'bar_shift_closing_checklist_point')
+                    if 'updated_at' not in point_columns:
+                        conn.execute(db.text("ALTER TABLE bar_shift_closing_checklist_point ADD COLUMN updated_at TIMESTAMP"))
+                        conn.execute(db.text("UPDATE bar_shift_closing_checklist_point SET updated_at = created_at WHERE updated_at IS NULL"))
+                    conn.execute(db.text("CREATE INDEX IF NOT EXISTS ix_bar_shift_closing_point_unit_active_order ON bar_shift_closing_checklist_point (unit_id, is_active, display_order)"))
+            
+            # Only mark the schema ready once every update committed; failures retry on the next call
+            _skipped_unique_indexes[db_url] = skipped_unique_indexes
+            _schema_ready.add(db_url)
                     
     except Exception as e:
         current_app.logger.error(f"Error in ensure_schema_updates: {str(e)}", exc_info=True)
@@ -632,3 +725,54 @@ def cleanup_old_temperature_logs():
         db.session.rollback()
         # Don't raise - allow app to continue even if cleanup fails
         return 0
+
+
+def _dialect_insert():
+    """Return the dialect-specific insert() construct that supports ON CONFLICT clauses"""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT inserts are not supported for dialect {dialect}")
+    return insert
+
+
+def insert_or_ignore(model_class, conflict_columns, values):
+    """
+    INSERT ... ON CONFLICT (conflict_columns) DO NOTHING.
+    Safe against concurrent inserts of the same key; does not commit.
+    """
+    insert = _dialect_insert()
+    stmt = insert(model_class.__table__).values(**values).on_conflict_do_nothing(index_elements=conflict_columns)
+    db.session.execute(stmt)
+
+
+def upsert(model_class, conflict_columns, values, update_columns):
+    """
+    INSERT ... ON CONFLICT (conflict_columns) DO UPDATE in a single statement.
+    Works with both SQLite and PostgreSQL; conflict_columns must be covered by a unique constraint.
+    Returns the resulting row (all table columns). Does not commit.
+    """
+    return upsert_many(model_class, conflict_columns, [values], update_columns)[0]
+
+
+def upsert_many(model_class, conflict_columns, rows, update_columns):
+    """
+    Multi-row INSERT ... ON CONFLICT (conflict_columns) DO UPDATE in a single statement.
+    Rows repeating a conflict key are collapsed (last one wins), since one statement
+    cannot update the same row twice. Returns the resulting rows. Does not commit.
+    """
+    insert = _dialect_insert()
+    table = model_class.__table__
+    unique_rows = {tuple(row[column] for column in conflict_columns): row for row in rows}
+    stmt = insert(table).values(list(unique_rows.values()))
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    # Column onupdate defaults are not applied to ON CONFLICT updates, so evaluate them here
+    for column in table.c:
+        if column.onupdate is not None and column.name not in set_:
+            onupdate = column.onupdate
+            set_[column.name] = onupdate.arg(None) if onupdate.is_callable else onupdate.arg
+    stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=set_).returning(*table.c)
+    return db.session.execute(stmt).all()
@@ -3,15 +3,19 @@ File upload utilities
 """
 import os
 import uuid
+from contextlib import suppress
 from datetime import datetime
 from werkzeug.utils import secure_filename
 from flask import current_app
 
+# Uploads are copied from the request stream to disk in chunks of this size
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in current_app.config['ALLOWED_EXTENSIONS']
 
 
 def save_uploaded_file(file, folder):
@@ -31,12 +35,8 @@ def save_uploaded_file(file, folder):
         filename = timestamp + filename
         
         filepath = os.path.join(upload_dir, filename)
-        file.save(filepath)
-        
-        # Verify file was saved
-        if not os.path.exists(filepath):
-            current_app.logger.error(f'Failed to save file: {filepath}')
-            return None
+        # FileStorage.save raises if the write fails, so a return means the file is on disk
+        file.save(filepath, buffer_size=UPLOAD_BUFFER_SIZE)
         
         current_app.logger.info(f'File saved successfully: {filepath}')
         
@@ -45,6 +45,28 @@ def save_uploaded_file(file, folder):
     return None
 
 
+def upload_relative_path(stored_path):
+    """Path relative to UPLOAD_FOLDER for a stored upload path ('uploads/<folder>/<file>', as returned by save_uploaded_file)"""
+    return stored_path.removeprefix('uploads/')
+
+
+def upload_path(stored_path):
+    """Absolute path for a stored upload path"""
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], upload_relative_path(stored_path))
+
+
+def new_upload_paths(folder, extension):
+    """(absolute path, stored path) for a new uniquely named upload file in folder"""
+    stored_path = f'uploads/{folder}/{uuid.uuid4().hex}.{extension}'
+    return upload_path(stored_path), stored_path
+
+
+def delete_uploaded_file(stored_path):
+    """Delete a stored upload; a file that is already gone is not an error (other OSErrors propagate)"""
+    with suppress(FileNotFoundError):
+        os.remove(upload_path(stored_path))
+
+
 def save_slide_image(file):
     """Save slide image to UPLOAD_FOLDER/slides/ and return the relative path for uploaded_file route"""
     if file and allowed_file(file.filename):
@@ -64,12 +86,8 @@ def save_slide_image(file):
             filename = timestamp + filename
             
             filepath = os.path.join(upload_dir, filename)
-            file.save(filepath)
-            
-            # Verify file was saved
-            if not os.path.exists(filepath):
-                current_app.logger.error(f'Failed to save slide image: {filepath}')
-                return None
+            # FileStorage.save raises if the write fails, so a return means the file is on disk
+            file.save(filepath, buffer_size=UPLOAD_BUFFER_SIZE)
             
             current_app.logger.info(f'Slide image saved successfully: {filepath}')
             
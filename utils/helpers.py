@@ -2,7 +2,7 @@
 Helper utility functions
 """
 from datetime import datetime
-from flask import current_app
+from flask import current_app, g
 from flask_login import current_user
 from sqlalchemy import or_
 
@@ -14,7 +14,28 @@ def inject_now():
 
 def get_organization_filter(model_class):
     """
-    Get organization filter for a model class.
+    Get organization filter for a model class, memoized per request on flask.g.
+    See _build_organization_filter for the matching rules.
+    """
+    cache = g.setdefault('_organization_filters', {})
+    key = (model_class, current_user.get_id() if current_user else None)
+    org_filter = cache.get(key)
+    if org_filter is None:
+        org_filter = cache[key] = _build_organization_filter(model_class)
+    return org_filter
+
+
+def get_organization_cache_key():
+    """Cache key matching the scope of get_organization_filter for the current user"""
+    organisation = (current_user.organisation or '').strip()
+    if organisation:
+        return ('org', organisation.upper())
+    return ('user', current_user.id)
+
+
+def _build_organization_filter(model_class):
+    """
+    Build the organization filter for a model class.
     Returns a filter that matches items from the same organization as current user.
     Organization matching is case-insensitive and trimmed for consistency.
     Also includes items with NULL organization (legacy data) for backward compatibility.
@@ -0,0 +1,29 @@
+"""
+JSON provider for Flask responses
+Encodes with orjson when it is installed and falls back to the stdlib encoder otherwise
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    # orjson not installed - responses use Flask's default stdlib encoder
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that hands compact encoding to orjson"""
+
+    # Payloads are built in a fixed key order already; skip the per-dict sort
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        # Pretty-printed output (debug mode) and custom encoder options stay on the stdlib path
+        if orjson is None or 'indent' in kwargs or 'cls' in kwargs:
+            return super().dumps(obj, **kwargs)
+        # Dates are passed through to Flask's default() so they keep the HTTP date format
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        ).decode()
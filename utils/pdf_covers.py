@@ -0,0 +1,160 @@
+"""
+PDF cover rendering
+PyMuPDF holds the GIL while it renders, so covers are rendered in a small process pool
+instead of on the web worker's threads
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import fitz  # type: ignore # PyMuPDF
+except ImportError:
+    # PyMuPDF not installed - render_pdf_cover raises ImportError and covers are not generated
+    fitz = None
+
+# Cover size: 2x zoom for better quality, capped at 600x800 with the aspect ratio kept
+COVER_MAX_ZOOM = 2.0
+COVER_MAX_WIDTH = 600
+COVER_MAX_HEIGHT = 800
+COVER_JPEG_QUALITY = 85
+
+# Zoom for the small render used to decide whether a page can be rendered in grayscale
+GRAYSCALE_PROBE_ZOOM = 0.1
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _is_grayscale_page(page):
+    """True if a low-resolution RGB probe render of page has no coloured pixels"""
+    probe = page.get_pixmap(matrix=fitz.Matrix(GRAYSCALE_PROBE_ZOOM, GRAYSCALE_PROBE_ZOOM), alpha=False)
+    samples = probe.samples
+    # Every pixel is gray when its red, green and blue channels are equal
+    return samples[0::3] == samples[1::3] == samples[2::3]
+
+
+def render_pdf_cover(pdf_path, output_path):
+    """
+    Render the first page of pdf_path to a JPEG at output_path.
+    Runs in a pool process, so it must not touch the Flask app; errors propagate to the caller.
+    Returns False if the PDF has no pages.
+    """
+    if fitz is None:
+        raise ImportError('PyMuPDF is not installed')
+
+    # Open the PDF (closed on exit even if rendering fails; the pixmap outlives it); filetype skips format sniffing
+    with fitz.open(pdf_path, filetype='pdf') as pdf_document:
+        if len(pdf_document) == 0:
+            return False
+
+        first_page = pdf_document[0]
+        rect = first_page.rect
+        zoom = min(COVER_MAX_ZOOM, COVER_MAX_WIDTH / rect.width, COVER_MAX_HEIGHT / rect.height)
+
+        cover_width = round(rect.width * zoom)
+        cover_height = round(rect.height * zoom)
+
+        # Use the page's embedded thumbnail (/Thumb) when it is at least as large as the cover
+        pix = None
+        thumb_type, thumb_ref = pdf_document.xref_get_key(first_page.xref, 'Thumb')
+        if thumb_type == 'xref':
+            try:
+                thumb = fitz.Pixmap(pdf_document, int(thumb_ref.split()[0]))
+                if thumb.width >= cover_width and thumb.height >= cover_height:
+                    if thumb.alpha:
+                        thumb = fitz.Pixmap(thumb, 0)
+                    if thumb.colorspace is None or thumb.colorspace.n != 3:
+                        thumb = fitz.Pixmap(fitz.csRGB, thumb)
+                    if thumb.width > cover_width or thumb.height > cover_height:
+                        thumb = fitz.Pixmap(thumb, cover_width, cover_height, None)
+                    pix = thumb
+            except Exception:
+                # Unreadable thumbnail - render the page instead
+                pix = None
+
+        if pix is None:
+            # Text-only pages render to a single gray channel: a third of the pixmap and a smaller JPEG
+            colorspace = fitz.csGRAY if _is_grayscale_page(first_page) else fitz.csRGB
+            # Render page to an image (pixmap) already scaled to the cover size, so no resize pass is needed
+            mat = fitz.Matrix(zoom, zoom)
+            pix = first_page.get_pixmap(matrix=mat, colorspace=colorspace, alpha=False)
+
+    # Save the image (PyMuPDF encodes the JPEG directly from the pixmap)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    pix.save(output_path, output='jpeg', jpg_quality=COVER_JPEG_QUALITY)
+    return True
+
+
+def _get_pool():
+    """Create the render pool on first use (after gunicorn has forked its worker)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Spawned processes start clean instead of forking a process that already runs threads
+            _pool = ProcessPoolExecutor(
+                max_workers=min(2, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+
+def _discard_pool(broken_pool):
+    """Drop a pool broken by a dead process (MuPDF crash, OOM kill) so the next call starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is broken_pool:
+            _pool = None
+    broken_pool.shutdown(wait=False)
+
+
+def render_pdf_cover_in_pool(pdf_path, output_path):
+    """
+    Render a cover in the pool process and wait for it (call from a background thread).
+    If the pool broke, it is replaced and the render retried once; a second failure raises BrokenProcessPool.
+    """
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            return pool.submit(render_pdf_cover, pdf_path, output_path).result()
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            if attempt:
+                raise
+
+
+def render_pdf_covers_in_pool(jobs):
+    """
+    Render a batch of (pdf_path, output_path) covers, one pool task per cover, and wait for the results.
+    Returns one flag per job: True if its cover was written, False if the PDF was empty or failed,
+    so one bad PDF only fails its own job.
+    """
+    jobs = list(jobs)
+    pool = _get_pool()
+    try:
+        futures = [pool.submit(render_pdf_cover, pdf_path, output_path) for pdf_path, output_path in jobs]
+    except BrokenProcessPool:
+        # An earlier crash already broke the pool; start over on a fresh one
+        _discard_pool(pool)
+        pool = _get_pool()
+        futures = [pool.submit(render_pdf_cover, pdf_path, output_path) for pdf_path, output_path in jobs]
+    results = []
+    for (pdf_path, output_path), future in zip(jobs, futures):
+        try:
+            results.append(future.result())
+        except ImportError:
+            raise
+        except BrokenProcessPool:
+            # A crash in the pool fails every pending task; rerun this one alone on a fresh pool
+            _discard_pool(pool)
+            try:
+                results.append(render_pdf_cover_in_pool(pdf_path, output_path))
+            except ImportError:
+                raise
+            except Exception:
+                results.append(False)
+        except Exception:
+            results.append(False)
+    return results
@@ -9,6 +9,91 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from io import BytesIO
 from datetime import datetime, date, timedelta
+from calendar import month_name, monthrange
+
+# Scheduled check times used as row headers in the temperature log PDF
+TEMPERATURE_LOG_TIMES = ('10:00 AM', '02:00 PM', '06:00 PM', '10:00 PM')
+
+# Shared styles for the cold storage PDFs, built once at import instead of on every call
+_STYLES = getSampleStyleSheet()
+
+_TEMPERATURE_LOG_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=14,
+    textColor=colors.HexColor('#1a1a1a'),
+    spaceAfter=8,
+    alignment=TA_CENTER
+)
+
+_TEMPERATURE_LOG_UNIT_HEADER_STYLE = ParagraphStyle(
+    'UnitHeader',
+    parent=_STYLES['Normal'],
+    fontSize=9,
+    textColor=colors.HexColor('#1a1a1a'),
+    spaceAfter=4,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+_TEMPERATURE_LOG_TABLE_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0f0f0')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a1a1a')),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 5),
+    ('TOPPADDING', (0, 0), (-1, 0), 5),
+    # Time column (row headers)
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8e8e8')),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 1), (0, -1), 8),
+    # Data rows
+    ('FONTNAME', (1, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (1, 1), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cccccc')),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+    ('TOPPADDING', (0, 1), (-1, -1), 4),
+])
+
+_CHECKLIST_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=16,
+    textColor=colors.HexColor('#1a1a1a'),
+    spaceAfter=12,
+    alignment=TA_CENTER
+)
+
+_CHECKLIST_HEADER_STYLE = ParagraphStyle(
+    'CustomHeader',
+    parent=_STYLES['Normal'],
+    fontSize=11,
+    textColor=colors.HexColor('#1a1a1a'),
+    spaceAfter=8,
+    alignment=TA_LEFT,
+    fontName='Helvetica-Bold'
+)
+
+_CHECKLIST_TABLE_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0f0f0')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a1a1a')),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('TOPPADDING', (0, 0), (-1, 0), 6),
+    # Data rows
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cccccc')),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+    ('TOPPADDING', (0, 1), (-1, -1), 5),
+])
 
 
 def format_date_display(log_date):
@@ -23,98 +108,93 @@ def format_temperature(temp):
     return f"{temp}°C"
 
 
-def generate_temperature_log_pdf(units, start_date, end_date):
-    """Generate PDF for temperature logs in landscape format with times as rows and dates as columns"""
+def iter_weeks(start_date, end_date):
+    """Yield the dates of each Monday-Sunday week overlapping start_date..end_date, clipped to the range"""
+    # Import here to avoid circular imports
+    from models import TemperatureLog
+    
+    week_start = TemperatureLog.calculate_week_start(start_date)
+    while week_start <= end_date:
+        first = max(week_start, start_date)
+        last = min(week_start + timedelta(days=6), end_date)
+        yield [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+        week_start += timedelta(days=7)
+
+
+def load_temperature_entries(unit_ids, start_date, end_date):
+    """
+    Load every temperature entry for the given units and date range in one query.
+    Returns {(unit_id, log_date, scheduled_time): TemperatureEntry}.
+    """
     # Import here to avoid circular imports
     from models import TemperatureLog, TemperatureEntry
+    from extensions import db
     
-    buffer = BytesIO()
+    if not unit_ids:
+        return {}
+    
+    rows = db.session.query(TemperatureLog.unit_id, TemperatureLog.log_date, TemperatureEntry).join(
+        TemperatureEntry, TemperatureEntry.log_id == TemperatureLog.id
+    ).filter(
+        TemperatureLog.unit_id.in_(unit_ids),
+        TemperatureLog.log_date >= start_date,
+        TemperatureLog.log_date <= end_date
+    ).all()
+    return {(unit_id, log_date, entry.scheduled_time): entry for unit_id, log_date, entry in rows}
+
+
+def find_out_of_range_entries(entries_map, units):
+    """
+    Return the keys of entries_map whose temperature is outside its unit's limits.
+    Every entry is checked once with TemperatureEntry.is_out_of_range before the tables are built.
+    """
+    units_by_id = {unit.id: unit for unit in units}
+    return {
+        key for key, entry in entries_map.items()
+        if key[0] in units_by_id and entry.is_out_of_range(units_by_id[key[0]])
+    }
+
+
+def generate_temperature_log_pdf(units, start_date, end_date, out=None):
+    """Generate PDF for temperature logs in landscape format with times as rows and dates as columns.
+    Writes into `out` (any writable binary file object) when given, otherwise into a new BytesIO."""
+    # All entries for the range up front instead of a log + entries query per unit per day
+    entries_map = load_temperature_entries([unit.id for unit in units], start_date, end_date)
+    out_of_range = find_out_of_range_entries(entries_map, units)
+    
+    buffer = out if out is not None else BytesIO()
     # Use landscape orientation
     doc = SimpleDocTemplate(buffer, pagesize=landscape(letter), topMargin=0.4*inch, bottomMargin=0.4*inch, 
                             leftMargin=0.3*inch, rightMargin=0.3*inch)
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        textColor=colors.HexColor('#1a1a1a'),
-        spaceAfter=8,
-        alignment=TA_CENTER
-    )
-    
-    unit_header_style = ParagraphStyle(
-        'UnitHeader',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#1a1a1a'),
-        spaceAfter=4,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
     
     # Title
-    title = Paragraph("Cold Storage Temperature Log – Unit Wise (HACCP)", title_style)
+    title = Paragraph("Cold Storage Temperature Log – Unit Wise (HACCP)", _TEMPERATURE_LOG_TITLE_STYLE)
     story.append(title)
     story.append(Spacer(1, 0.15*inch))
     
-    # Scheduled times (row headers)
-    scheduled_times = ['10:00 AM', '02:00 PM', '06:00 PM', '10:00 PM']
-    
-    # Group dates by week (Monday to Sunday)
-    def get_week_start(d):
-        """Get Monday of the week for a given date"""
-        days_since_monday = d.weekday()
-        return d - timedelta(days=days_since_monday)
-    
-    # Group dates into weeks
-    weeks = {}
-    current_date = start_date
-    while current_date <= end_date:
-        week_start = get_week_start(current_date)
-        if week_start not in weeks:
-            weeks[week_start] = []
-        weeks[week_start].append(current_date)
-        current_date += timedelta(days=1)
-    
-    # Sort weeks
-    sorted_weeks = sorted(weeks.keys())
-    
-    # Generate tables for each week
-    for week_start in sorted_weeks:
-        week_dates = sorted(weeks[week_start])
-        
-        # Limit to 7 days per week (or available dates)
-        week_dates = week_dates[:7]
-        
+    # Generate tables for each week (Monday to Sunday)
+    weeks = list(iter_weeks(start_date, end_date))
+    for week_index, week_dates in enumerate(weeks):
         # Process each unit separately (stacked vertically)
         for unit in units:
             # Unit Header
             unit_header = f"Unit {unit.unit_number} | {unit.location} | {unit.unit_type}"
-            unit_header_para = Paragraph(unit_header, unit_header_style)
+            unit_header_para = Paragraph(unit_header, _TEMPERATURE_LOG_UNIT_HEADER_STYLE)
             
             # Build table data: times as rows, dates as columns
             # Header row: Time | Date1 | Date2 | Date3 | ...
             header_row = ['TIME'] + [d.strftime('%m/%d') for d in week_dates]
             table_data = [header_row]
             
-            # Get all logs for this unit and week
-            logs = {}
-            for d in week_dates:
-                log = TemperatureLog.query.filter_by(unit_id=unit.id, log_date=d).first()
-                if log:
-                    logs[d] = {entry.scheduled_time: entry for entry in log.entries.all()}
-                else:
-                    logs[d] = {}
-            
-            # Add rows for each time slot
-            for time_slot in scheduled_times:
+            # Add rows for each time slot, collecting out of range highlights in the same pass
+            highlight_styles = []
+            for time_idx, time_slot in enumerate(TEMPERATURE_LOG_TIMES, start=1):
                 row = [time_slot]
-                for d in week_dates:
-                    entry = logs.get(d, {}).get(time_slot)
+                for date_idx, d in enumerate(week_dates, start=1):
+                    key = (unit.id, d, time_slot)
+                    entry = entries_map.get(key)
                     if entry and entry.temperature is not None:
                         temp_str = format_temperature(entry.temperature)
                         initial = entry.initial or ""
@@ -124,11 +204,9 @@ def generate_temperature_log_pdf(units, start_date, end_date):
                         else:
                             cell_value = temp_str
                         # Check if out of range
-                        try:
-                            if entry.is_out_of_range(unit):
-                                cell_value = f"<font color='red'>{cell_value}</font>"
-                        except:
-                            pass
+                        if key in out_of_range:
+                            cell_value = f"<font color='red'>{cell_value}</font>"
+                            highlight_styles.append(('BACKGROUND', (date_idx, time_idx), (date_idx, time_idx), colors.HexColor('#ffe6e6')))
                         row.append(cell_value)
                     else:
                         row.append("—")
@@ -144,41 +222,10 @@ def generate_temperature_log_pdf(units, start_date, end_date):
             # Create table
             table = Table(table_data, colWidths=col_widths)
             
-            # Table style
-            table_style = [
-                # Header row
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0f0f0')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a1a1a')),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 5),
-                ('TOPPADDING', (0, 0), (-1, 0), 5),
-                # Time column (row headers)
-                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8e8e8')),
-                ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 1), (0, -1), 8),
-                # Data rows
-                ('FONTNAME', (1, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (1, 1), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cccccc')),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-                ('TOPPADDING', (0, 1), (-1, -1), 4),
-            ]
-            
-            # Highlight out of range temperatures
-            for time_idx, time_slot in enumerate(scheduled_times, start=1):
-                for date_idx, d in enumerate(week_dates, start=1):
-                    entry = logs.get(d, {}).get(time_slot)
-                    if entry and entry.temperature is not None:
-                        try:
-                            if entry.is_out_of_range(unit):
-                                table_style.append(('BACKGROUND', (date_idx, time_idx), (date_idx, time_idx), colors.HexColor('#ffe6e6')))
-                        except:
-                            pass
-            
-            table.setStyle(TableStyle(table_style))
+            # Table style, then highlight out of range temperatures
+            table.setStyle(_TEMPERATURE_LOG_TABLE_STYLE)
+            if highlight_styles:
+                table.setStyle(TableStyle(highlight_styles))
             
             # Add unit header and table (stacked vertically)
             story.append(KeepTogether([
@@ -190,7 +237,7 @@ def generate_temperature_log_pdf(units, start_date, end_date):
             story.append(Spacer(1, 0.2*inch))
         
         # Page break between weeks (except last week)
-        if week_start != sorted_weeks[-1]:
+        if week_index < len(weeks) - 1:
             story.append(PageBreak())
     
     # Build PDF
@@ -199,119 +246,66 @@ def generate_temperature_log_pdf(units, start_date, end_date):
     return buffer
 
 
-def generate_checklist_pdf(units, start_date, end_date, times):
-    """Generate checklist PDF organized by date and time, showing all units for each date/time combination"""
-    # Import here to avoid circular imports
-    from models import TemperatureLog, TemperatureEntry
-    
-    buffer = BytesIO()
+def generate_checklist_pdf(units, start_date, end_date, times, out=None):
+    """Generate checklist PDF organized by date and time, showing all units for each date/time combination.
+    Writes into `out` (any writable binary file object) when given, otherwise into a new BytesIO."""
+    # All entries for the range up front instead of log + entry queries per unit, date and time
+    entries_map = load_temperature_entries([unit.id for unit in units], start_date, end_date)
+    out_of_range = find_out_of_range_entries(entries_map, units)
+    
+    buffer = out if out is not None else BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.HexColor('#1a1a1a'),
-        spaceAfter=12,
-        alignment=TA_CENTER
-    )
-    
-    header_style = ParagraphStyle(
-        'CustomHeader',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.HexColor('#1a1a1a'),
-        spaceAfter=8,
-        alignment=TA_LEFT,
-        fontName='Helvetica-Bold'
-    )
     
     # Title
-    title = Paragraph("Cold Storage Temperature Log Checklist (HACCP)", title_style)
+    title = Paragraph("Cold Storage Temperature Log Checklist (HACCP)", _CHECKLIST_TITLE_STYLE)
     story.append(title)
     story.append(Spacer(1, 0.2*inch))
     
+    # Unit columns repeat in every date/time section; read them off the units once
+    unit_columns = [(unit.id, [unit.unit_number, unit.location, unit.unit_type]) for unit in units]
+    
     # Generate one section per date/time combination
     current_date = start_date
     while current_date <= end_date:
         for time_slot in times:
             # Date and Time Header
             date_time_header = f"DATE: {format_date_display(current_date)} | TIME: {time_slot}"
-            header_para = Paragraph(date_time_header, header_style)
+            header_para = Paragraph(date_time_header, _CHECKLIST_HEADER_STYLE)
             story.append(header_para)
             story.append(Spacer(1, 0.1*inch))
             
             # Table Headers
             table_data = [['UNIT NO', 'LOCATION', 'TYPE', 'TEMPERATURE (°C)', 'CORRECTIVE ACTION', 'INITIAL']]
             
-            # Add rows for each unit
-            for unit in units:
-                log = TemperatureLog.query.filter_by(unit_id=unit.id, log_date=current_date).first()
-                
-                if log:
-                    entry = TemperatureEntry.query.filter_by(log_id=log.id, scheduled_time=time_slot).first()
-                else:
-                    entry = None
+            # Add rows for each unit, collecting out of range highlights in the same pass
+            highlight_styles = []
+            for idx, (unit_id, columns) in enumerate(unit_columns, start=1):
+                key = (unit_id, current_date, time_slot)
+                entry = entries_map.get(key)
                 
                 if entry and entry.temperature is not None:
                     temp = format_temperature(entry.temperature)
                     corrective = entry.corrective_action or "—"
                     initial = entry.initial or "—"
+                    if key in out_of_range:
+                        highlight_styles.append(('TEXTCOLOR', (3, idx), (3, idx), colors.red))
+                        highlight_styles.append(('BACKGROUND', (3, idx), (3, idx), colors.HexColor('#ffe6e6')))
                 else:
                     temp = "—"
                     corrective = "—"
                     initial = "—"
                 
-                row = [
-                    unit.unit_number,
-                    unit.location,
-                    unit.unit_type,
-                    temp,
-                    corrective,
-                    initial
-                ]
-                table_data.append(row)
+                table_data.append(columns + [temp, corrective, initial])
             
             # Create table
             table = Table(table_data, colWidths=[1*inch, 1.5*inch, 1*inch, 1.2*inch, 2*inch, 0.8*inch])
             
-            # Table style
-            table_style = [
-                # Header row
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0f0f0')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1a1a1a')),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-                ('TOPPADDING', (0, 0), (-1, 0), 6),
-                # Data rows
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#cccccc')),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-            ]
-            
-            # Highlight out of range temperatures
-            for idx, unit in enumerate(units, start=1):
-                log = TemperatureLog.query.filter_by(unit_id=unit.id, log_date=current_date).first()
-                if log:
-                    entry = TemperatureEntry.query.filter_by(log_id=log.id, scheduled_time=time_slot).first()
-                    if entry and entry.temperature is not None:
-                        try:
-                            if entry.is_out_of_range(unit):
-                                table_style.append(('TEXTCOLOR', (3, idx), (3, idx), colors.red))
-                                table_style.append(('BACKGROUND', (3, idx), (3, idx), colors.HexColor('#ffe6e6')))
-                        except:
-                            pass  # Skip if error checking range
-            
-            table.setStyle(TableStyle(table_style))
+            # Table style, then highlight out of range temperatures
+            table.setStyle(_CHECKLIST_TABLE_STYLE)
+            if highlight_styles:
+                table.setStyle(TableStyle(highlight_styles))
             story.append(table)
             story.append(Spacer(1, 0.3*inch))
         
@@ -328,7 +322,6 @@ def generate_bar_closing_checklist_pdf(unit, year, month_num):
     """Generate monthly PDF for BAR Closing Checklist in landscape format"""
     # Import here to avoid circular imports
     from models import BarClosingChecklistPoint, BarClosingChecklistEntry, BarClosingChecklistItem
-    from calendar import monthrange
     from utils.helpers import get_organization_filter
     
     buffer = BytesIO()
@@ -493,7 +486,6 @@ def generate_chopping_board_checklist_pdf(unit, year, month_num):
     """Generate monthly PDF for Chopping Board Checklist in landscape format"""
     # Import here to avoid circular imports
     from models import ChoppingBoardChecklistPoint, ChoppingBoardChecklistEntry, ChoppingBoardChecklistItem
-    from calendar import monthrange
     from utils.helpers import get_organization_filter
     
     buffer = BytesIO()
@@ -658,7 +650,6 @@ def generate_kitchen_chopping_board_checklist_pdf(unit, year, month_num):
     """Generate monthly PDF for Chopping Board Checklist in landscape format"""
     # Import here to avoid circular imports
     from models import KitchenChoppingBoardChecklistPoint, KitchenChoppingBoardChecklistEntry, KitchenChoppingBoardChecklistItem
-    from calendar import monthrange
     from utils.helpers import get_organization_filter
     
     buffer = BytesIO()
@@ -819,14 +810,15 @@ def generate_kitchen_chopping_board_checklist_pdf(unit, year, month_num):
     return buffer
 
 
-def generate_bar_opening_checklist_pdf(unit, year, month_num):
-    """Generate monthly PDF for BAR Opening Checklist in landscape format"""
+def generate_bar_opening_checklist_pdf(unit, year, month_num, out=None):
+    """Generate monthly PDF for BAR Opening Checklist in landscape format.
+    Writes into `out` (any writable binary file object) when given, otherwise into a new BytesIO."""
     # Import here to avoid circular imports
     from models import BarOpeningChecklistPoint, BarOpeningChecklistEntry, BarOpeningChecklistItem
-    from calendar import monthrange
     from utils.helpers import get_organization_filter
+    from extensions import db
     
-    buffer = BytesIO()
+    buffer = out if out is not None else BytesIO()
     # Use landscape orientation
     doc = SimpleDocTemplate(buffer, pagesize=landscape(letter), topMargin=0.4*inch, bottomMargin=0.4*inch, 
                             leftMargin=0.3*inch, rightMargin=0.3*inch)
@@ -845,9 +837,7 @@ def generate_bar_opening_checklist_pdf(unit, year, month_num):
     )
     
     # Title
-    month_names = ['January', 'February', 'March', 'April', 'May', 'June',
-                  'July', 'August', 'September', 'October', 'November', 'December']
-    title = Paragraph(f"BAR – Opening Checklist<br/>{month_names[month_num-1]} / {year}", title_style)
+    title = Paragraph(f"BAR – Opening Checklist<br/>{month_name[month_num]} / {year}", title_style)
     story.append(title)
     story.append(Spacer(1, 0.15*inch))
     
@@ -878,26 +868,24 @@ def generate_bar_opening_checklist_pdf(unit, year, month_num):
     start_date = dates[0]
     end_date = dates[-1]
     
+    # Fetch the whole month's completed items in one query (entries joined to items)
     org_filter_entry = get_organization_filter(BarOpeningChecklistEntry)
-    entries = BarOpeningChecklistEntry.query.filter(org_filter_entry).filter(
+    org_filter_item = get_organization_filter(BarOpeningChecklistItem)
+    rows = db.session.query(
+        BarOpeningChecklistEntry.entry_date,
+        BarOpeningChecklistItem.checklist_point_id,
+        BarOpeningChecklistItem.staff_initials
+    ).join(
+        BarOpeningChecklistItem, BarOpeningChecklistItem.entry_id == BarOpeningChecklistEntry.id
+    ).filter(org_filter_entry, org_filter_item).filter(
         BarOpeningChecklistEntry.unit_id == unit.id,
         BarOpeningChecklistEntry.entry_date >= start_date,
-        BarOpeningChecklistEntry.entry_date <= end_date
+        BarOpeningChecklistEntry.entry_date <= end_date,
+        BarOpeningChecklistItem.is_completed == True
     ).all()
     
-    # Create a map of entry_date -> entry
-    entries_map = {entry.entry_date: entry for entry in entries}
-    
-    # Get all items for these entries
-    entry_ids = [entry.id for entry in entries]
-    items_map = {}  # (entry_id, point_id) -> item
-    if entry_ids:
-        org_filter_item = get_organization_filter(BarOpeningChecklistItem)
-        items = BarOpeningChecklistItem.query.filter(org_filter_item).filter(
-            BarOpeningChecklistItem.entry_id.in_(entry_ids)
-        ).all()
-        for item in items:
-            items_map[(item.entry_id, item.checklist_point_id)] = item
+    # (entry_date, point_id) -> staff initials of the completed item
+    completed_map = {(row.entry_date, row.checklist_point_id): row.staff_initials for row in rows}
     
     # Create a style for header cells that allows wrapping
     header_style = ParagraphStyle(
@@ -924,17 +912,11 @@ def generate_bar_opening_checklist_pdf(unit, year, month_num):
         point_para = Paragraph(point.point_text, styles['Normal'])
         row = [point_para]
         for d in dates:
-            entry = entries_map.get(d)
-            if entry:
-                item = items_map.get((entry.id, point.id))
-                if item and item.is_completed:
-                    # Show checkmark + optional initials
-                    if item.staff_initials:
-                        cell_value = f"✓ {item.staff_initials}"
-                    else:
-                        cell_value = "✓"
-                else:
-                    cell_value = ""
+            key = (d, point.id)
+            if key in completed_map:
+                # Show checkmark + optional initials
+                staff_initials = completed_map[key]
+                cell_value = f"✓ {staff_initials}" if staff_initials else "✓"
             else:
                 cell_value = ""
             row.append(cell_value)
@@ -987,14 +969,15 @@ def generate_bar_opening_checklist_pdf(unit, year, month_num):
     return buffer
 
 
-def generate_bar_shift_closing_checklist_pdf(unit, year, month_num):
-    """Generate monthly PDF for BAR Closing Checklist in landscape format"""
+def generate_bar_shift_closing_checklist_pdf(unit, year, month_num, out=None):
+    """Generate monthly PDF for BAR Closing Checklist in landscape format.
+    Writes into `out` (any writable binary file object) when given, otherwise into a new BytesIO."""
     # Import here to avoid circular imports
     from models import BarShiftClosingChecklistPoint, BarShiftClosingChecklistEntry, BarShiftClosingChecklistItem
-    from calendar import monthrange
     from utils.helpers import get_organization_filter
+    from extensions import db
     
-    buffer = BytesIO()
+    buffer = out if out is not None else BytesIO()
     # Use landscape orientation
     doc = SimpleDocTemplate(buffer, pagesize=landscape(letter), topMargin=0.4*inch, bottomMargin=0.4*inch, 
                             leftMargin=0.3*inch, rightMargin=0.3*inch)
@@ -1013,9 +996,7 @@ def generate_bar_shift_closing_checklist_pdf(unit, year, month_num):
     )
     
     # Title
-    month_names = ['January', 'February', 'March', 'April', 'May', 'June',
-                  'July', 'August', 'September', 'October', 'November', 'December']
-    title = Paragraph(f"BAR – Closing Checklist<br/>{month_names[month_num-1]} {year}", title_style)
+    title = Paragraph(f"BAR – Closing Checklist<br/>{month_name[month_num]} {year}", title_style)
     story.append(title)
     story.append(Spacer(1, 0.15*inch))
     
@@ -1046,26 +1027,25 @@ def generate_bar_shift_closing_checklist_pdf(unit, year, month_num):
     start_date = dates[0]
     end_date = dates[-1]
     
+    # Stream the month's completed items (entries joined to items) in fixed-size batches
+    # so only the (date, point) -> initials map is held, not every ORM row
     org_filter_entry = get_organization_filter(BarShiftClosingChecklistEntry)
-    entries = BarShiftClosingChecklistEntry.query.filter(org_filter_entry).filter(
+    org_filter_item = get_organization_filter(BarShiftClosingChecklistItem)
+    rows = db.session.query(
+        BarShiftClosingChecklistEntry.entry_date,
+        BarShiftClosingChecklistItem.checklist_point_id,
+        BarShiftClosingChecklistItem.staff_initials
+    ).join(
+        BarShiftClosingChecklistItem, BarShiftClosingChecklistItem.entry_id == BarShiftClosingChecklistEntry.id
+    ).filter(org_filter_entry, org_filter_item).filter(
         BarShiftClosingChecklistEntry.unit_id == unit.id,
         BarShiftClosingChecklistEntry.entry_date >= start_date,
-        BarShiftClosingChecklistEntry.entry_date <= end_date
-    ).all()
+        BarShiftClosingChecklistEntry.entry_date <= end_date,
+        BarShiftClosingChecklistItem.is_completed == True
+    ).yield_per(200)
     
-    # Create a map of entry_date -> entry
-    entries_map = {entry.entry_date: entry for entry in entries}
-    
-    # Get all items for these entries
-    entry_ids = [entry.id for entry in entries]
-    items_map = {}  # (entry_id, point_id) -> item
-    if entry_ids:
-        org_filter_item = get_organization_filter(BarShiftClosingChecklistItem)
-        items = BarShiftClosingChecklistItem.query.filter(org_filter_item).filter(
-            BarShiftClosingChecklistItem.entry_id.in_(entry_ids)
-        ).all()
-        for item in items:
-            items_map[(item.entry_id, item.checklist_point_id)] = item
+    # (entry_date, point_id) -> staff initials of the completed item
+    completed_map = {(row.entry_date, row.checklist_point_id): row.staff_initials for row in rows}
     
     # Create a style for header cells that allows wrapping
     header_style = ParagraphStyle(
@@ -1092,17 +1072,11 @@ def generate_bar_shift_closing_checklist_pdf(unit, year, month_num):
         point_para = Paragraph(point.point_text, styles['Normal'])
         row = [point_para]
         for d in dates:
-            entry = entries_map.get(d)
-            if entry:
-                item = items_map.get((entry.id, point.id))
-                if item and item.is_completed:
-                    # Show checkmark + optional initials
-                    if item.staff_initials:
-                        cell_value = f"✓ {item.staff_initials}"
-                    else:
-                        cell_value = "✓"
-                else:
-                    cell_value = ""
+            key = (d, point.id)
+            if key in completed_map:
+                # Show checkmark + optional initials
+                staff_initials = completed_map[key]
+                cell_value = f"✓ {staff_initials}" if staff_initials else "✓"
             else:
                 cell_value = ""
             row.append(cell_value)
@@ -0,0 +1,130 @@
+"""
+Background PDF generation jobs
+Runs slow PDF builds off the request thread and keeps the result until it is collected.
+Job records and finished PDFs live under the instance folder (outside the served uploads tree), so any
+gunicorn worker can answer a status poll and a job survives the worker that queued it being recycled
+(--max-requests). Results are only handed out through get_pdf_job's owner check.
+"""
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+
+from flask import current_app
+
+# Job files are discarded this many seconds after their last update (a collected PDF can be downloaded again until then)
+PDF_JOB_TTL_SECONDS = 600
+# A queued or running job not updated for this long lost its worker (restart or recycle) and is reported failed
+PDF_JOB_STALE_SECONDS = 300
+PDF_JOBS_FOLDER = 'pdf_jobs'
+
+_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pdf-job')
+
+
+def _jobs_dir(app=None):
+    """Directory holding job records and results (created on demand)"""
+    app = app or current_app
+    jobs_dir = os.path.join(app.instance_path, PDF_JOBS_FOLDER)
+    os.makedirs(jobs_dir, exist_ok=True)
+    return jobs_dir
+
+
+def _record_path(jobs_dir, job_id):
+    return os.path.join(jobs_dir, f'{job_id}.json')
+
+
+def _result_path(jobs_dir, job_id):
+    return os.path.join(jobs_dir, f'{job_id}.pdf')
+
+
+def _write_record(jobs_dir, job_id, job):
+    """Replace the job record atomically so pollers never read a partial file"""
+    job['updated_at'] = time.time()
+    tmp_path = _record_path(jobs_dir, job_id) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(job, f)
+    os.replace(tmp_path, _record_path(jobs_dir, job_id))
+
+
+def _read_record(jobs_dir, job_id):
+    try:
+        with open(_record_path(jobs_dir, job_id)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _prune_expired_jobs(jobs_dir):
+    """Delete job files (records and uncollected results) older than PDF_JOB_TTL_SECONDS"""
+    cutoff = time.time() - PDF_JOB_TTL_SECONDS
+    for entry in os.scandir(jobs_dir):
+        with suppress(OSError):
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+
+
+def _run_job(app, job_id, func, args):
+    """Execute a PDF job as its owner (org filters read current_user) and record the outcome"""
+    from flask_login import login_user
+    from models import User
+
+    with app.test_request_context():
+        jobs_dir = _jobs_dir(app)
+        job = _read_record(jobs_dir, job_id)
+        if job is None:
+            return
+        job['status'] = 'running'
+        _write_record(jobs_dir, job_id, job)
+        try:
+            login_user(User.query.get(job['owner_id']))
+            buffer = func(*args)
+            buffer.seek(0)
+            with open(_result_path(jobs_dir, job_id), 'wb') as f:
+                shutil.copyfileobj(buffer, f)
+            buffer.close()
+            job['status'] = 'finished'
+        except Exception as e:
+            app.logger.error(f"Error generating PDF in background job {job_id}: {str(e)}", exc_info=True)
+            job['error'] = str(e)
+            job['status'] = 'failed'
+        _write_record(jobs_dir, job_id, job)
+
+
+def submit_pdf_job(func, *args, filename, owner_id):
+    """Queue func(*args) to build a PDF buffer and return the job id"""
+    jobs_dir = _jobs_dir()
+    _prune_expired_jobs(jobs_dir)
+    job_id = uuid.uuid4().hex
+    _write_record(jobs_dir, job_id, {
+        'status': 'queued',
+        'filename': filename,
+        'owner_id': owner_id,
+        'error': None,
+    })
+    app = current_app._get_current_object()
+    _executor.submit(_run_job, app, job_id, func, args)
+    return job_id
+
+
+def get_pdf_job(job_id, owner_id):
+    """
+    Return the job dict if it exists and belongs to owner_id, otherwise None.
+    A finished job's 'path' is its PDF on disk; a job whose worker went away is reported failed.
+    """
+    if not _JOB_ID.match(job_id):
+        return None
+    jobs_dir = _jobs_dir()
+    job = _read_record(jobs_dir, job_id)
+    if not job or job['owner_id'] != owner_id:
+        return None
+    if job['status'] in ('queued', 'running') and time.time() - job['updated_at'] > PDF_JOB_STALE_SECONDS:
+        job['status'] = 'failed'
+        job['error'] = 'PDF generation was interrupted, please try again'
+    job['path'] = _result_path(jobs_dir, job_id)
+    return job
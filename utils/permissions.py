@@ -76,6 +76,10 @@ def can_edit_secondary_ingredients(user):
 
 def role_required(allowed_roles):
     """Decorator to require specific roles"""
+    # Freeze once so each request does a set lookup; a bare string means a single role
+    if isinstance(allowed_roles, str):
+        allowed_roles = [allowed_roles]
+    allowed_roles = frozenset(allowed_roles)
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -0,0 +1,56 @@
+"""
+JSON request body validation
+Declarative field specs so handlers can reject bad bodies before touching the database
+"""
+import math
+
+# Sentinel default marking a field as mandatory
+REQUIRED = object()
+
+
+def _convert(field_type, value):
+    """Convert one scalar JSON value to field_type; raises ValueError if it does not fit"""
+    if field_type is bool:
+        return value if isinstance(value, bool) else str(value).lower() in ('1', 'true', 'yes', 'on')
+    if field_type in (int, float):
+        # JSON true/false are not numbers, and an int field must not silently drop a fraction
+        if isinstance(value, bool):
+            raise ValueError('boolean given for a number')
+        if field_type is int and isinstance(value, float) and not value.is_integer():
+            raise ValueError('fractional value given for an integer')
+        number = field_type(value)
+        if field_type is float and not math.isfinite(number):
+            raise ValueError('non-finite number')
+        return number
+    return field_type(value)
+
+
+def validate_json_fields(data, fields):
+    """
+    Validate and normalise a JSON body against a field spec.
+    fields maps name -> (type, default, label) or (type, default, label, max_length). Strings are
+    stripped; missing or blank values fall back to default, and a default of REQUIRED makes the field
+    mandatory. Lists and objects are never accepted, and max_length caps the converted value's length.
+    Returns (values, None) on success or (None, error_message) on the first bad field.
+    """
+    values = {}
+    for name, spec in fields.items():
+        field_type, default, label = spec[:3]
+        max_length = spec[3] if len(spec) > 3 else None
+        value = data.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == '':
+            if default is REQUIRED:
+                return None, f'{label} is required'
+            values[name] = default
+            continue
+        if not isinstance(value, (str, int, float)):
+            return None, f'{label} is invalid'
+        try:
+            values[name] = _convert(field_type, value)
+        except (ValueError, TypeError, OverflowError):
+            return None, f'{label} is invalid'
+        if max_length is not None and len(values[name]) > max_length:
+            return None, f'{label} must be at most {max_length} characters'
+    return values, None